@@ -2,8 +2,14 @@
 자율형 비즈니스 보안 에이전트
 Cochl.sense API를 활용한 실시간 소리 이벤트 모니터링 시스템
 """
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
+import asyncio
 import logging
+import importlib
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,7 +18,29 @@ from backend.services.manager_agent import ManagerAgent
 from backend.services.zapier_integration import ZapierIntegration
 from backend.services.cochl_api import CochlAPIClient, MockCochlAPIClient
 from backend.services.llm_analyzer import LLMAnalyzer
-from backend.routers import webhook, health, file_upload
+from backend.services.scheduler import PriorityScheduler, parse_budgets
+from backend.services.event_store import EventStore
+from backend.services.rolling_stats import RollingStats
+from backend.services.cochl_poller import CochlJobPoller
+from backend.services.audio_stream import AudioStreamHub
+from backend.services.policy_index import PolicyIndex
+from backend.services.dependency_prober import DependencyProber
+from backend.services.sample_catalog import SampleCatalog
+from backend.services.alert_sinks import AlertDispatcher, ZapierSink, SlackWebhookSink, FileSink
+from backend.services.digest import DigestAggregator
+from backend.services.job_queue import JobQueue
+from backend.utils.circuit_breaker import CircuitBreaker
+from backend.utils.rate_limiter import RateLimiter
+from backend.utils.memory_budget import MemoryBudget
+from backend.utils import metrics
+from backend.utils.loop_monitor import LoopMonitor
+from backend.utils.lazy import LazyService, StartupReport
+from backend.utils.dedup import IdempotencyCache
+from backend.utils.traffic_capture import TrafficRecorder
+from backend.routers import webhook, health, file_upload, events, stats, stream, policies
+
+startup_report = StartupReport(_IMPORT_STARTED)
+startup_report.mark("imports")
 
 # 환경 변수 로드
 load_dotenv()
@@ -32,16 +60,139 @@ logger = logging.getLogger(__name__)
 COCHL_API_KEY = os.getenv("COCHL_API_KEY", "")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 ZAPIER_WEBHOOK_URL = os.getenv("ZAPIER_WEBHOOK_URL", "")
+SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
+ALERT_FILE_PATH = os.getenv("ALERT_FILE_PATH", "")
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "1000"))
+DIGEST_INTERVAL_SECONDS = float(os.getenv("DIGEST_INTERVAL_SECONDS", "300"))
+DIGEST_MAX_EVENTS = int(os.getenv("DIGEST_MAX_EVENTS", "500"))
+DIGEST_MAX_SITES = int(os.getenv("DIGEST_MAX_SITES", "1000"))
+DIGEST_RATE_PER_MINUTE = float(os.getenv("DIGEST_RATE_PER_MINUTE", "30"))
 EMERGENCY_THRESHOLD = int(os.getenv("EMERGENCY_THRESHOLD", "7"))
 SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
 SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+COCHL_SLOW_CALL_SECONDS = float(os.getenv("COCHL_SLOW_CALL_SECONDS", "20"))
+ZAPIER_SLOW_CALL_SECONDS = float(os.getenv("ZAPIER_SLOW_CALL_SECONDS", "3"))
+COCHL_HEDGE_ENABLED = os.getenv("COCHL_HEDGE_ENABLED", "false").lower() == "true"
+COCHL_JOB_MODE = os.getenv("COCHL_JOB_MODE", "false").lower() == "true"
+COCHL_POLL_MIN_INTERVAL = float(os.getenv("COCHL_POLL_MIN_INTERVAL", "0.5"))
+COCHL_POLL_MAX_INTERVAL = float(os.getenv("COCHL_POLL_MAX_INTERVAL", "15"))
+COCHL_JOB_TIMEOUT = float(os.getenv("COCHL_JOB_TIMEOUT", "1800"))
+COCHL_RATE_PER_MINUTE = float(os.getenv("COCHL_RATE_PER_MINUTE", "600"))
+COCHL_BURST = int(os.getenv("COCHL_BURST", "20"))
+ZAPIER_RATE_PER_MINUTE = float(os.getenv("ZAPIER_RATE_PER_MINUTE", "300"))
+ZAPIER_BURST = int(os.getenv("ZAPIER_BURST", "10"))
+SLACK_RATE_PER_MINUTE = float(os.getenv("SLACK_RATE_PER_MINUTE", "60"))
+ANTHROPIC_RATE_PER_MINUTE = float(os.getenv("ANTHROPIC_RATE_PER_MINUTE", "50"))
+ANTHROPIC_BURST = int(os.getenv("ANTHROPIC_BURST", "5"))
+LLM_CONTEXT_EVENTS = int(os.getenv("LLM_CONTEXT_EVENTS", "10"))
+LLM_CONTEXT_SECONDS = float(os.getenv("LLM_CONTEXT_SECONDS", "60"))
+LLM_MIN_SEVERITY = int(os.getenv("LLM_MIN_SEVERITY", "4"))
+LLM_LOW_SEVERITY_TEMPLATE = os.getenv("LLM_LOW_SEVERITY_TEMPLATE", "true").lower() == "true"
+LLM_LARGE_MARGIN = int(os.getenv("LLM_LARGE_MARGIN", "1"))
+LLM_SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", LLMAnalyzer.SMALL_MODEL)
+LLM_LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", LLMAnalyzer.LARGE_MODEL)
+EVENT_STORE_PATH = os.getenv("EVENT_STORE_PATH", "data/events.db")
+EVENT_RETENTION_DAYS = float(os.getenv("EVENT_RETENTION_DAYS", "30"))
+STATS_SNAPSHOT_PATH = os.getenv("STATS_SNAPSHOT_PATH", "data/stats_snapshot.json")
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+WEBHOOK_MAX_BODY_MB = float(os.getenv("WEBHOOK_MAX_BODY_MB", "10"))
+STREAM_MAX_STREAMS = int(os.getenv("STREAM_MAX_STREAMS", "256"))
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "2"))
+STREAM_HOP_SECONDS = float(os.getenv("STREAM_HOP_SECONDS", "2"))
+STREAM_BUFFER_SECONDS = float(os.getenv("STREAM_BUFFER_SECONDS", "4"))
+STREAM_MAX_PENDING_WINDOWS = int(os.getenv("STREAM_MAX_PENDING_WINDOWS", "2"))
+POLICY_FILE = os.getenv("POLICY_FILE", "")
+POLICY_CHECK_SECONDS = float(os.getenv("POLICY_CHECK_SECONDS", "5"))
+CAPTURE_FILE = os.getenv("CAPTURE_FILE", "")
+CAPTURE_MAX_MB = float(os.getenv("CAPTURE_MAX_MB", "100"))
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "512"))
+UPLOAD_QUEUE_SECONDS = float(os.getenv("UPLOAD_QUEUE_SECONDS", "10"))
+RESULT_SPILL_DIR = os.getenv("RESULT_SPILL_DIR", "data/results")
+RESULT_SPILL_KB = float(os.getenv("RESULT_SPILL_KB", "1024"))
+RESULT_MEMORY_FRACTION = float(os.getenv("RESULT_MEMORY_FRACTION", "0.25"))
+TASK_EXPIRY_SECONDS = float(os.getenv("TASK_EXPIRY_SECONDS", "3600"))
+MAX_FINISHED_TASKS = int(os.getenv("MAX_FINISHED_TASKS", "1000"))
+DETECTION_MERGE_GAP_SECONDS = float(os.getenv("DETECTION_MERGE_GAP_SECONDS", "1.0"))
+ANALYSIS_QUEUE = os.getenv("ANALYSIS_QUEUE", "false").lower() == "true"
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "data/jobs.db")
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "data/uploads")
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+SAMPLES_DIR = os.getenv("SAMPLES_DIR", "samples")
+PROBE_INTERVAL_SECONDS = float(os.getenv("PROBE_INTERVAL_SECONDS", "15"))
+PROBE_TIMEOUT_SECONDS = float(os.getenv("PROBE_TIMEOUT_SECONDS", "5"))
+READY_MAX_LOOP_LAG_MS = float(os.getenv("READY_MAX_LOOP_LAG_MS", "500"))
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_STALL_MS = float(os.getenv("LOOP_STALL_MS", "250"))
+READY_CRITICAL_DEPENDENCIES = {
+    name.strip() for name in os.getenv("READY_CRITICAL_DEPENDENCIES", "cochl,event_store").split(",") if name.strip()
+}
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
+startup_report.mark("config")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 백그라운드 서비스 관리"""
+    await loop_monitor.start()
+    if RESULT_SPILL_DIR:
+        # 이전 실행이 남긴 결과 파일 정리 (같은 폴더를 쓰는 다른 프로세스의 최근 파일은 유지)
+        removed = await asyncio.get_running_loop().run_in_executor(
+            None, file_upload.clean_spill_dir, RESULT_SPILL_DIR, TASK_EXPIRY_SECONDS
+        )
+        if removed:
+            logger.info(f"🧹 남은 분석 결과 파일 {removed}개 정리: {RESULT_SPILL_DIR}")
+    await event_store.start()
+    await rolling_stats.start()
+    await policy_index.start()
+    await alert_dispatcher.start()
+    if digest:
+        await digest.start()
+    if recorder:
+        await recorder.start()
+    if job_poller:
+        await job_poller.start()
+    if job_queue:
+        await job_queue.start()
+    await prober.start()
+    startup_report.mark("startup")
+    startup_report.log()
+
+    # 무거운 클라이언트는 요청 수신을 막지 않도록 백그라운드에서 준비
+    warm_up = asyncio.ensure_future(asyncio.gather(
+        *(service.warm_up() for service in startup_report.services.values())
+    ))
+    yield
+    warm_up.cancel()
+    await prober.stop()
+    if cochl_client.ready:
+        await cochl_client.aclose()
+    if job_poller:
+        await job_poller.stop()
+    if job_queue:
+        await job_queue.stop()
+    if digest:
+        await digest.stop()
+    await alert_dispatcher.stop()
+    # 알림 전송이 모두 끝난 뒤 Zapier 공유 연결 종료 (사이트별 대상 포함)
+    for destination in filter(None, [zapier, *policy_index.destinations]):
+        await destination.aclose()
+    if recorder:
+        await recorder.stop()
+    await policy_index.stop()
+    await rolling_stats.stop()
+    await event_store.stop()
+    await loop_monitor.stop()
+
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="Cochl 보안 에이전트",
     description="실시간 소리 이벤트 모니터링 및 자동 대응 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -55,37 +206,248 @@ app.add_middleware(
 
 # 전역 인스턴스 생성
 manager = ManagerAgent()
-zapier = ZapierIntegration(ZAPIER_WEBHOOK_URL) if ZAPIER_WEBHOOK_URL else None
+scheduler = PriorityScheduler(parse_budgets(os.getenv("SCHEDULER_BUDGETS", "")))
+event_store = EventStore(EVENT_STORE_PATH, retention_days=EVENT_RETENTION_DAYS)
+rolling_stats = RollingStats(STATS_SNAPSHOT_PATH)
 
-# Cochl API 클라이언트 초기화 (실제 or Mock)
-if COCHL_API_KEY:
-    cochl_client = CochlAPIClient(
-        COCHL_API_KEY,
-        os.getenv("COCHL_API_URL", "https://api.cochl.ai/v1")
+# Webhook 재전송 중복 감지
+webhook_dedup = IdempotencyCache(IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_TTL_SECONDS)
+metrics.register("webhook_dedup", webhook_dedup.stats)
+
+# 트래픽 기록 (CAPTURE_FILE을 설정한 경우에만)
+recorder = TrafficRecorder(CAPTURE_FILE, int(CAPTURE_MAX_MB * 1024 * 1024)) if CAPTURE_FILE else None
+if recorder:
+    metrics.register("traffic_capture", recorder.stats)
+
+# 업로드 파일과 분석 결과의 전체 메모리 예산
+memory_budget = MemoryBudget(int(MEMORY_BUDGET_MB * 1024 * 1024))
+metrics.register("memory", memory_budget.stats)
+
+# 외부 의존성별 서킷 브레이커
+breakers = {
+    "cochl": CircuitBreaker("cochl", slow_call_seconds=COCHL_SLOW_CALL_SECONDS, open_seconds=BREAKER_OPEN_SECONDS),
+    "zapier": CircuitBreaker("zapier", slow_call_seconds=ZAPIER_SLOW_CALL_SECONDS, open_seconds=BREAKER_OPEN_SECONDS),
+}
+
+# 외부 API 할당량을 지키기 위한 공용 속도 제한기
+rate_limiter = RateLimiter()
+rate_limiter.configure("cochl", COCHL_RATE_PER_MINUTE, COCHL_BURST)
+rate_limiter.configure("zapier", ZAPIER_RATE_PER_MINUTE, ZAPIER_BURST)
+rate_limiter.configure("zapier_digest", DIGEST_RATE_PER_MINUTE, 1)
+rate_limiter.configure("slack", SLACK_RATE_PER_MINUTE, 5)
+rate_limiter.configure("anthropic", ANTHROPIC_RATE_PER_MINUTE, ANTHROPIC_BURST)
+metrics.register("rate_limiter", rate_limiter.stats)
+
+zapier = ZapierIntegration(ZAPIER_WEBHOOK_URL, breakers["zapier"], rate_limiter) if ZAPIER_WEBHOOK_URL else None
+
+# 샘플 파일 목록 (폴더가 바뀔 때만 다시 읽음)
+sample_catalog = SampleCatalog(SAMPLES_DIR)
+metrics.register("samples", sample_catalog.stats)
+
+# 사이트/장치별 정책 (심각도, 긴급 기준, 야간 기준, 알림 대상)
+# 사이트별 Webhook URL은 URL마다 별도 서킷 브레이커를 두어 한 사이트 장애가 다른 사이트에 번지지 않게 함
+policy_index = PolicyIndex(
+    POLICY_FILE or None,
+    base_severity_map=ManagerAgent.SOUND_SEVERITY_MAP,
+    default_threshold=EMERGENCY_THRESHOLD,
+    default_zapier=zapier,
+    zapier_factory=lambda url: ZapierIntegration(
+        url,
+        CircuitBreaker("zapier_site", slow_call_seconds=ZAPIER_SLOW_CALL_SECONDS, open_seconds=BREAKER_OPEN_SECONDS),
+        rate_limiter
+    ),
+    check_interval=POLICY_CHECK_SECONDS
+)
+metrics.register("policies", policy_index.stats)
+
+# 긴급 알림 전송 대상 (대상마다 대기열/워커/재시도 정책을 따로 둠)
+alert_dispatcher = AlertDispatcher(scheduler=scheduler)
+if zapier or POLICY_FILE:
+    # 기본 Zapier URL이 없어도 정책 파일의 사이트별 Webhook URL로 보낼 수 있음
+    alert_dispatcher.register(ZapierSink(zapier, queue_size=ALERT_QUEUE_SIZE))
+if SLACK_WEBHOOK_URL:
+    alert_dispatcher.register(SlackWebhookSink(
+        SLACK_WEBHOOK_URL,
+        CircuitBreaker("slack", slow_call_seconds=ZAPIER_SLOW_CALL_SECONDS, open_seconds=BREAKER_OPEN_SECONDS),
+        rate_limiter,
+        queue_size=ALERT_QUEUE_SIZE
+    ))
+if ALERT_FILE_PATH:
+    alert_dispatcher.register(FileSink(ALERT_FILE_PATH, queue_size=ALERT_QUEUE_SIZE))
+metrics.register("alert_sinks", alert_dispatcher.stats)
+
+# 일반 이벤트 주기 요약 (사이트 정책의 알림 대상으로 전송, DIGEST_INTERVAL_SECONDS=0이면 사용 안 함)
+digest = None
+if DIGEST_INTERVAL_SECONDS > 0:
+    digest = DigestAggregator(
+        lambda site_id: policy_index.resolve({"site_id": site_id}).zapier,
+        interval=DIGEST_INTERVAL_SECONDS,
+        max_events=DIGEST_MAX_EVENTS,
+        max_sites=DIGEST_MAX_SITES
     )
-    logger.info("✅ 실제 Cochl API 클라이언트 사용")
-else:
-    cochl_client = MockCochlAPIClient()
-    logger.warning("⚠️ Mock Cochl API 클라이언트 사용 (테스트 모드)")
+    metrics.register("digest", digest.stats)
+
+
+def create_cochl_client():
+    """Cochl API 클라이언트 생성 (실제 or Mock)"""
+    if COCHL_API_KEY:
+        client = CochlAPIClient(
+            COCHL_API_KEY,
+            os.getenv("COCHL_API_URL", "https://api.cochl.ai/v1"),
+            breaker=breakers["cochl"],
+            hedge_enabled=COCHL_HEDGE_ENABLED,
+            rate_limiter=rate_limiter
+        )
+        logger.info("✅ 실제 Cochl API 클라이언트 사용")
+    else:
+        client = MockCochlAPIClient()
+        logger.warning("⚠️ Mock Cochl API 클라이언트 사용 (테스트 모드)")
+    return client
+
 
-# LLM Analyzer 초기화
-llm_analyzer = LLMAnalyzer(ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
+# 실시간 오디오 스트림 (동시 스트림 수와 스트림별 버퍼 크기 제한)
+stream_hub = AudioStreamHub(
+    max_streams=STREAM_MAX_STREAMS,
+    window_seconds=STREAM_WINDOW_SECONDS,
+    hop_seconds=STREAM_HOP_SECONDS,
+    buffer_seconds=STREAM_BUFFER_SECONDS,
+    max_pending_windows=STREAM_MAX_PENDING_WINDOWS
+)
+metrics.register("audio_streams", stream_hub.stats)
+
+# 외부 API 클라이언트는 첫 사용 시 또는 시작 직후 백그라운드에서 생성
+cochl_client = LazyService("cochl_client", create_cochl_client)
+llm_analyzer = (
+    LazyService(
+        "llm_analyzer",
+        lambda: LLMAnalyzer(
+            ANTHROPIC_API_KEY,
+            rate_limiter,
+            LLM_CONTEXT_EVENTS,
+            LLM_CONTEXT_SECONDS,
+            min_severity=LLM_MIN_SEVERITY,
+            low_severity_template=LLM_LOW_SEVERITY_TEMPLATE,
+            large_margin=LLM_LARGE_MARGIN,
+            small_model=LLM_SMALL_MODEL,
+            large_model=LLM_LARGE_MODEL
+        )
+    )
+    if ANTHROPIC_API_KEY else None
+)
+
+# 비동기 작업 모드: 분석 결과를 하나의 폴러가 모아서 조회
+job_poller = (
+    CochlJobPoller(
+        cochl_client,
+        min_interval=COCHL_POLL_MIN_INTERVAL,
+        max_interval=COCHL_POLL_MAX_INTERVAL,
+        job_timeout=COCHL_JOB_TIMEOUT
+    )
+    if COCHL_JOB_MODE else None
+)
+if job_poller:
+    metrics.register("cochl_jobs", job_poller.stats)
+    logger.info("✅ Cochl 비동기 작업 모드 사용 (제출 후 폴링)")
 if not llm_analyzer:
     logger.warning("⚠️ LLM 분석 비활성화됨 (ANTHROPIC_API_KEY 미설정)")
 
+# 분석 워커 모드: 업로드는 영속 대기열에 등록만 하고 python -m backend.worker가 처리
+job_queue = (
+    JobQueue(JOB_QUEUE_PATH, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS)
+    if ANALYSIS_QUEUE else None
+)
+if job_queue:
+    metrics.register("job_queue", job_queue.stats)
+
+# 이벤트 루프 지연 측정 + 루프를 막는 호출 감지 (멈추면 스택을 로그와 /metrics/loop-stalls에 기록)
+loop_monitor = LoopMonitor(interval=LOOP_MONITOR_INTERVAL_MS / 1000, stall_seconds=LOOP_STALL_MS / 1000)
+metrics.register("event_loop", loop_monitor.stats)
+
+# 의존성 상태 점검 (백그라운드에서 주기적으로 측정, /health/ready는 캐시된 결과만 반환)
+prober = DependencyProber(
+    interval=PROBE_INTERVAL_SECONDS, timeout=PROBE_TIMEOUT_SECONDS, loop_monitor=loop_monitor
+)
+prober.register("event_store", event_store.ping, critical="event_store" in READY_CRITICAL_DEPENDENCIES)
+if COCHL_API_KEY:
+    prober.register(
+        "cochl",
+        prober.http_probe(os.getenv("COCHL_API_URL", "https://api.cochl.ai/v1")),
+        critical="cochl" in READY_CRITICAL_DEPENDENCIES
+    )
+if ZAPIER_WEBHOOK_URL:
+    prober.register("zapier", prober.http_probe(ZAPIER_WEBHOOK_URL), critical="zapier" in READY_CRITICAL_DEPENDENCIES)
+if SLACK_WEBHOOK_URL:
+    prober.register("slack", prober.http_probe(SLACK_WEBHOOK_URL), critical="slack" in READY_CRITICAL_DEPENDENCIES)
+if ANTHROPIC_API_KEY:
+    prober.register(
+        "anthropic",
+        prober.http_probe("https://api.anthropic.com"),
+        critical="anthropic" in READY_CRITICAL_DEPENDENCIES
+    )
+prober.watch_queue("event_store_pending", lambda: event_store.pending)
+prober.watch_queue("scheduler_waiting", lambda: sum(c["waiting"] for c in scheduler.stats().values()))
+prober.watch_queue(
+    "alert_queue", lambda: sum(sink["queue_depth"] for sink in alert_dispatcher.stats().values())
+)
+if job_queue:
+    prober.watch_queue("analysis_jobs_queued", lambda: job_queue.stats()["queued"])
+metrics.register("dependencies", prober.stats)
+
+# HTTP 클라이언트 라이브러리도 첫 알림 전에 미리 로드
+startup_report.track(LazyService("httpx", lambda: importlib.import_module("httpx")))
+startup_report.track(cochl_client)
+startup_report.track(llm_analyzer)
+metrics.register("startup", startup_report.snapshot)
+startup_report.mark("services")
+
 # 라우터 설정 및 등록
-webhook_router = webhook.setup_webhook_router(manager, zapier, EMERGENCY_THRESHOLD)
-health_router = health.setup_health_router(COCHL_API_KEY, ZAPIER_WEBHOOK_URL, EMERGENCY_THRESHOLD)
+webhook_router = webhook.setup_webhook_router(
+    manager, zapier, EMERGENCY_THRESHOLD, scheduler, event_store, rolling_stats, webhook_dedup, policy_index,
+    recorder, alert_dispatcher, digest, int(WEBHOOK_MAX_BODY_MB * 1024 * 1024)
+)
+health_router = health.setup_health_router(
+    COCHL_API_KEY, ZAPIER_WEBHOOK_URL, EMERGENCY_THRESHOLD, breakers, prober, READY_MAX_LOOP_LAG_MS / 1000,
+    loop_monitor
+)
 file_upload_router = file_upload.setup_file_upload_router(
     cochl_client,
     manager,
     EMERGENCY_THRESHOLD,
-    llm_analyzer  # LLM Analyzer 추가
+    llm_analyzer,  # LLM Analyzer 추가
+    scheduler,
+    event_store,
+    rolling_stats,
+    job_poller,
+    policy_index,
+    recorder,
+    memory_budget,
+    UPLOAD_QUEUE_SECONDS,
+    RESULT_SPILL_DIR,
+    int(RESULT_SPILL_KB * 1024),
+    DETECTION_MERGE_GAP_SECONDS,
+    job_queue,
+    UPLOAD_DIR,
+    sample_catalog,
+    RESULT_MEMORY_FRACTION,
+    TASK_EXPIRY_SECONDS,
+    MAX_FINISHED_TASKS
+)
+events_router = events.setup_events_router(event_store)
+stats_router = stats.setup_stats_router(rolling_stats)
+stream_router = stream.setup_stream_router(
+    stream_hub, cochl_client, manager, EMERGENCY_THRESHOLD, zapier, scheduler, event_store, rolling_stats,
+    policy_index, alert_dispatcher, digest
 )
+policies_router = policies.setup_policies_router(policy_index)
 
 app.include_router(webhook_router)
 app.include_router(health_router)
 app.include_router(file_upload_router)
+app.include_router(events_router)
+app.include_router(stats_router)
+app.include_router(stream_router)
+app.include_router(policies_router)
+startup_report.mark("routers")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+"""
+이벤트 조회 라우터: 저장된 소리 이벤트 검색
+"""
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.services.event_store import EventStore, parse_epoch
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["events"]
+)
+
+
+def setup_events_router(event_store: EventStore):
+    """이벤트 조회 라우터 설정"""
+
+    @router.get("/events")
+    async def list_events(
+        since: Optional[str] = Query(None, description="조회 시작 시각 (ISO 8601 또는 epoch 초)"),
+        until: Optional[str] = Query(None, description="조회 종료 시각 (ISO 8601 또는 epoch 초, 미포함)"),
+        tag: Optional[str] = Query(None, description="소리 종류 (예: scream)"),
+        min_severity: Optional[int] = Query(None, ge=1, le=10, description="최소 심각도 점수"),
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+        limit: int = Query(100, ge=1, le=1000, description="페이지 크기")
+    ):
+        """
+        저장된 이벤트를 시간순으로 조회합니다
+
+        다음 페이지는 응답의 next_cursor를 cursor로 전달하여 조회하세요.
+        """
+        try:
+            since_epoch = parse_epoch(since) if since else None
+            until_epoch = parse_epoch(until) if until else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            events, next_cursor = await event_store.query(
+                since=since_epoch,
+                until=until_epoch,
+                tag=tag.lower() if tag else None,
+                min_severity=min_severity,
+                cursor=cursor,
+                limit=limit
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다")
+
+        return {
+            "events": events,
+            "count": len(events),
+            "next_cursor": next_cursor
+        }
+
+    return router
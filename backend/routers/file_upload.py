@@ -1,16 +1,35 @@
 """
 파일 업로드 및 분석 라우터
 """
+import os
+import json
+import time
 import uuid
+import asyncio
 import logging
-from typing import Dict
-from datetime import datetime
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-from backend.models.sound_event import SoundEvent
 from backend.services.manager_agent import ManagerAgent
 from backend.services.llm_analyzer import LLMAnalyzer
+from backend.services.scheduler import PriorityScheduler, Priority
+from backend.services.event_store import EventStore
+from backend.services.rolling_stats import RollingStats
+from backend.services.cochl_poller import CochlJobPoller
+from backend.services.policy_index import PolicyIndex
+from backend.services.result_index import TaskResultIndex
+from backend.services.analysis import analyze_detections, interpretation_progress
+from backend.services.job_queue import JobQueue, COMPLETED, FAILED
+from backend.services.sample_catalog import SampleCatalog
+from backend.utils import wire_formats
+from backend.utils.file_response import RangeFileResponse
+from backend.utils.http_cache import CachedResource, render, etag_matches
+from backend.utils.lazy import resolve
+from backend.utils.memory_budget import MemoryBudget, MemoryBudgetExceeded
+from backend.utils.traffic_capture import TrafficRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +40,8 @@ router = APIRouter(
 
 # 작업 상태 저장 (프로덕션에서는 Redis 사용 권장)
 tasks: Dict[str, dict] = {}
+# 완료/실패한 작업 ID → 완료 시각 (완료 순서, 보관 기간이 지나면 제거)
+finished_tasks: "OrderedDict[str, float]" = OrderedDict()
 
 
 class FileInfo(BaseModel):
@@ -46,37 +67,474 @@ class DetectionResultModel(BaseModel):
     end_time: float
     severity_score: int
     message: str
+    peak_confidence: float
+    mean_confidence: float
+    window_count: int
+    interpretation_tier: Optional[str] = None
+    interpretation_status: Optional[str] = None
+
+
+def build_task_response(task_id: str, task: dict) -> dict:
+    """작업 상태 응답 본문 구성"""
+    response = {
+        "task_id": task_id,
+        "status": task["status"],
+        "file_info": {
+            "filename": task["filename"],
+            "size": task["file_size"],
+            "format": task["content_type"]
+        }
+    }
+
+    if task["status"] == "completed" and task["results"]:
+        response["results"] = task["results"]
+        response["summary"] = task["summary"]
+    elif task["status"] == "partial":
+        # 채점은 끝났고 LLM 해석이 채워지는 중
+        response["results"] = task["results"]
+        response["summary"] = task["summary"]
+        response["interpretations"] = interpretation_progress(task["results"])
+    elif task["status"] == "failed":
+        response["error"] = task.get("error")
+
+    return response
+
+
+def task_ndjson_records(response: dict):
+    """NDJSON 응답: 첫 줄은 작업 정보와 요약, 이후 탐지 결과 한 줄씩"""
+    yield {key: value for key, value in response.items() if key != "results"}
+    for result in response.get("results") or []:
+        yield result
+
+
+async def finalize_task(
+    task_id: str,
+    memory_budget: MemoryBudget = None,
+    spill_dir: str = None,
+    spill_bytes: int = 1024 * 1024,
+    result_memory_fraction: float = 0.25
+):
+    """
+    완료/실패한 작업의 응답을 한 번만 직렬화하여 보관
+
+    이후 조회는 저장된 바이트와 ETag를 그대로 사용합니다.
+    memory_budget이 있으면 보관하는 결과를 예산에 반영합니다. 결과가
+    spill_bytes 이상이거나, 보관 중인 결과 합계가 예산의 result_memory_fraction을
+    넘거나, 예산이 부족하면 spill_dir에 파일로 내려 메모리에서 해제합니다
+    (완료된 결과가 업로드에 쓸 예산을 차지하지 않도록).
+    """
+    task = tasks[task_id]
+    release_task_memory(task)
+    finished_tasks[task_id] = time.monotonic()
+    finished_tasks.move_to_end(task_id)
+    if task["status"] == "completed" and task.get("index") is None:
+        # 페이지/필터 조회용 인덱스 (완료 시 한 번만 생성)
+        task["index"] = TaskResultIndex(task["results"] or [])
+    resource = CachedResource(build_task_response(task_id, task), task_ndjson_records)
+    if memory_budget is None:
+        task["response_cache"] = resource
+        return
+
+    payload = resource.representation(wire_formats.JSON)
+    # 결과 객체와 직렬화된 본문이 함께 남으므로 본문 크기의 2배로 추정
+    estimate = payload.size * 2
+    reservation = None
+    if not spill_dir:
+        reservation = memory_budget.try_reserve(estimate, "result") or memory_budget.charge(estimate, "result")
+    elif (
+        estimate < spill_bytes
+        and memory_budget.used_by("result") + estimate <= memory_budget.limit_bytes * result_memory_fraction
+    ):
+        reservation = memory_budget.try_reserve(estimate, "result")
+
+    if reservation is not None:
+        task["response_cache"] = resource
+        task["memory_reservation"] = reservation
+        return
+
+    # 디스크로 내리기: 메모리에는 요약과 인덱스만 남김
+    directory = process_spill_dir(spill_dir)
+    path = os.path.join(directory, f"{task_id}.json")
+    records_path = os.path.join(directory, f"{task_id}.ndjson")
+    offsets = await asyncio.get_running_loop().run_in_executor(
+        None, write_spill, path, payload.body, records_path, task["results"] or []
+    )
+    task["results"] = None
+    task["spilled"] = {
+        "path": path,
+        "etag": payload.etag,
+        "size": len(payload.body),
+        "records_path": records_path,
+        "offsets": offsets
+    }
+    logger.info(f"💾 큰 분석 결과를 디스크로 이동: task_id={task_id}, {len(payload.body)} bytes")
+
+
+def release_task_memory(task: dict):
+    """작업이 보관 중인 결과의 메모리 예산 반납"""
+    reservation = task.pop("memory_reservation", None)
+    if reservation is not None:
+        reservation.release()
+
+
+async def evict_tasks(retention_seconds: float, max_finished: int) -> int:
+    """
+    보관 기간이 지났거나 보관 개수를 넘은 완료/실패 작업 제거
+
+    제거한 작업의 메모리 예산을 반납하고 디스크로 내린 결과 파일도 삭제합니다.
+
+    반환값:
+        제거한 작업 수
+    """
+    deadline = time.monotonic() - retention_seconds
+    evicted = []
+    while finished_tasks:
+        task_id, finished_at = next(iter(finished_tasks.items()))
+        if finished_at > deadline and len(finished_tasks) <= max_finished:
+            break
+        finished_tasks.popitem(last=False)
+        task = tasks.pop(task_id, None)
+        if task is not None:
+            release_task_memory(task)
+            evicted.append(task)
+
+    spilled = [task["spilled"] for task in evicted if task.get("spilled")]
+    if spilled:
+        await asyncio.get_running_loop().run_in_executor(None, remove_spill_files, spilled)
+    if evicted:
+        logger.info(f"🧹 오래된 작업 {len(evicted)}개 제거 (보관 중 {len(finished_tasks)}개)")
+    return len(evicted)
+
+
+def write_spill(path: str, body: bytes, records_path: str, results: List[dict]) -> List[int]:
+    """
+    전체 응답(JSON)과 결과별 한 줄 파일(NDJSON)을 기록
+
+    반환값:
+        결과 번호별 NDJSON 줄 시작 위치 (페이지 조회 시 필요한 줄만 읽음)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+    offsets = []
+    with open(records_path, "wb") as f:
+        for result in results:
+            offsets.append(f.tell())
+            f.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+    return offsets
+
+
+def read_spill_records(records_path: str, offsets: List[int], indexes: List[int]) -> List[dict]:
+    with open(records_path, "rb") as f:
+        records = []
+        for i in indexes:
+            f.seek(offsets[i])
+            records.append(json.loads(f.readline()))
+        return records
+
+
+def write_upload(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def read_spill(path: str) -> dict:
+    with open(path, "rb") as f:
+        return wire_formats.decode(f.read(), wire_formats.JSON)
+
+
+def remove_spill_files(spilled: List[dict]):
+    for entry in spilled:
+        for path in (entry["path"], entry["records_path"]):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def process_spill_dir(spill_dir: str) -> str:
+    """
+    이 프로세스 전용 결과 파일 폴더
+
+    여러 API 프로세스가 같은 spill_dir을 써도 서로의 파일을 건드리지 않도록
+    프로세스 ID별 하위 폴더를 사용합니다 (fork 후에도 맞도록 매번 계산).
+    """
+    return os.path.join(spill_dir, f"pid-{os.getpid()}")
+
+
+def clean_spill_dir(spill_dir: str, max_age_seconds: float) -> int:
+    """
+    남은 결과 파일 정리 (서버 시작 시 한 번, 스레드에서 실행)
+
+    - 이 프로세스 폴더: 같은 PID를 쓰던 이전 실행의 파일이므로 모두 삭제
+      (작업 목록은 메모리에만 있으므로 다시 조회할 수 없음)
+    - 그 밖의 파일: max_age_seconds(작업 보관 기간)보다 오래된 것만 삭제.
+      살아 있는 프로세스는 그 전에 작업을 제거하며 파일도 지우므로,
+      이보다 오래된 파일은 종료된 프로세스가 남긴 것입니다
+
+    반환값:
+        삭제한 파일 수
+    """
+    if not spill_dir or not os.path.isdir(spill_dir):
+        return 0
+    own = os.path.abspath(process_spill_dir(spill_dir))
+    deadline = time.time() - max_age_seconds
+    removed = 0
+    for directory, _, names in os.walk(spill_dir, topdown=False):
+        is_own = os.path.abspath(directory) == own
+        for name in names:
+            if not name.endswith((".json", ".ndjson")):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if is_own or os.path.getmtime(path) < deadline:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        if directory != spill_dir and not is_own:
+            try:
+                os.rmdir(directory)  # 비어 있을 때만 삭제됨
+            except OSError:
+                pass
+    return removed
+
+
+async def spilled_response(task: dict, request: Request) -> Response:
+    """디스크로 내린 결과 응답 (JSON은 파일을 그대로 전송, 다른 형식은 읽어서 변환)"""
+    spilled = task["spilled"]
+    headers = {"ETag": spilled["etag"], "Cache-Control": "private, max-age=0, must-revalidate",
+               "Vary": "Accept, Accept-Encoding"}
+    media_type = wire_formats.negotiate(request.headers.get("accept"))
+    if media_type == wire_formats.JSON:
+        if etag_matches(request.headers.get("if-none-match"), spilled["etag"]):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(spilled["path"], media_type=wire_formats.JSON, headers=headers)
+    content = await asyncio.get_running_loop().run_in_executor(None, read_spill, spilled["path"])
+    return render(content, request, ndjson_records=task_ndjson_records)
+
+
+def project(result: dict, fields: Optional[List[str]], exclude: Optional[List[str]]) -> dict:
+    """결과에서 필요한 필드만 남김 (fields: 포함할 필드, exclude: 뺄 필드)"""
+    if fields:
+        result = {key: result[key] for key in fields if key in result}
+    if exclude:
+        result = {key: value for key, value in result.items() if key not in exclude}
+    return result
+
+
+def split_param(value: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분된 쿼리 값 → 목록"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
 
 
 def setup_file_upload_router(
     cochl_client,
     manager_agent: ManagerAgent,
     emergency_threshold: int,
-    llm_analyzer: LLMAnalyzer = None
+    llm_analyzer: LLMAnalyzer = None,
+    scheduler: PriorityScheduler = None,
+    event_store: EventStore = None,
+    rolling_stats: RollingStats = None,
+    job_poller: CochlJobPoller = None,
+    policies: PolicyIndex = None,
+    recorder: TrafficRecorder = None,
+    memory_budget: MemoryBudget = None,
+    upload_queue_seconds: float = 10.0,
+    spill_dir: str = None,
+    spill_bytes: int = 1024 * 1024,
+    merge_gap_seconds: float = 1.0,
+    job_queue: JobQueue = None,
+    upload_dir: str = "data/uploads",
+    samples: SampleCatalog = None,
+    result_memory_fraction: float = 0.25,
+    task_retention_seconds: float = 3600.0,
+    max_finished_tasks: int = 1000
 ):
-    """파일 업로드 라우터 설정"""
+    """
+    파일 업로드 라우터 설정
+
+    job_poller가 있으면 비동기 작업 모드로 동작합니다: 파일을 제출만 하고
+    결과는 폴러가 받아오므로 분석 중에는 연결/워커 슬롯을 점유하지 않습니다.
+
+    memory_budget이 있으면 업로드 파일을 읽기 전에 크기만큼 메모리를 확보합니다
+    (부족하면 upload_queue_seconds 동안 대기 후 503). 업로드 버퍼는 Cochl 호출이
+    끝나는 즉시 반납하고, 큰 결과나 예산의 result_memory_fraction을 넘는 결과는
+    spill_dir 아래 프로세스별 폴더에 파일로 보관합니다 (남은 파일 정리는
+    서버 시작 시 clean_spill_dir로 수행).
+
+    완료/실패한 작업은 task_retention_seconds 동안 조회할 수 있으며, 최대
+    max_finished_tasks개까지 보관합니다 (오래된 작업부터 제거하고 예산 반납).
+
+    같은 소리가 여러 분석 구간으로 나뉘어 오면 merge_gap_seconds 이내의 구간을
+    하나로 합친 뒤 채점합니다 (음수면 병합하지 않음).
+
+    job_queue가 있으면 이 프로세스에서는 분석하지 않습니다: 업로드 파일을
+    upload_dir에 저장하고 영속 대기열에 등록한 뒤, 별도 워커 프로세스
+    (python -m backend.worker)가 끝낸 결과를 모아 반영합니다.
+    """
+    scheduler = scheduler or PriorityScheduler()
+    policies = policies or PolicyIndex(
+        base_severity_map=manager_agent.SOUND_SEVERITY_MAP,
+        default_threshold=emergency_threshold
+    )
+    samples = samples or SampleCatalog()
+
+    async def finalize(task_id: str):
+        await finalize_task(task_id, memory_budget, spill_dir, spill_bytes, result_memory_fraction)
+        await evict_tasks(task_retention_seconds, max_finished_tasks)
+
+    async def complete_task(task_id: str, processed_results: List[dict], summary: dict):
+        """분석 결과 저장 후 집계/이벤트 저장소 반영"""
+        task = tasks[task_id]
+        task["status"] = "completed"
+        task["results"] = processed_results
+        task["summary"] = summary
+
+        # 롤링 집계 갱신
+        if rolling_stats:
+            for result in processed_results:
+                rolling_stats.record(result["tag"], result["severity_score"], result["is_emergency"])
+
+        # 이벤트 저장소에 기록
+        if event_store:
+            for result in processed_results:
+                event_store.append(
+                    source="file",
+                    tag=result["tag"],
+                    confidence=result["confidence"],
+                    severity=result["severity_score"],
+                    is_emergency=result["is_emergency"],
+                    event_id=result["event_id"],
+                    task_id=task_id,
+                    payload={
+                        "filename": task["filename"],
+                        "start_time": result["start_time"],
+                        "end_time": result["end_time"],
+                        "interpretation": result["interpretation"]
+                    }
+                )
+
+        await finalize(task_id)
+        logger.info(f"파일 분석 완료: task_id={task_id}, detections={len(processed_results)}")
+
+    def restore_task(job: dict) -> dict:
+        """대기열의 작업으로 작업 상태 복원 (서버 재시작 후 조회 등)"""
+        task = tasks.get(job["id"])
+        if task is None:
+            task = tasks[job["id"]] = {
+                "status": "processing",
+                "filename": job["filename"],
+                "file_size": job["file_size"],
+                "content_type": job["content_type"] or "unknown",
+                "results": None,
+                "error": None,
+                "response_cache": None
+            }
+        return task
+
+    async def on_job_finished(job: dict):
+        """워커가 끝낸 작업 반영 (집계/이벤트 저장소 기록은 여기서 한 번만)"""
+        task = restore_task(job)
+        if job["status"] == COMPLETED:
+            await complete_task(job["id"], job["result"]["results"], job["result"]["summary"])
+        else:
+            logger.error(f"파일 분석 실패: task_id={job['id']}, error={job['error']}")
+            task["status"] = "failed"
+            task["error"] = job["error"]
+            await finalize(job["id"])
+        # 업로드 파일 삭제
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, os.remove, job["file_path"])
+        except OSError:
+            pass
+
+    async def load_job(task_id: str) -> Optional[dict]:
+        """이 프로세스가 모르는 작업을 대기열에서 찾아 복원 (결과 반영은 다시 하지 않음)"""
+        job = await job_queue.get(task_id)
+        if job is None:
+            return None
+        task = restore_task(job)
+        if job["status"] == COMPLETED and job["collected"]:
+            task["status"] = "completed"
+            task["results"] = job["result"]["results"]
+            task["summary"] = job["result"]["summary"]
+            await finalize(task_id)
+        elif job["status"] == FAILED and job["collected"]:
+            task["status"] = "failed"
+            task["error"] = job["error"]
+            await finalize(task_id)
+        return task
+
+    if job_queue:
+        job_queue.subscribe(on_job_finished)
 
     @router.post("/analyze", response_model=AnalyzeResponse)
     async def analyze_file(
         background_tasks: BackgroundTasks,
-        file: UploadFile = File(...)
+        file: UploadFile = File(...),
+        bulk: bool = Query(False, description="대량/오프라인 분석 (낮은 우선순위로 처리)"),
+        site_id: str = Query(None, description="사이트 ID (사이트별 정책 적용)"),
+        device_id: str = Query(None, description="장치 ID (장치별 정책 적용)")
     ):
         """
         오디오/비디오 파일 업로드 및 분석
 
         지원 형식: mp3, wav, ogg, m4a, mp4, webm
         최대 크기: 50MB
+        bulk=true로 요청하면 실시간 이벤트와 일반 업로드 뒤에 처리됩니다
         """
         # 파일 크기 검증 (50MB)
         MAX_FILE_SIZE = 50 * 1024 * 1024
+
+        # 메모리 예산 확보 후 읽기 (업로드 본문은 그 전까지 임시 파일에 있음)
+        upload_reservation = None
+        if memory_budget and file.size is not None and file.size <= MAX_FILE_SIZE:
+            try:
+                upload_reservation = await memory_budget.reserve(file.size, upload_queue_seconds, "upload")
+            except MemoryBudgetExceeded as e:
+                logger.warning(f"⚠️ 메모리 예산 부족으로 업로드 거절: {file.filename} ({file.size} bytes) - {e}")
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"서버 메모리 예산이 부족합니다. 잠시 후 다시 시도하세요: {e}",
+                    headers={"Retry-After": str(int(e.retry_after) or 1)}
+                )
         file_bytes = await file.read()
 
+        def release_upload():
+            """업로드 버퍼 해제 (Cochl 호출이 끝나면 더 이상 필요 없음)"""
+            nonlocal file_bytes
+            file_bytes = None
+            if upload_reservation:
+                upload_reservation.release()
+
+        # 트래픽 기록 (파일 내용 없이 메타데이터만)
+        if recorder:
+            recorder.record(
+                "upload",
+                filename=file.filename,
+                size=len(file_bytes),
+                content_type=file.content_type,
+                bulk=bulk,
+                site_id=site_id,
+                device_id=device_id
+            )
+
         if len(file_bytes) > MAX_FILE_SIZE:
+            release_upload()
             raise HTTPException(status_code=413, detail="파일 크기가 50MB를 초과합니다")
 
         # 파일 형식 검증
         allowed_formats = [".mp3", ".wav", ".ogg", ".m4a", ".mp4", ".webm", ".avi"]
         if not any(file.filename.lower().endswith(fmt) for fmt in allowed_formats):
+            release_upload()
             raise HTTPException(
                 status_code=400,
                 detail=f"지원하지 않는 파일 형식입니다. 지원 형식: {', '.join(allowed_formats)}"
@@ -86,81 +544,100 @@ def setup_file_upload_router(
         task_id = str(uuid.uuid4())
 
         # 작업 상태 초기화
+        file_size = len(file_bytes)
         tasks[task_id] = {
             "status": "processing",
             "filename": file.filename,
-            "file_size": len(file_bytes),
+            "file_size": file_size,
             "content_type": file.content_type or "unknown",
             "results": None,
-            "error": None
+            "error": None,
+            "response_cache": None
         }
 
-        logger.info(f"파일 분석 시작: task_id={task_id}, filename={file.filename}, size={len(file_bytes)} bytes")
+        priority = Priority.BULK if bulk else Priority.INTERACTIVE
+        logger.info(
+            f"파일 분석 시작: task_id={task_id}, filename={file.filename}, "
+            f"size={file_size} bytes, priority={priority.name.lower()}"
+        )
+
+        if job_queue:
+            # 분석 워커 모드: 파일을 저장하고 대기열에 등록만 함
+            file_path = os.path.join(upload_dir, task_id + os.path.splitext(file.filename)[1].lower())
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, write_upload, file_path, file_bytes)
+            finally:
+                release_upload()
+            await job_queue.enqueue(
+                task_id, file_path, file.filename, file.content_type, file_size, priority, site_id, device_id
+            )
+            return AnalyzeResponse(
+                task_id=task_id,
+                status="processing",
+                file_info=FileInfo(filename=file.filename, size=file_size, format=file.content_type or "unknown")
+            )
 
         # 백그라운드에서 파일 분석 실행
         async def process_file():
             try:
-                # Cochl API로 파일 분석
-                logger.info(f"Cochl API 호출 중... task_id={task_id}")
-                cochl_results = await cochl_client.analyze_file(file_bytes, file.filename)
-
-                # Manager Agent로 심각도 계산
-                processed_results = []
-                for cochl_result in cochl_results:
-                    # SoundEvent 객체 생성
-                    sound_event = SoundEvent(
-                        event_id=cochl_result.event_id,
-                        tag=cochl_result.tag,
-                        confidence=cochl_result.confidence,
-                        timestamp=datetime.now().isoformat(),
-                        metadata={
-                            "start_time": cochl_result.start_time,
-                            "end_time": cochl_result.end_time
-                        }
-                    )
-
-                    # 심각도 계산
-                    severity_score = manager_agent.calculate_severity(sound_event)
-                    alert_message = manager_agent.create_alert_message(sound_event, severity_score)
-
-                    processed_results.append({
-                        "event_id": cochl_result.event_id,
-                        "tag": cochl_result.tag,
-                        "confidence": cochl_result.confidence,
-                        "start_time": cochl_result.start_time,
-                        "end_time": cochl_result.end_time,
-                        "severity_score": severity_score,
-                        "message": alert_message,
-                        "is_emergency": severity_score >= emergency_threshold,
-                        "interpretation": None  # 초기값
-                    })
-
-                # LLM 분석 추가 (새로 추가)
-                if llm_analyzer and len(processed_results) > 0:
-                    logger.info(f"🤖 LLM 상황 분석 시작... ({len(processed_results)}개 이벤트)")
-                    for result in processed_results:
-                        interpretation = await llm_analyzer.analyze_event(result, processed_results)
-                        result["interpretation"] = interpretation
-                    logger.info("✅ LLM 상황 분석 완료")
-
-                # 요약 정보 계산
-                summary = {
-                    "total_detections": len(processed_results),
-                    "highest_severity": max([r["severity_score"] for r in processed_results], default=0),
-                    "emergency_count": sum(1 for r in processed_results if r["is_emergency"])
-                }
-
-                # 결과 저장
-                tasks[task_id]["status"] = "completed"
-                tasks[task_id]["results"] = processed_results
-                tasks[task_id]["summary"] = summary
-
-                logger.info(f"파일 분석 완료: task_id={task_id}, detections={len(processed_results)}")
+                if job_poller:
+                    # 비동기 작업 모드: 제출 후 슬롯을 반납하고 결과가 오면 이어서 처리
+                    async with scheduler.worker(priority):
+                        logger.info(f"Cochl 분석 작업 제출 중... task_id={task_id}")
+                        async with scheduler.connection(priority):
+                            client = await resolve(cochl_client)
+                            remote_id = await client.submit_file(file_bytes, file.filename)
+                    release_upload()
+                    tasks[task_id]["remote_task_id"] = remote_id
+                    cochl_results = await job_poller.wait(remote_id)
+                    async with scheduler.worker(priority):
+                        await run_analysis(cochl_results)
+                else:
+                    async with scheduler.worker(priority):
+                        # Cochl API로 파일 분석
+                        logger.info(f"Cochl API 호출 중... task_id={task_id}")
+                        async with scheduler.connection(priority):
+                            client = await resolve(cochl_client)
+                            cochl_results = await client.analyze_file(file_bytes, file.filename)
+                        release_upload()
+                        await run_analysis(cochl_results)
 
             except Exception as e:
                 logger.error(f"파일 분석 실패: task_id={task_id}, error={str(e)}", exc_info=True)
                 tasks[task_id]["status"] = "failed"
                 tasks[task_id]["error"] = str(e)
+                tasks[task_id].pop("index", None)
+                await finalize(task_id)
+            finally:
+                release_upload()
+
+        async def publish_scored(processed_results: List[dict], summary: dict):
+            """채점 결과를 LLM 해석 전에 먼저 공개 (해석은 끝나는 대로 같은 결과에 채워짐)"""
+            task = tasks[task_id]
+            task["status"] = "partial"
+            task["results"] = processed_results
+            task["summary"] = summary
+            # 인덱스 항목(시작 시각/태그/심각도)은 해석과 무관하므로 완료 시 그대로 사용
+            task["index"] = TaskResultIndex(processed_results)
+            logger.info(
+                f"파일 분석 채점 완료 (해석 진행 중): task_id={task_id}, detections={len(processed_results)}, "
+                f"emergencies={summary['emergency_count']}"
+            )
+
+        async def run_analysis(cochl_results):
+            policy = policies.resolve({"site_id": site_id, "device_id": device_id})
+            processed_results, summary = await analyze_detections(
+                cochl_results,
+                manager_agent,
+                policy,
+                site_id=site_id,
+                device_id=device_id,
+                merge_gap_seconds=merge_gap_seconds,
+                llm_analyzer=llm_analyzer,
+                llm_slot=lambda: scheduler.connection(priority),
+                on_scored=publish_scored
+            )
+            await complete_task(task_id, processed_results, summary)
 
         # 백그라운드 작업 시작
         background_tasks.add_task(process_file)
@@ -170,67 +647,121 @@ def setup_file_upload_router(
             status="processing",
             file_info=FileInfo(
                 filename=file.filename,
-                size=len(file_bytes),
+                size=file_size,
                 format=file.content_type or "unknown"
             )
         )
 
     @router.get("/analyze/{task_id}")
-    async def get_analysis_result(task_id: str):
+    async def get_analysis_result(
+        task_id: str,
+        request: Request,
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (기본 100)"),
+        tag: Optional[str] = Query(None, description="소리 종류 (쉼표로 여러 개)"),
+        min_severity: Optional[int] = Query(None, ge=1, le=10, description="최소 심각도 점수"),
+        since_seconds: Optional[float] = Query(None, ge=0, description="녹음 내 시작 시각 하한 (초)"),
+        until_seconds: Optional[float] = Query(None, ge=0, description="녹음 내 시작 시각 상한 (초, 미포함)"),
+        emergencies_only: bool = Query(False, description="긴급 이벤트만"),
+        fields: Optional[str] = Query(None, description="포함할 결과 필드 (쉼표로 구분)"),
+        exclude: Optional[str] = Query(None, description="뺄 결과 필드 (예: message,interpretation)"),
+        summary_only: bool = Query(False, description="결과 없이 요약과 태그별 건수만")
+    ):
         """
         분석 결과 조회
+
+        완료된 작업은 ETag를 포함하며, If-None-Match로 조건부 요청하면
+        변경이 없을 때 304를 반환합니다. Accept-Encoding: gzip/br을 지원합니다.
+        Accept 헤더로 application/msgpack 또는 application/x-ndjson 형식을 요청할 수 있습니다.
+
+        페이지/필터 매개변수를 하나라도 지정하면 결과를 녹음 내 시작 시각 순으로
+        limit개씩 반환합니다. 다음 페이지는 page.next_cursor를 cursor로 전달하세요.
+
+        status가 partial이면 채점 결과와 요약은 확정되었고 LLM 해석만 진행 중입니다.
+        결과마다 interpretation_status(pending/completed/failed/skipped)로 해석 상태를
+        알려주며, interpretations에 상태별 건수가 있습니다.
         """
-        if task_id not in tasks:
+        if task_id not in tasks and (job_queue is None or await load_job(task_id) is None):
             raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
         task = tasks[task_id]
 
-        response = {
-            "task_id": task_id,
-            "status": task["status"],
-            "file_info": {
-                "filename": task["filename"],
-                "size": task["file_size"],
-                "format": task["content_type"]
+        paged = (
+            cursor or limit or tag or min_severity is not None or since_seconds is not None
+            or until_seconds is not None or emergencies_only or fields or exclude or summary_only
+        )
+        if paged and task.get("index") is not None:
+            response = {
+                key: value for key, value in build_task_response(task_id, task).items() if key != "results"
             }
-        }
+            response["summary"] = task["summary"]
+            response["tag_counts"] = task["index"].tag_counts
+            if summary_only:
+                return render(response, request)
 
-        if task["status"] == "completed" and task["results"]:
-            response["results"] = task["results"]
-            response["summary"] = {
-                "total_detections": len(task["results"]),
-                "highest_severity": max([r.get("severity_score", 0) for r in task["results"]], default=0),
-                "emergency_count": sum(1 for r in task["results"] if r.get("is_emergency", False))
+            try:
+                indexes, total, next_cursor = task["index"].query(
+                    tags=[t.lower() for t in split_param(tag) or []],
+                    min_severity=min_severity,
+                    since_seconds=since_seconds,
+                    until_seconds=until_seconds,
+                    emergencies_only=emergencies_only,
+                    cursor=cursor,
+                    limit=limit or 100
+                )
+            except ValueError:
+                raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다")
+
+            if task.get("spilled"):
+                spilled = task["spilled"]
+                results = await asyncio.get_running_loop().run_in_executor(
+                    None, read_spill_records, spilled["records_path"], spilled["offsets"], indexes
+                )
+            else:
+                results = [task["results"][i] for i in indexes]
+
+            include, omit = split_param(fields), split_param(exclude)
+            response["results"] = [project(result, include, omit) for result in results]
+            response["page"] = {
+                "limit": limit or 100,
+                "returned": len(results),
+                "total_matched": total,
+                "next_cursor": next_cursor
             }
-        elif task["status"] == "failed":
-            response["error"] = task.get("error")
-
-        return response
+            return render(response, request, ndjson_records=task_ndjson_records)
+
+        # 완료/실패한 작업은 저장된 직렬화 결과 사용
+        if task.get("spilled"):
+            return await spilled_response(task, request)
+        if task.get("response_cache"):
+            return task["response_cache"].respond(request)
+
+        response = build_task_response(task_id, task)
+        if job_queue and task["status"] == "processing":
+            # 워커가 기록한 진행 상황
+            job = await job_queue.get(task_id)
+            if job:
+                response["progress"] = {"state": job["status"], "attempts": job["attempts"], **(job["progress"] or {})}
+        return render(response, request, ndjson_records=task_ndjson_records)
 
     @router.get("/samples")
     async def list_samples():
         """
-        샘플 파일 목록
+        샘플 파일 목록 (형식, 길이 포함)
+        """
+        return {"samples": await samples.entries()}
+
+    @router.api_route("/samples/{filename}", methods=["GET", "HEAD"])
+    async def get_sample(filename: str):
+        """
+        샘플 파일 전송
+
+        Range 요청(206)으로 원하는 위치부터 재생/탐색할 수 있으며,
+        ETag/Last-Modified로 조건부 요청을 지원합니다.
         """
-        import os
-        import glob
-
-        samples_dir = "samples"
-        if not os.path.exists(samples_dir):
-            return {"samples": []}
-
-        sample_files = []
-        for filepath in glob.glob(f"{samples_dir}/*.mp3") + glob.glob(f"{samples_dir}/*.wav"):
-            filename = os.path.basename(filepath)
-            file_size = os.path.getsize(filepath)
-            sample_files.append({
-                "id": filename.replace(".", "_"),
-                "name": filename,
-                "url": f"/samples/{filename}",
-                "description": f"{filename} 샘플 파일",
-                "size": file_size
-            })
-
-        return {"samples": sample_files}
+        entry = await samples.get(filename)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="샘플 파일을 찾을 수 없습니다")
+        return RangeFileResponse(entry["path"], entry["format"])
 
     return router
@@ -2,13 +2,34 @@
 헬스체크 라우터
 """
 from datetime import datetime
+from typing import Dict, Optional
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.services.dependency_prober import DependencyProber, DOWN
+from backend.utils import metrics
+from backend.utils.circuit_breaker import CircuitBreaker, OPEN
+from backend.utils.loop_monitor import LoopMonitor
 
 router = APIRouter(tags=["health"])
 
 
-def setup_health_router(cochl_api_key: str, zapier_webhook_url: str, emergency_threshold: int):
-    """헬스체크 라우터 설정"""
+def setup_health_router(
+    cochl_api_key: str,
+    zapier_webhook_url: str,
+    emergency_threshold: int,
+    breakers: Optional[Dict[str, CircuitBreaker]] = None,
+    prober: Optional[DependencyProber] = None,
+    max_loop_lag_seconds: float = 0.5,
+    loop_monitor: Optional[LoopMonitor] = None
+):
+    """
+    헬스체크 라우터 설정
+
+    prober가 있으면 /health/ready가 백그라운드 점검 결과로 준비 상태를 판단합니다
+    (핵심 의존성이 down이거나 이벤트 루프 지연이 max_loop_lag_seconds를 넘으면 503).
+    """
+    breakers = breakers or {}
 
     @router.get("/")
     async def root():
@@ -22,7 +43,10 @@ def setup_health_router(cochl_api_key: str, zapier_webhook_url: str, emergency_t
             "version": "1.0.0",
             "endpoints": {
                 "webhook": "/webhook/cochl",
+                "stream": "/ws/stream/{device_id}",
                 "health": "/health",
+                "ready": "/health/ready",
+                "metrics": "/metrics",
                 "docs": "/docs",
                 "api": "/api/v1"
             }
@@ -40,13 +64,76 @@ def setup_health_router(cochl_api_key: str, zapier_webhook_url: str, emergency_t
             "emergency_threshold": emergency_threshold
         }
 
-        # 전체 상태 판단
-        is_healthy = config_status["cochl_api_configured"] and config_status["zapier_configured"]
+        # 외부 의존성 서킷 브레이커 상태
+        breaker_status = {name: breaker.snapshot() for name, breaker in breakers.items()}
+        dependencies = prober.snapshot() if prober else {}
+
+        # 전체 상태 판단 (서킷이 열렸거나 점검에 실패한 의존성이 있으면 degraded)
+        is_healthy = (
+            config_status["cochl_api_configured"]
+            and config_status["zapier_configured"]
+            and all(b["state"] != OPEN for b in breaker_status.values())
+            and all(d["status"] != DOWN for d in dependencies.values())
+        )
 
         return {
             "status": "healthy" if is_healthy else "degraded",
             "timestamp": datetime.now().isoformat(),
-            "configuration": config_status
+            "configuration": config_status,
+            "circuit_breakers": breaker_status,
+            "dependencies": dependencies
+        }
+
+    @router.get("/health/ready")
+    async def readiness_check():
+        """
+        트래픽을 받을 준비가 되었는지 확인 (로드 밸런서용)
+
+        요청마다 외부 호출을 하지 않고 백그라운드 점검 결과만 반환합니다.
+        준비되지 않았으면 503을 반환합니다.
+        """
+        if prober is None:
+            return {"ready": True, "reasons": []}
+
+        dependencies = prober.snapshot()
+        reasons = [
+            f"{name}: {state.get('last_error') or state['status']}"
+            for name, state in dependencies.items()
+            if state["critical"] and state["status"] == DOWN
+        ]
+        if prober.loop_lag > max_loop_lag_seconds:
+            reasons.append(f"event_loop_lag: {prober.loop_lag * 1000:.0f}ms")
+
+        return JSONResponse(
+            status_code=200 if not reasons else 503,
+            content={
+                "ready": not reasons,
+                "reasons": reasons,
+                "dependencies": dependencies,
+                "loop_lag_ms": round(prober.loop_lag * 1000, 1),
+                "max_loop_lag_ms": round(prober.max_loop_lag * 1000, 1),
+                "queues": prober.queue_depths()
+            }
+        )
+
+    @router.get("/metrics")
+    async def get_metrics():
+        """
+        서비스별 운영 지표 (속도 제한 대기 시간 등)
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "metrics": metrics.collect()
+        }
+
+    @router.get("/metrics/loop-stalls")
+    async def get_loop_stalls():
+        """
+        최근 이벤트 루프 멈춤 보고 (멈춘 순간의 스택 포함)
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "stalls": loop_monitor.recent_stalls() if loop_monitor else []
         }
 
     return router
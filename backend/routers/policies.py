@@ -0,0 +1,49 @@
+"""
+정책 라우터: 사이트/장치별 정책 조회 및 다시 불러오기
+"""
+import logging
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.services.policy_index import PolicyIndex
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["policies"]
+)
+
+
+def setup_policies_router(policies: PolicyIndex):
+    """정책 라우터 설정"""
+
+    @router.get("/policies")
+    async def get_policies():
+        """불러온 정책 요약 (사이트/장치 수, 마지막 로드 시각, 오류)"""
+        return policies.stats()
+
+    @router.get("/policies/resolve")
+    async def resolve_policy(
+        site_id: str = Query(None, description="사이트 ID"),
+        device_id: str = Query(None, description="장치 ID")
+    ):
+        """이벤트 메타데이터에 실제로 적용될 정책 확인"""
+        return policies.resolve({"site_id": site_id, "device_id": device_id}).describe()
+
+    @router.post("/policies/reload")
+    async def reload_policies():
+        """
+        정책 파일 즉시 다시 불러오기 (서버 재시작 불필요)
+
+        파일에 오류가 있으면 기존 정책을 유지하고 400을 반환합니다.
+        """
+        if not policies.path:
+            raise HTTPException(status_code=400, detail="POLICY_FILE이 설정되지 않았습니다")
+        try:
+            policies.reload()
+        except Exception as e:
+            logger.error(f"❌ 정책 파일 다시 불러오기 실패 (기존 정책 유지): {e}")
+            raise HTTPException(status_code=400, detail=f"정책 파일 오류: {str(e)}")
+        return policies.stats()
+
+    return router
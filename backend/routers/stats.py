@@ -0,0 +1,28 @@
+"""
+통계 라우터: 대시보드용 롤링 집계 조회
+"""
+from datetime import datetime
+from fastapi import APIRouter
+
+from backend.services.rolling_stats import RollingStats
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["stats"]
+)
+
+
+def setup_stats_router(rolling_stats: RollingStats):
+    """통계 라우터 설정"""
+
+    @router.get("/stats")
+    async def get_stats():
+        """
+        최근 1분 / 1시간 / 1일 동안의 태그별 건수, 긴급 비율, 최고 심각도
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "windows": rolling_stats.snapshot()
+        }
+
+    return router
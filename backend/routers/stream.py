@@ -0,0 +1,224 @@
+"""
+실시간 오디오 스트리밍 라우터: 엣지 마이크의 PCM 프레임을 WebSocket으로 수신
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from backend.models.sound_event import SoundEvent, EmergencyAlert
+from backend.services.manager_agent import ManagerAgent
+from backend.services.zapier_integration import ZapierIntegration
+from backend.services.scheduler import PriorityScheduler, Priority
+from backend.services.event_store import EventStore
+from backend.services.rolling_stats import RollingStats
+from backend.services.audio_stream import AudioStream, AudioStreamHub, StreamLimitError
+from backend.services.policy_index import PolicyIndex
+from backend.services.alert_sinks import AlertDispatcher
+from backend.services.digest import DigestAggregator
+from backend.utils.lazy import resolve
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["stream"])
+
+
+def setup_stream_router(
+    hub: AudioStreamHub,
+    cochl_client,
+    manager: ManagerAgent,
+    emergency_threshold: int,
+    zapier: ZapierIntegration = None,
+    scheduler: PriorityScheduler = None,
+    event_store: EventStore = None,
+    rolling_stats: RollingStats = None,
+    policies: PolicyIndex = None,
+    dispatcher: AlertDispatcher = None,
+    digest: DigestAggregator = None
+):
+    """
+    스트리밍 라우터 설정
+
+    digest가 있으면 긴급 기준 미만 탐지를 사이트별 주기 요약에 모읍니다.
+    """
+    scheduler = scheduler or PriorityScheduler()
+    policies = policies or PolicyIndex(
+        base_severity_map=manager.SOUND_SEVERITY_MAP,
+        default_threshold=emergency_threshold,
+        default_zapier=zapier
+    )
+
+    @router.websocket("/ws/stream/{device_id}")
+    async def stream_audio(
+        websocket: WebSocket,
+        device_id: str,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        sample_width: int = 2,
+        site_id: str = None
+    ):
+        """
+        실시간 오디오 스트림 수신
+
+        - 연결: ws://서버:8000/ws/stream/{device_id}?sample_rate=16000&channels=1&sample_width=2&site_id=hq
+          (site_id를 지정하면 해당 사이트/장치 정책으로 채점)
+        - 바이너리 메시지: 리틀엔디언 PCM 프레임
+        - 텍스트 메시지 {"type": "end"}: 남은 오디오까지 분석 후 종료
+        - 서버 → 장치: 탐지 결과마다 {"type": "detection", ...} JSON 메시지
+        """
+        try:
+            stream = hub.open(device_id, sample_rate, channels, sample_width)
+            stream.site_id = site_id
+        except StreamLimitError as e:
+            logger.warning(f"⚠️ 오디오 스트림 거부: {str(e)}")
+            await websocket.close(code=1013, reason=str(e))
+            return
+        except ValueError as e:
+            await websocket.close(code=1003, reason=str(e))
+            return
+
+        await websocket.accept()
+        worker = asyncio.ensure_future(analyze_windows(websocket, stream))
+        graceful = False
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes"):
+                    stream.feed(message["bytes"])
+                elif message.get("text"):
+                    try:
+                        control = json.loads(message["text"])
+                    except ValueError:
+                        continue
+                    if control.get("type") == "end":
+                        stream.flush()
+                        graceful = True
+                        break
+        except WebSocketDisconnect:
+            pass
+        finally:
+            # 대기 중인 구간(최대 max_pending_windows개)까지 분석한 뒤 정리
+            stream.finish()
+            await worker
+            hub.close(stream)
+
+        if graceful:
+            await send(websocket, {"type": "end", **stream.stats()})
+            await websocket.close()
+
+    async def analyze_windows(websocket: WebSocket, stream: AudioStream):
+        """스트림 하나의 분석 구간을 순서대로 Cochl에 전송"""
+        while True:
+            window = await stream.next_window()
+            if window is None:
+                return
+            start_time, pcm = window
+            try:
+                # 실시간 일반 클래스 연결 슬롯 + Cochl 속도 제한을 거쳐 공유 연결 풀로 전송
+                client = await resolve(cochl_client)
+                async with scheduler.connection(Priority.LIVE_NORMAL):
+                    results = await client.analyze_file(
+                        stream.to_wav(pcm), f"{stream.device_id}_{stream.windows}.wav"
+                    )
+                stream.analyzed_windows += 1
+            except Exception as e:
+                stream.failed_windows += 1
+                logger.warning(f"⚠️ 스트림 구간 분석 실패: {stream.device_id} @ {start_time:.1f}s - {str(e)}")
+                continue
+
+            for result in results:
+                detection = await handle_detection(stream, start_time, result)
+                await send(websocket, {"type": "detection", **detection})
+
+    async def handle_detection(stream: AudioStream, start_time: float, result) -> dict:
+        """탐지 결과 채점, 기록, 긴급 알림"""
+        stream.detections += 1
+        sound_event = SoundEvent(
+            event_id=result.event_id,
+            tag=result.tag,
+            confidence=result.confidence,
+            timestamp=datetime.now().isoformat(),
+            metadata={
+                "site_id": stream.site_id,
+                "device_id": stream.device_id,
+                "start_time": start_time + result.start_time,
+                "end_time": start_time + result.end_time
+            }
+        )
+        policy = policies.resolve(sound_event.metadata)
+        severity_score = manager.calculate_severity(sound_event, policy.severity_map)
+        alert_message = manager.create_alert_message(sound_event, severity_score)
+        threshold = policy.threshold_at()
+        is_emergency = severity_score >= threshold
+
+        if rolling_stats:
+            rolling_stats.record(sound_event.tag, severity_score, is_emergency)
+        if event_store:
+            event_store.append(
+                source="stream",
+                tag=sound_event.tag,
+                confidence=sound_event.confidence,
+                severity=severity_score,
+                is_emergency=is_emergency,
+                timestamp=sound_event.timestamp,
+                event_id=sound_event.event_id,
+                payload=sound_event.metadata
+            )
+
+        alert_status = None
+        if is_emergency:
+            logger.warning(
+                f"🚨 스트림 긴급 상황 감지! {stream.device_id} "
+                f"(점수: {severity_score}/{threshold})"
+            )
+            alert = EmergencyAlert(
+                severity_score=severity_score,
+                sound_type=sound_event.tag,
+                confidence=sound_event.confidence,
+                timestamp=sound_event.timestamp,
+                message=alert_message,
+                event_id=sound_event.event_id
+            )
+            if dispatcher:
+                alert_status = "queued" if dispatcher.publish(alert, zapier=policy.zapier) else "no_destination"
+            elif policy.zapier:
+                async with scheduler.connection(Priority.LIVE_EMERGENCY):
+                    alert_status = "sent" if await policy.zapier.send_alert(alert) else "failed"
+            else:
+                alert_status = "no_destination"
+            if alert_status == "no_destination":
+                logger.error("알림 전송 대상이 설정되지 않았습니다!")
+        elif digest:
+            # 사이트별 주기 요약에 추가 (탐지마다 외부 호출하지 않음)
+            digest.add(
+                stream.site_id,
+                sound_event.tag,
+                sound_event.confidence,
+                severity_score,
+                sound_event.timestamp,
+                sound_event.event_id
+            )
+
+        return {
+            "event_id": sound_event.event_id,
+            "tag": sound_event.tag,
+            "confidence": sound_event.confidence,
+            "start_time": sound_event.metadata["start_time"],
+            "end_time": sound_event.metadata["end_time"],
+            "severity_score": severity_score,
+            "message": alert_message,
+            "is_emergency": is_emergency,
+            "alert_status": alert_status
+        }
+
+    async def send(websocket: WebSocket, content: dict):
+        """연결이 끊긴 뒤에도 분석/알림은 계속되도록 전송 실패는 무시"""
+        try:
+            await websocket.send_json(content)
+        except Exception:
+            pass
+
+    return router
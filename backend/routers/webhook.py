@@ -4,12 +4,23 @@ Webhook 라우터: Cochl API 웹훅 처리
 import json
 import logging
 from datetime import datetime
+from typing import Tuple
 from fastapi import APIRouter, Request, status
-from fastapi.responses import JSONResponse
+
+from backend.utils import wire_formats
+from backend.utils.dedup import IdempotencyCache, idempotency_key, CACHED, IN_FLIGHT, PROBABLE
+from backend.utils.http_cache import render
+from backend.utils.traffic_capture import TrafficRecorder
 
 from backend.models.sound_event import SoundEvent, EmergencyAlert
 from backend.services.manager_agent import ManagerAgent
 from backend.services.zapier_integration import ZapierIntegration
+from backend.services.scheduler import PriorityScheduler, Priority
+from backend.services.event_store import EventStore
+from backend.services.rolling_stats import RollingStats
+from backend.services.policy_index import PolicyIndex
+from backend.services.alert_sinks import AlertDispatcher
+from backend.services.digest import DigestAggregator
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +30,56 @@ router = APIRouter(
 )
 
 
-def setup_webhook_router(manager: ManagerAgent, zapier: ZapierIntegration, emergency_threshold: int):
-    """웹훅 라우터에 의존성 주입"""
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    요청 본문을 max_bytes까지만 읽음
+
+    Content-Length가 한도를 넘으면 읽지 않고 거절하며, 길이를 알 수 없는
+    chunked 본문도 받은 만큼 세면서 읽다가 한도를 넘는 즉시 중단합니다.
+
+    예외:
+        PayloadTooLarge: 본문이 max_bytes를 넘음
+    """
+    too_large = wire_formats.PayloadTooLarge(f"요청 본문이 {max_bytes} bytes를 넘습니다")
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+def setup_webhook_router(
+    manager: ManagerAgent,
+    zapier: ZapierIntegration,
+    emergency_threshold: int,
+    scheduler: PriorityScheduler = None,
+    event_store: EventStore = None,
+    rolling_stats: RollingStats = None,
+    dedup: IdempotencyCache = None,
+    policies: PolicyIndex = None,
+    recorder: TrafficRecorder = None,
+    dispatcher: AlertDispatcher = None,
+    digest: DigestAggregator = None,
+    max_body_bytes: int = wire_formats.MAX_DECOMPRESSED_SIZE
+):
+    """
+    웹훅 라우터에 의존성 주입
+
+    dispatcher가 있으면 긴급 알림을 전송 대상별 대기열에 넣고 바로 응답합니다
+    (전달은 백그라운드 워커가 재시도 정책에 따라 처리).
+    digest가 있으면 긴급 기준 미만 이벤트를 사이트별 주기 요약에 모읍니다.
+    본문이 max_body_bytes를 넘으면 413으로 거절합니다 (압축 본문은 풀린 크기 기준).
+    """
+    scheduler = scheduler or PriorityScheduler()
+    policies = policies or PolicyIndex(
+        base_severity_map=manager.SOUND_SEVERITY_MAP,
+        default_threshold=emergency_threshold,
+        default_zapier=zapier
+    )
 
     @router.post("/cochl")
     async def receive_cochl_event(request: Request):
@@ -29,44 +88,160 @@ def setup_webhook_router(manager: ManagerAgent, zapier: ZapierIntegration, emerg
 
         Cochl 대시보드에서 이 URL을 Webhook으로 등록하세요:
         예: http://your-server.com:8000/webhook/cochl
+
+        요청 형식 (Content-Type):
+        - application/json: 이벤트 1건 (기존 형식)
+        - application/msgpack: 이벤트 1건 또는 이벤트 배열
+        - application/x-ndjson: 한 줄에 이벤트 1건씩 (여러 건 일괄 전송)
+        Content-Encoding: gzip/br 압축 본문을 지원하며,
+        응답 형식은 Accept 헤더로 선택할 수 있습니다 (JSON/MessagePack/NDJSON).
+        """
+        logger.info("=== Cochl Webhook 요청 수신 ===")
+
+        # 1. 요청 데이터 파싱 (형식/압축 협상)
+        media_type = wire_formats.normalize_media_type(request.headers.get("content-type"))
+        content_encoding = request.headers.get("content-encoding")
+        try:
+            raw = await read_body(request, max_body_bytes)
+            body = wire_formats.decode(wire_formats.decompress(raw, content_encoding, max_body_bytes), media_type)
+            if recorder:
+                recorder.record_webhook(body, request.headers.get("content-type"), content_encoding)
+        except wire_formats.PayloadTooLarge as e:
+            logger.warning(f"⚠️ Webhook 요청 본문이 너무 큼: {str(e)}")
+            return render({"status": "error", "message": str(e)}, request,
+                          status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except wire_formats.UnsupportedFormat as e:
+            if recorder:
+                recorder.record_raw_webhook(raw, request.headers.get("content-type"), content_encoding)
+            return render({"status": "error", "message": str(e)}, request,
+                          status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        except Exception as e:
+            if recorder:
+                recorder.record_raw_webhook(raw, request.headers.get("content-type"), content_encoding)
+            logger.error(f"❌ Webhook 요청 본문 해석 실패: {str(e)}")
+            return render({"status": "error", "message": f"요청 본문을 해석할 수 없습니다: {str(e)}"},
+                          request, status_code=status.HTTP_400_BAD_REQUEST)
+
+        # 단일 이벤트: 기존 응답 형식 유지
+        if not isinstance(body, list):
+            status_code, content, replayed = await handle_event(body)
+            response = render(content, request, status_code=status_code)
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        # 일괄 전송: 이벤트별 결과를 순서대로 반환
+        results = []
+        for item in body:
+            status_code, content, replayed = await handle_event(item)
+            results.append({"status_code": status_code, "replayed": replayed, **content})
+        logger.info(f"일괄 Webhook 처리 완료: {len(results)}건")
+        return render(
+            {"status": "batch_processed", "count": len(results), "results": results},
+            request,
+            ndjson_records=lambda content: content["results"]
+        )
+
+    async def handle_event(body: dict) -> Tuple[int, dict, bool]:
+        """
+        중복 감지 후 이벤트 처리
+
+        같은 event_id(없으면 본문 해시)의 재전송은 다시 채점하거나 알림을
+        보내지 않고 처음 응답을 그대로 돌려줍니다.
+
+        반환값:
+            (HTTP 상태 코드, 응답 내용, 재전송 여부)
         """
+        if dedup is None:
+            status_code, content = await process_event(body)
+            return status_code, content, False
+
+        key = idempotency_key(body)
+        state, value = dedup.lookup(key)
+        if state == CACHED:
+            logger.info(f"♻️ 중복 Webhook - 처음 응답 재사용: {key}")
+            return value[0], value[1], True
+        if state == IN_FLIGHT:
+            logger.info(f"♻️ 중복 Webhook - 처리 중인 요청 결과 대기: {key}")
+            status_code, content = await value
+            return status_code, content, True
+        # 원본 응답은 만료됐지만 이미 처리된 것으로 보이는 이벤트: 블룸 필터는 오탐이
+        # 있으므로 기록(저장소/집계/요약)은 하고 외부 알림만 보내지 않음
+        probable = state == PROBABLE
+        if probable:
+            logger.info(f"♻️ 중복 가능 Webhook (만료된 키) - 기록만 하고 알림 생략: {key}")
+
+        dedup.begin(key)
+        status_code, content = status.HTTP_500_INTERNAL_SERVER_ERROR, {"status": "error", "message": "처리 중단"}
         try:
-            # 1. 요청 데이터 파싱
-            logger.info("=== Cochl Webhook 요청 수신 ===")
+            status_code, content = await process_event(body, key, send_alert=not probable)
+        finally:
+            dedup.complete(key, status_code, content)
+        return status_code, content, False
 
-            # 원본 JSON 데이터 읽기
-            body = await request.json()
+    async def process_event(body: dict, key: str = None, send_alert: bool = True) -> Tuple[int, dict]:
+        """
+        이벤트 1건 처리
+
+        key로 이미 기록한 이벤트(5xx 응답 후 재시도)는 저장소/집계/요약에 다시
+        기록하지 않고 알림만 다시 시도합니다. send_alert가 False면 긴급 이벤트도
+        기록만 하고 알림은 보내지 않습니다.
+
+        반환값:
+            (HTTP 상태 코드, 응답 내용)
+        """
+        try:
             logger.info(f"수신 데이터: {json.dumps(body, indent=2, ensure_ascii=False)}")
 
             # 2. 데이터 검증 및 변환
             # 실제 Cochl API 응답 형식에 맞게 필드명을 조정해야 할 수 있습니다
             sound_event = SoundEvent(**body)
 
-            # 3. Manager Agent로 심각도 분석
+            # 3. Manager Agent로 심각도 분석 (메타데이터의 site_id/device_id로 정책 선택)
             logger.info(f"Manager Agent 분석 시작...")
-            severity_score = manager.calculate_severity(sound_event)
+            policy = policies.resolve(sound_event.metadata)
+            severity_score = manager.calculate_severity(sound_event, policy.severity_map)
+            threshold = policy.threshold_at()
+            alert_target = policy.zapier
 
             # 4. 알림 메시지 생성
             alert_message = manager.create_alert_message(sound_event, severity_score)
 
+            record = not (dedup and key and dedup.recorded(key))
+            if record:
+                # 롤링 집계 갱신
+                if rolling_stats:
+                    rolling_stats.record(sound_event.tag, severity_score, severity_score >= threshold)
+
+                # 이벤트 저장소에 기록 (배치로 비동기 기록)
+                if event_store:
+                    event_store.append(
+                        source="webhook",
+                        tag=sound_event.tag,
+                        confidence=sound_event.confidence,
+                        severity=severity_score,
+                        is_emergency=severity_score >= threshold,
+                        timestamp=sound_event.timestamp,
+                        event_id=sound_event.event_id,
+                        payload=body
+                    )
+                if dedup and key:
+                    dedup.mark_recorded(key)
+
             # 5. 긴급 상황 판단 및 대응
-            if severity_score >= emergency_threshold:
-                # 긴급 상황: Zapier로 알림 전송
+            if severity_score >= threshold:
+                # 긴급 상황: 알림 전송
                 logger.warning(
-                    f"🚨 긴급 상황 감지! (점수: {severity_score}/{emergency_threshold})"
+                    f"🚨 긴급 상황 감지! (점수: {severity_score}/{threshold})"
                 )
 
-                # Zapier가 설정되어 있는지 확인
-                if not zapier:
-                    logger.error("Zapier Webhook URL이 설정되지 않았습니다!")
-                    return JSONResponse(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        content={
-                            "status": "error",
-                            "message": "Zapier가 설정되지 않음",
-                            "severity_score": severity_score
-                        }
-                    )
+                if not send_alert:
+                    logger.warning(f"⚠️ 중복 가능 긴급 이벤트 - 알림 생략 (점수: {severity_score}/{threshold})")
+                    return status.HTTP_200_OK, {
+                        "status": "duplicate_alert_suppressed",
+                        "severity_score": severity_score,
+                        "message": "이미 처리된 것으로 보이는 이벤트입니다. 기록만 하고 알림은 보내지 않았습니다"
+                    }
 
                 # 긴급 알림 데이터 생성
                 alert = EmergencyAlert(
@@ -78,58 +253,86 @@ def setup_webhook_router(manager: ManagerAgent, zapier: ZapierIntegration, emerg
                     event_id=sound_event.event_id
                 )
 
-                # Zapier로 알림 전송
-                success = zapier.send_alert(alert)
+                # 전송 대상별 대기열에 추가 (느린 대상이 응답을 지연시키지 않음)
+                if dispatcher:
+                    queued = dispatcher.publish(alert, zapier=alert_target)
+                    if not queued:
+                        logger.error("알림 전송 대상이 설정되지 않았습니다!")
+                        return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+                            "status": "error",
+                            "message": "알림 전송 대상이 설정되지 않음",
+                            "severity_score": severity_score
+                        }
+                    logger.info(f"✅ 긴급 알림 대기열 추가 완료 ({queued}개 대상)")
+                    return status.HTTP_200_OK, {
+                        "status": "emergency_alert_queued",
+                        "severity_score": severity_score,
+                        "message": "긴급 알림이 전송 대기열에 추가되었습니다",
+                        "alert": alert.model_dump(),
+                        "sinks": queued
+                    }
+
+                # Zapier가 설정되어 있는지 확인
+                if not alert_target:
+                    logger.error("Zapier Webhook URL이 설정되지 않았습니다!")
+                    return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+                        "status": "error",
+                        "message": "Zapier가 설정되지 않음",
+                        "severity_score": severity_score
+                    }
+
+                # Zapier로 알림 전송 (긴급 클래스 전용 연결 슬롯 사용)
+                async with scheduler.connection(Priority.LIVE_EMERGENCY):
+                    success = await alert_target.send_alert(alert)
 
                 if success:
                     logger.info("✅ 긴급 알림 전송 완료")
-                    return JSONResponse(
-                        status_code=status.HTTP_200_OK,
-                        content={
-                            "status": "emergency_alert_sent",
-                            "severity_score": severity_score,
-                            "message": "긴급 알림이 전송되었습니다",
-                            "alert": alert.model_dump()
-                        }
-                    )
+                    return status.HTTP_200_OK, {
+                        "status": "emergency_alert_sent",
+                        "severity_score": severity_score,
+                        "message": "긴급 알림이 전송되었습니다",
+                        "alert": alert.model_dump()
+                    }
                 else:
                     logger.error("❌ 긴급 알림 전송 실패")
-                    return JSONResponse(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        content={
-                            "status": "alert_failed",
-                            "severity_score": severity_score,
-                            "message": "알림 전송에 실패했습니다"
-                        }
-                    )
+                    return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+                        "status": "alert_failed",
+                        "severity_score": severity_score,
+                        "message": "알림 전송에 실패했습니다"
+                    }
 
             else:
                 # 일반 상황: 로그만 기록
                 logger.info(
-                    f"ℹ️ 일반 이벤트 (점수: {severity_score}/{emergency_threshold}) - "
+                    f"ℹ️ 일반 이벤트 (점수: {severity_score}/{threshold}) - "
                     f"로그만 기록"
                 )
 
-                return JSONResponse(
-                    status_code=status.HTTP_200_OK,
-                    content={
-                        "status": "logged",
-                        "severity_score": severity_score,
-                        "message": "이벤트가 기록되었습니다",
-                        "alert_message": alert_message
-                    }
-                )
+                # 사이트별 주기 요약에 추가 (이벤트마다 외부 호출하지 않음)
+                if digest and record:
+                    digest.add(
+                        (sound_event.metadata or {}).get("site_id"),
+                        sound_event.tag,
+                        sound_event.confidence,
+                        severity_score,
+                        sound_event.timestamp,
+                        sound_event.event_id
+                    )
+
+                return status.HTTP_200_OK, {
+                    "status": "logged",
+                    "severity_score": severity_score,
+                    "message": "이벤트가 기록되었습니다",
+                    "alert_message": alert_message
+                }
 
         except Exception as e:
             # 에러 처리
             logger.error(f"❌ Webhook 처리 중 오류 발생: {str(e)}", exc_info=True)
 
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "status": "error",
-                    "message": f"처리 중 오류 발생: {str(e)}"
-                }
-            )
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+                "status": "error",
+                "message": f"처리 중 오류 발생: {str(e)}"
+            }
 
     return router
@@ -0,0 +1,336 @@
+"""
+알림 전송 대상(Sink) 관리: Zapier, Slack 호환 Webhook, 로컬 파일로 동시에 전달
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+from backend.models.sound_event import EmergencyAlert
+from backend.services.scheduler import PriorityScheduler, Priority
+from backend.services.zapier_integration import ZapierIntegration
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyTracker
+from backend.utils.rate_limiter import RateLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(Exception):
+    """알림 전달 실패 (retry_after가 있으면 그 시간 뒤 재시도)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AlertSink:
+    """
+    알림 전송 대상 기본 클래스
+
+    하위 클래스는 deliver()만 구현하면 되며, 대기열/워커/재시도는
+    AlertDispatcher가 전송 대상마다 따로 관리합니다.
+    """
+
+    # 전송 대상별 기본 정책 (생성 시 변경 가능)
+    workers = 2
+    queue_size = 1000
+    max_attempts = 3
+    backoff_seconds = 1.0
+    max_backoff_seconds = 30.0
+    # 외부 호출 여부 (True면 스케줄러의 긴급 클래스 연결 슬롯을 거쳐 전달)
+    external = True
+
+    def __init__(self, name: str, workers: int = None, queue_size: int = None, max_attempts: int = None):
+        self.name = name
+        if workers is not None:
+            self.workers = workers
+        if queue_size is not None:
+            self.queue_size = queue_size
+        if max_attempts is not None:
+            self.max_attempts = max_attempts
+
+    def accepts(self, alert: EmergencyAlert, context: dict) -> bool:
+        """이 알림을 전달할 대상인지 (전달할 곳이 없으면 대기열에 넣지 않음)"""
+        return True
+
+    async def deliver(self, alert: EmergencyAlert, context: dict):
+        """
+        알림 1건 전달 (실패 시 예외)
+
+        매개변수:
+            alert: 긴급 알림
+            context: 발행 시 함께 넘긴 정보 (예: 사이트별 Zapier 대상)
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class ZapierSink(AlertSink):
+    """
+    Zapier Webhook 전송 대상
+
+    context["zapier"]가 있으면 (사이트별 정책의 알림 대상) 그쪽으로 보냅니다.
+    429 재시도와 서킷 브레이커는 ZapierIntegration이 처리하므로
+    여기서는 전송 실패만 재시도합니다.
+    """
+
+    workers = 4
+
+    def __init__(self, zapier: Optional[ZapierIntegration], **kwargs):
+        super().__init__("zapier", **kwargs)
+        self.zapier = zapier
+
+    def accepts(self, alert: EmergencyAlert, context: dict) -> bool:
+        return bool(context.get("zapier") or self.zapier)
+
+    async def deliver(self, alert: EmergencyAlert, context: dict):
+        target = context.get("zapier") or self.zapier
+        if not await target.send_alert(alert):
+            raise DeliveryError("Zapier 전송 실패")
+
+
+class SlackWebhookSink(AlertSink):
+    """Slack 호환 Incoming Webhook ({"text": ...} 형식) 전송 대상"""
+
+    def __init__(
+        self,
+        webhook_url: str,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        **kwargs
+    ):
+        super().__init__("slack", **kwargs)
+        self.webhook_url = webhook_url
+        self.breaker = breaker or CircuitBreaker("slack", slow_call_seconds=3.0)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._http = None
+
+    async def deliver(self, alert: EmergencyAlert, context: dict):
+        import httpx  # 지연 import: 서버 시작 시간 단축
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=10.0)
+
+        await self.rate_limiter.acquire("slack")
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise DeliveryError(str(e), retry_after=e.retry_in)
+
+        started = time.monotonic()
+        try:
+            response = await self._http.post(self.webhook_url, json={"text": alert.message})
+        except httpx.HTTPError as e:
+            self.breaker.record_failure(time.monotonic() - started)
+            raise DeliveryError(f"Slack 전송 실패: {str(e)}")
+
+        if response.status_code == 429:
+            self.breaker.record_success(time.monotonic() - started)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.defer("slack", retry_after)
+            raise DeliveryError("Slack 할당량 초과 (429)", retry_after=retry_after)
+        if response.status_code >= 400:
+            self.breaker.record_failure(time.monotonic() - started)
+            raise DeliveryError(f"Slack 전송 실패: HTTP {response.status_code}")
+        self.breaker.record_success(time.monotonic() - started)
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+class FileSink(AlertSink):
+    """로컬 JSONL 파일 전송 대상 (감사 기록 / 온프레미스 연동용)"""
+
+    workers = 1
+    max_attempts = 2
+    external = False
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__("file", **kwargs)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def deliver(self, alert: EmergencyAlert, context: dict):
+        line = json.dumps({"sent_at": time.time(), **alert.model_dump()}, ensure_ascii=False) + "\n"
+        await asyncio.get_running_loop().run_in_executor(None, self._append, line)
+
+    def _append(self, line: str):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class _SinkState:
+    """전송 대상별 대기열, 워커, 지표"""
+
+    def __init__(self, sink: AlertSink):
+        self.sink = sink
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.latency = LatencyTracker(200)
+        self.queued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self.in_progress = 0
+
+    def stats(self) -> dict:
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "workers": self.sink.workers,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "in_progress": self.in_progress,
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class AlertDispatcher:
+    """
+    등록된 모든 전송 대상으로 알림을 동시에 전달
+
+    전송 대상마다 고정 크기 대기열과 워커를 따로 두므로 느리거나 장애가 난
+    대상이 다른 대상이나 HTTP 응답을 지연시키지 않습니다. 대기열이 가득 차면
+    해당 대상의 알림만 버리고 dropped로 집계합니다.
+
+    scheduler가 있으면 외부 전송은 긴급 클래스(LIVE_EMERGENCY) 연결 슬롯을
+    얻은 뒤 실행하므로, 다른 클래스가 연결을 모두 쓰고 있어도 긴급 알림은
+    전용 슬롯으로 나갑니다 (재시도 대기 중에는 슬롯을 점유하지 않음).
+    """
+
+    def __init__(self, drain_seconds: float = 5.0, scheduler: Optional[PriorityScheduler] = None):
+        """
+        매개변수:
+            drain_seconds: 종료 시 남은 알림을 전달하기 위해 기다리는 최대 시간 (초)
+            scheduler: 우선순위 스케줄러 (외부 전송 연결 슬롯)
+        """
+        self.drain_seconds = drain_seconds
+        self.scheduler = scheduler
+        self._sinks: Dict[str, _SinkState] = {}
+        self._started = False
+
+    @property
+    def sinks(self) -> List[str]:
+        return list(self._sinks)
+
+    def register(self, sink: AlertSink):
+        if sink.name in self._sinks:
+            raise ValueError(f"이미 등록된 알림 대상입니다: {sink.name}")
+        state = _SinkState(sink)
+        self._sinks[sink.name] = state
+        if self._started:
+            self._start_sink(state)
+        logger.info(f"📣 알림 대상 등록: {sink.name} (워커 {sink.workers}개, 재시도 {sink.max_attempts}회)")
+
+    async def start(self):
+        self._started = True
+        for state in self._sinks.values():
+            self._start_sink(state)
+
+    def _start_sink(self, state: _SinkState):
+        if state.queue is not None:
+            return
+        state.queue = asyncio.Queue(maxsize=state.sink.queue_size)
+        state.tasks = [asyncio.ensure_future(self._worker(state)) for _ in range(state.sink.workers)]
+
+    async def stop(self):
+        """남은 알림을 drain_seconds 동안 전달한 뒤 워커 종료"""
+        pending = [state.queue.join() for state in self._sinks.values() if state.queue]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), self.drain_seconds)
+            except asyncio.TimeoutError:
+                left = sum(state.queue.qsize() for state in self._sinks.values() if state.queue)
+                logger.error(f"❌ 종료 시 전달하지 못한 알림 {left}건")
+        for state in self._sinks.values():
+            for task in state.tasks:
+                task.cancel()
+            await asyncio.gather(*state.tasks, return_exceptions=True)
+            await state.sink.close()
+        self._started = False
+
+    def publish(self, alert: EmergencyAlert, **context) -> int:
+        """
+        모든 전송 대상의 대기열에 알림 추가 (전달을 기다리지 않음)
+
+        매개변수:
+            alert: 긴급 알림
+            context: 전송 대상에 넘길 정보 (zapier=사이트별 Zapier 대상)
+
+        반환값:
+            대기열에 들어간 전송 대상 수
+        """
+        accepted = 0
+        for state in self._sinks.values():
+            if not state.sink.accepts(alert, context):
+                continue
+            if state.queue is None:
+                self._start_sink(state)
+            try:
+                state.queue.put_nowait((alert, context, time.monotonic()))
+            except asyncio.QueueFull:
+                state.dropped += 1
+                logger.error(f"❌ 알림 대기열 가득 참 - {state.sink.name} 전송 생략: event_id={alert.event_id}")
+                continue
+            state.queued += 1
+            accepted += 1
+        return accepted
+
+    async def _worker(self, state: _SinkState):
+        while True:
+            alert, context, enqueued_at = await state.queue.get()
+            state.in_progress += 1
+            try:
+                await self._deliver(state, alert, context, enqueued_at)
+            finally:
+                state.in_progress -= 1
+                state.queue.task_done()
+
+    async def _deliver(self, state: _SinkState, alert: EmergencyAlert, context: dict, enqueued_at: float):
+        """재시도 정책에 따라 전달 (지수 백오프, Retry-After 우선)"""
+        sink = state.sink
+        for attempt in range(1, sink.max_attempts + 1):
+            try:
+                async with self._connection(sink):
+                    await sink.deliver(alert, context)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt >= sink.max_attempts:
+                    state.failed += 1
+                    logger.error(f"❌ {sink.name} 알림 전달 실패 ({attempt}회 시도): {str(e)}")
+                    return
+                state.retries += 1
+                delay = getattr(e, "retry_after", None)
+                if delay is None:
+                    delay = min(sink.backoff_seconds * (2 ** (attempt - 1)), sink.max_backoff_seconds)
+                logger.warning(f"⚠️ {sink.name} 알림 전달 재시도 {attempt}/{sink.max_attempts} ({delay:.1f}초 후): {str(e)}")
+                await asyncio.sleep(delay)
+                continue
+
+            state.delivered += 1
+            state.latency.add(time.monotonic() - enqueued_at)
+            return
+
+    def _connection(self, sink: AlertSink):
+        if self.scheduler is None or not sink.external:
+            return nullcontext()
+        return self.scheduler.connection(Priority.LIVE_EMERGENCY)
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: state.stats() for name, state in self._sinks.items()}
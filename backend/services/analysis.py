@@ -0,0 +1,203 @@
+"""
+파일 분석 파이프라인: Cochl 탐지 결과 → 구간 병합 → 심각도 채점 → LLM 상황 해석 → 요약
+
+웹 서버(백그라운드 작업)와 분석 워커 프로세스(backend.worker)가 같은 코드를 사용합니다.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.models.sound_event import SoundEvent
+from backend.services.cochl_api import DetectionResult
+from backend.services.detection_merge import merge_detections
+from backend.services.event_context import EventTimeline
+from backend.services.llm_analyzer import TIER_LARGE, TIER_SKIPPED, TIER_SMALL, TIER_TEMPLATE
+from backend.services.manager_agent import ManagerAgent
+from backend.services.policy_index import SitePolicy
+from backend.utils.lazy import resolve
+
+logger = logging.getLogger(__name__)
+
+# 이벤트별 해석 상태
+INTERPRETATION_PENDING = "pending"      # LLM 해석 대기 중
+INTERPRETATION_COMPLETED = "completed"  # 해석 완료 (고정 문구 포함)
+INTERPRETATION_FAILED = "failed"        # LLM 호출 실패
+INTERPRETATION_SKIPPED = "skipped"      # 해석하지 않음
+
+
+async def analyze_detections(
+    cochl_results: List[DetectionResult],
+    manager_agent: ManagerAgent,
+    policy: SitePolicy,
+    site_id: Optional[str] = None,
+    device_id: Optional[str] = None,
+    merge_gap_seconds: float = 1.0,
+    llm_analyzer=None,
+    llm_slot: Optional[Callable] = None,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    on_scored: Optional[Callable[[List[dict], dict], Awaitable[None]]] = None
+) -> Tuple[List[dict], dict]:
+    """
+    탐지 결과를 채점하고 LLM 상황 해석을 붙여 작업 결과로 변환
+
+    매개변수:
+        cochl_results: Cochl 탐지 결과
+        manager_agent: 심각도 계산/메시지 생성
+        policy: 적용할 사이트/장치 정책
+        site_id / device_id: 이벤트 메타데이터
+        merge_gap_seconds: 같은 소리 구간 병합 간격 (음수면 병합하지 않음)
+        llm_analyzer: LLM 분석기 (없으면 해석 생략)
+        llm_slot: LLM 호출마다 사용할 연결 슬롯 (async context manager를 돌려주는 함수)
+        on_progress: 진행 상황 콜백 (단계, 완료 수, 전체 수)
+        on_scored: 채점 직후 (LLM 해석 전) 호출되는 콜백 (결과 목록, 요약).
+            결과 목록은 이후 해석이 끝날 때마다 같은 객체에 채워집니다
+
+    반환값:
+        (결과 목록, 요약)
+    """
+    threshold = policy.threshold_at()
+    llm_analyzer = await resolve(llm_analyzer)
+
+    # 같은 소리의 인접 구간 병합 (채점/메시지/LLM 분석 횟수 감소)
+    if merge_gap_seconds >= 0:
+        cochl_results = merge_detections(cochl_results, merge_gap_seconds)
+
+    # Manager Agent로 심각도 계산
+    processed_results = []
+    for cochl_result in cochl_results:
+        # SoundEvent 객체 생성
+        sound_event = SoundEvent(
+            event_id=cochl_result.event_id,
+            tag=cochl_result.tag,
+            confidence=cochl_result.confidence,
+            timestamp=datetime.now().isoformat(),
+            metadata={
+                "site_id": site_id,
+                "device_id": device_id,
+                "start_time": cochl_result.start_time,
+                "end_time": cochl_result.end_time
+            }
+        )
+
+        # 심각도 계산
+        severity_score = manager_agent.calculate_severity(sound_event, policy.severity_map)
+        alert_message = manager_agent.create_alert_message(sound_event, severity_score)
+
+        processed_results.append({
+            "event_id": cochl_result.event_id,
+            "tag": cochl_result.tag,
+            "confidence": cochl_result.confidence,
+            "start_time": cochl_result.start_time,
+            "end_time": cochl_result.end_time,
+            "peak_confidence": cochl_result.peak_confidence,
+            "mean_confidence": cochl_result.mean_confidence,
+            "window_count": cochl_result.window_count,
+            "severity_score": severity_score,
+            "message": alert_message,
+            "is_emergency": severity_score >= threshold,
+            "interpretation": None,  # 초기값
+            "interpretation_tier": None,
+            "interpretation_status": INTERPRETATION_SKIPPED
+        })
+    if on_progress:
+        on_progress("scored", len(processed_results), len(processed_results))
+
+    # 해석 등급 결정 (고정 문구는 바로 채움)
+    pending = []
+    calls = {TIER_SKIPPED: 0, TIER_TEMPLATE: 0, TIER_SMALL: 0, TIER_LARGE: 0}
+    if llm_analyzer:
+        for result in processed_results:
+            tier = llm_analyzer.choose_tier(result["severity_score"], threshold)
+            calls[tier] += 1
+            result["interpretation_tier"] = tier
+            if tier == TIER_TEMPLATE:
+                result["interpretation"] = llm_analyzer.template_interpretation(result)
+                result["interpretation_status"] = INTERPRETATION_COMPLETED
+            elif tier != TIER_SKIPPED:
+                result["interpretation_status"] = INTERPRETATION_PENDING
+                pending.append(result)
+
+    # 채점 결과 먼저 공개 (해석은 끝나는 대로 채워짐)
+    if on_scored:
+        await on_scored(processed_results, summarize(processed_results))
+
+    # LLM 분석 추가 (심각도가 높은 이벤트부터)
+    llm_report = None
+    if llm_analyzer and len(processed_results) > 0:
+        logger.info(f"🤖 LLM 상황 분석 시작... ({len(pending)}/{len(processed_results)}개 이벤트)")
+        # 주변 이벤트 조회용 인덱스는 작업마다 한 번만 생성
+        timeline = EventTimeline(processed_results)
+        pending.sort(key=lambda r: -r["severity_score"])
+        llm_seconds = 0.0
+        for done, result in enumerate(pending, 1):
+            model = llm_analyzer.model_for(result["interpretation_tier"])
+            started = time.monotonic()
+            if llm_slot:
+                async with llm_slot():
+                    interpretation = await llm_analyzer.analyze_event(result, processed_results, timeline, model)
+            else:
+                interpretation = await llm_analyzer.analyze_event(result, processed_results, timeline, model)
+            llm_seconds += time.monotonic() - started
+            result["interpretation"] = interpretation
+            result["interpretation_status"] = (
+                INTERPRETATION_COMPLETED if interpretation is not None else INTERPRETATION_FAILED
+            )
+            if on_progress:
+                on_progress("interpreting", done, len(pending))
+        llm_report = _llm_report(llm_analyzer, calls, llm_seconds)
+        logger.info(
+            f"✅ LLM 상황 분석 완료: 큰 모델 {calls[TIER_LARGE]}건, 작은 모델 {calls[TIER_SMALL]}건, "
+            f"호출 생략 {llm_report['saved_calls']}건"
+        )
+
+    # 요약 정보 계산
+    summary = summarize(processed_results)
+    if llm_report:
+        summary["llm"] = llm_report
+    return processed_results, summary
+
+
+def summarize(processed_results: List[dict]) -> dict:
+    """작업 요약 정보"""
+    return {
+        "total_detections": len(processed_results),
+        "highest_severity": max([r["severity_score"] for r in processed_results], default=0),
+        "emergency_count": sum(1 for r in processed_results if r["is_emergency"])
+    }
+
+
+def interpretation_progress(processed_results: List[dict]) -> dict:
+    """해석 상태별 건수"""
+    counts = {
+        INTERPRETATION_PENDING: 0, INTERPRETATION_COMPLETED: 0, INTERPRETATION_FAILED: 0, INTERPRETATION_SKIPPED: 0
+    }
+    for result in processed_results:
+        status = result.get("interpretation_status")
+        if status in counts:
+            counts[status] += 1
+    return counts
+
+
+def _llm_report(llm_analyzer, calls: Dict[str, int], llm_seconds: float) -> dict:
+    """
+    작업별 LLM 사용량과 절감량
+
+    절감 시간은 모든 이벤트를 큰 모델로 해석했을 때와 비교한 추정치로,
+    모델별 평균 응답 시간을 아직 모르면 None입니다.
+    """
+    saved_calls = calls[TIER_SKIPPED] + calls[TIER_TEMPLATE]
+    large_seconds = llm_analyzer.expected_seconds(TIER_LARGE)
+    small_seconds = llm_analyzer.expected_seconds(TIER_SMALL)
+    saved_seconds = None
+    if large_seconds is not None and (calls[TIER_SMALL] == 0 or small_seconds is not None):
+        saved_seconds = saved_calls * large_seconds
+        if calls[TIER_SMALL]:
+            saved_seconds += calls[TIER_SMALL] * max(0.0, large_seconds - small_seconds)
+        saved_seconds = round(saved_seconds, 2)
+    return {
+        "calls": calls,
+        "api_seconds": round(llm_seconds, 2),
+        "saved_calls": saved_calls,
+        "estimated_saved_seconds": saved_seconds
+    }
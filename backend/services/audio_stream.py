@@ -0,0 +1,283 @@
+"""
+실시간 오디오 스트림: 장치별 PCM 프레임을 링 버퍼에 모아 분석 구간(window)으로 나눔
+"""
+import asyncio
+import io
+import logging
+import wave
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StreamLimitError(Exception):
+    """동시 스트림 수 제한을 넘었거나 같은 장치가 이미 스트리밍 중일 때 발생"""
+
+
+class PCMRingBuffer:
+    """
+    고정 크기 바이트 링 버퍼
+
+    용량을 넘으면 가장 오래된 데이터를 덮어쓰므로 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def available(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> int:
+        """
+        데이터 추가
+
+        반환값:
+            덮어써서 버려진 바이트 수
+        """
+        n = len(data)
+        cap = self.capacity
+        if n >= cap:
+            dropped = self._size + n - cap
+            self._buf[:] = data[-cap:]
+            self._start = 0
+            self._size = cap
+            return dropped
+
+        dropped = max(0, self._size + n - cap)
+        if dropped:
+            self.advance(dropped)
+
+        end = (self._start + self._size) % cap
+        first = min(n, cap - end)
+        self._buf[end:end + first] = data[:first]
+        self._buf[:n - first] = data[first:]
+        self._size += n
+        return dropped
+
+    def read(self, size: int) -> bytes:
+        """앞에서부터 size 바이트를 복사 (읽기 위치는 그대로)"""
+        size = min(size, self._size)
+        end = self._start + size
+        if end <= self.capacity:
+            return bytes(self._buf[self._start:end])
+        return bytes(self._buf[self._start:]) + bytes(self._buf[:end - self.capacity])
+
+    def advance(self, size: int):
+        """읽기 위치를 size 바이트만큼 이동"""
+        size = min(size, self._size)
+        self._start = (self._start + size) % self.capacity
+        self._size -= size
+
+
+class AudioStream:
+    """
+    장치 하나의 PCM 스트림
+
+    받은 프레임을 링 버퍼에 쌓고 window_seconds 분량이 모이면 분석 대기열에
+    넣은 뒤 hop_seconds만큼 앞으로 이동합니다 (hop < window면 구간이 겹침).
+    분석이 밀려 대기열이 max_pending개를 넘으면 가장 오래된 구간을 버려
+    지연이 쌓이지 않고 최신 오디오를 우선 분석합니다.
+    """
+
+    def __init__(
+        self,
+        device_id: str,
+        sample_rate: int,
+        channels: int,
+        sample_width: int,
+        window_seconds: float,
+        hop_seconds: float,
+        buffer_seconds: float,
+        max_pending: int
+    ):
+        self.device_id = device_id
+        self.site_id: Optional[str] = None
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.max_pending = max_pending
+
+        frame = channels * sample_width
+        self.bytes_per_second = sample_rate * frame
+        self.window_bytes = max(frame, int(window_seconds * sample_rate) * frame)
+        self.hop_bytes = max(frame, int(min(hop_seconds, window_seconds) * sample_rate) * frame)
+        capacity = max(self.window_bytes, int(buffer_seconds * sample_rate) * frame)
+        self.ring = PCMRingBuffer(capacity)
+
+        # (구간 시작 시각(초), PCM) / 종료 표시는 None
+        self.queue: "asyncio.Queue[Optional[Tuple[float, bytes]]]" = asyncio.Queue()
+        self._pending = 0
+        self._offset = 0  # 링 버퍼 읽기 위치의 스트림 내 바이트 위치
+
+        self.received_bytes = 0
+        self.dropped_bytes = 0
+        self.windows = 0
+        self.dropped_windows = 0
+        self.analyzed_windows = 0
+        self.failed_windows = 0
+        self.detections = 0
+
+    @property
+    def reserved_bytes(self) -> int:
+        """이 스트림이 최대로 사용할 수 있는 버퍼 메모리"""
+        return self.ring.capacity + self.max_pending * self.window_bytes
+
+    def feed(self, data: bytes):
+        """PCM 프레임 추가 후 완성된 구간을 분석 대기열에 넣음"""
+        self.received_bytes += len(data)
+        dropped = self.ring.write(data)
+        if dropped:
+            self.dropped_bytes += dropped
+            self._offset += dropped
+
+        while self.ring.available >= self.window_bytes:
+            self._enqueue(self._offset / self.bytes_per_second, self.ring.read(self.window_bytes))
+            self.ring.advance(self.hop_bytes)
+            self._offset += self.hop_bytes
+
+    def flush(self, min_seconds: float = 0.5):
+        """스트림 종료 시 남은 오디오가 min_seconds 이상이면 마지막 구간으로 분석"""
+        if self.ring.available >= min_seconds * self.bytes_per_second:
+            self._enqueue(self._offset / self.bytes_per_second, self.ring.read(self.ring.available))
+        self.ring.advance(self.ring.available)
+
+    def finish(self):
+        """분석 작업에 종료를 알림 (남은 구간은 처리 후 종료)"""
+        self.queue.put_nowait(None)
+
+    def _enqueue(self, start_time: float, pcm: bytes):
+        if self._pending >= self.max_pending:
+            self.queue.get_nowait()
+            self._pending -= 1
+            self.dropped_windows += 1
+        self.queue.put_nowait((start_time, pcm))
+        self._pending += 1
+        self.windows += 1
+
+    async def next_window(self) -> Optional[Tuple[float, bytes]]:
+        """다음 분석 구간 (종료 시 None)"""
+        window = await self.queue.get()
+        if window is not None:
+            self._pending -= 1
+        return window
+
+    def to_wav(self, pcm: bytes) -> bytes:
+        """PCM 구간을 WAV 파일 바이트로 변환 (Cochl 파일 분석 API용)"""
+        out = io.BytesIO()
+        with wave.open(out, "wb") as wav:
+            wav.setnchannels(self.channels)
+            wav.setsampwidth(self.sample_width)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(pcm)
+        return out.getvalue()
+
+    def stats(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "received_bytes": self.received_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "windows": self.windows,
+            "dropped_windows": self.dropped_windows,
+            "analyzed_windows": self.analyzed_windows,
+            "failed_windows": self.failed_windows,
+            "pending_windows": self._pending,
+            "detections": self.detections,
+        }
+
+
+class AudioStreamHub:
+    """
+    프로세스 전체의 스트림 관리
+
+    동시 스트림 수와 스트림별 버퍼 크기를 제한하여 전체 메모리 사용량의
+    상한이 max_streams x (링 버퍼 + 대기 구간)으로 고정됩니다.
+    """
+
+    SAMPLE_WIDTHS = (1, 2, 4)
+
+    def __init__(
+        self,
+        max_streams: int = 256,
+        window_seconds: float = 2.0,
+        hop_seconds: float = 2.0,
+        buffer_seconds: float = 4.0,
+        max_pending_windows: int = 2,
+        max_sample_rate: int = 48000,
+        max_channels: int = 2
+    ):
+        """
+        매개변수:
+            max_streams: 동시에 받을 수 있는 최대 스트림 수
+            window_seconds: 분석 구간 길이 (초)
+            hop_seconds: 다음 구간까지의 간격 (초, window보다 작으면 구간이 겹침)
+            buffer_seconds: 스트림별 링 버퍼 길이 (초)
+            max_pending_windows: 스트림별 분석 대기 구간 수 (넘으면 오래된 구간부터 버림)
+            max_sample_rate: 허용하는 최대 샘플링 레이트
+            max_channels: 허용하는 최대 채널 수
+        """
+        self.max_streams = max_streams
+        self.window_seconds = window_seconds
+        self.hop_seconds = hop_seconds
+        self.buffer_seconds = buffer_seconds
+        self.max_pending_windows = max_pending_windows
+        self.max_sample_rate = max_sample_rate
+        self.max_channels = max_channels
+
+        self.streams: Dict[str, AudioStream] = {}
+        self.opened = 0
+        self.rejected = 0
+
+    def open(self, device_id: str, sample_rate: int, channels: int, sample_width: int) -> AudioStream:
+        """
+        스트림 등록
+
+        예외:
+            ValueError: 지원하지 않는 오디오 형식
+            StreamLimitError: 스트림 수 초과 또는 같은 장치가 이미 연결됨
+        """
+        if not 0 < sample_rate <= self.max_sample_rate:
+            raise ValueError(f"sample_rate는 1~{self.max_sample_rate} 사이여야 합니다")
+        if not 0 < channels <= self.max_channels:
+            raise ValueError(f"channels는 1~{self.max_channels} 사이여야 합니다")
+        if sample_width not in self.SAMPLE_WIDTHS:
+            raise ValueError(f"sample_width는 {self.SAMPLE_WIDTHS} 중 하나여야 합니다")
+
+        if device_id in self.streams:
+            self.rejected += 1
+            raise StreamLimitError(f"이미 스트리밍 중인 장치입니다: {device_id}")
+        if len(self.streams) >= self.max_streams:
+            self.rejected += 1
+            raise StreamLimitError(f"동시 스트림 수 제한({self.max_streams})을 초과했습니다")
+
+        stream = AudioStream(
+            device_id, sample_rate, channels, sample_width,
+            self.window_seconds, self.hop_seconds, self.buffer_seconds, self.max_pending_windows
+        )
+        self.streams[device_id] = stream
+        self.opened += 1
+        logger.info(f"🎙️ 오디오 스트림 시작: {device_id} ({sample_rate}Hz, {channels}ch, {sample_width * 8}bit)")
+        return stream
+
+    def close(self, stream: AudioStream):
+        if self.streams.get(stream.device_id) is stream:
+            del self.streams[stream.device_id]
+            logger.info(
+                f"🎙️ 오디오 스트림 종료: {stream.device_id} "
+                f"(구간 {stream.analyzed_windows}/{stream.windows}, 탐지 {stream.detections}개)"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self.streams),
+            "max_streams": self.max_streams,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "reserved_bytes": sum(stream.reserved_bytes for stream in self.streams.values()),
+            "pending_windows": sum(stream._pending for stream in self.streams.values()),
+            "dropped_windows": sum(stream.dropped_windows for stream in self.streams.values()),
+        }
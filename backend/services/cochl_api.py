@@ -3,10 +3,14 @@ Cochl Cloud API 클라이언트
 """
 import logging
 import asyncio
-from typing import List, Optional
-import httpx
+import time
+import uuid
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.utils.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,7 +22,12 @@ class DetectionResult:
         self.confidence = confidence
         self.start_time = start_time
         self.end_time = end_time
-        self.event_id = f"evt_{int(datetime.now().timestamp())}"
+        # 같은 응답의 탐지끼리도 겹치지 않도록 무작위 접미사 추가
+        self.event_id = f"evt_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
+        # 인접 구간을 합친 경우의 정보 (합치지 않았으면 자기 자신 1개)
+        self.peak_confidence = confidence
+        self.mean_confidence = confidence
+        self.window_count = 1
 
 
 class CochlAPIClient:
@@ -29,13 +38,28 @@ class CochlAPIClient:
     조정이 필요합니다. 현재는 기본 구조만 제공합니다.
     """
 
-    def __init__(self, api_key: str, api_url: str = "https://api.cochl.ai/v1"):
+    # 헤지 요청 지연을 계산하기 위해 필요한 최소 지연시간 샘플 수
+    HEDGE_MIN_SAMPLES = 10
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = "https://api.cochl.ai/v1",
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_enabled: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_connections: int = 50
+    ):
         """
         Cochl API 클라이언트 초기화
 
         매개변수:
             api_key: Cochl API 키
             api_url: Cochl API 베이스 URL
+            breaker: 서킷 브레이커 (없으면 기본 설정으로 생성)
+            hedge_enabled: p95 지연 후 두 번째 요청을 보내는 헤지 요청 사용 여부
+            rate_limiter: 공용 속도 제한기 ("cochl" 버킷 사용)
+            max_connections: 공유 HTTP 연결 풀 크기
         """
         self.api_key = api_key
         self.api_url = api_url
@@ -43,8 +67,37 @@ class CochlAPIClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.breaker = breaker or CircuitBreaker("cochl", slow_call_seconds=20.0)
+        self.hedge_enabled = hedge_enabled
+        self.hedged_requests = 0
+        self._batch_status_supported = True
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_connections = max_connections
+        self._http = None
         logger.info(f"Cochl API 클라이언트 초기화: {api_url}")
 
+    def _client(self):
+        """
+        요청마다 연결을 새로 맺지 않도록 공유하는 HTTP 클라이언트 (처음 사용 시 생성)
+        """
+        if self._http is None:
+            import httpx  # 지연 import: 서버 시작 시간 단축
+
+            self._http = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._http
+
+    async def aclose(self):
+        """공유 HTTP 클라이언트 종료"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     async def analyze_file(self, file_bytes: bytes, filename: str) -> List[DetectionResult]:
         """
         오디오/비디오 파일을 Cochl API로 전송하여 분석
@@ -56,48 +109,24 @@ class CochlAPIClient:
         반환값:
             DetectionResult 리스트
         """
+        import httpx  # 지연 import: 서버 시작 시간 단축
+
         try:
             logger.info(f"Cochl API로 파일 분석 요청: {filename}")
+            await self.rate_limiter.acquire("cochl")
+            data = await self.breaker.call(
+                self._hedged, self._post_analyze, file_bytes, filename,
+                is_failure=_is_dependency_failure
+            )
 
-            # 실제 Cochl API 엔드포인트 및 요청 형식에 맞게 조정 필요
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                # 파일 업로드
-                files = {"file": (filename, file_bytes)}
-
-                # 실제 API 엔드포인트는 Cochl 문서 참조
-                # 예시: POST https://api.cochl.ai/v1/analyze
-                response = await client.post(
-                    f"{self.api_url}/analyze",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    files=files
-                )
-
-                response.raise_for_status()
-                data = response.json()
+            results = self.parse_detections(data)
 
-                # 응답 파싱 (실제 Cochl API 응답 형식에 맞게 조정 필요)
-                results = []
-
-                # 예상 응답 형식:
-                # {
-                #     "detections": [
-                #         {"tag": "scream", "confidence": 0.95, "start_time": 12.5, "end_time": 13.8}
-                #     ]
-                # }
-
-                detections = data.get("detections", [])
-                for detection in detections:
-                    result = DetectionResult(
-                        tag=detection.get("tag", "unknown"),
-                        confidence=detection.get("confidence", 0.0),
-                        start_time=detection.get("start_time", 0.0),
-                        end_time=detection.get("end_time", 0.0)
-                    )
-                    results.append(result)
-
-                logger.info(f"분석 완료: {len(results)}개의 사운드 이벤트 탐지")
-                return results
+            logger.info(f"분석 완료: {len(results)}개의 사운드 이벤트 탐지")
+            return results
 
+        except CircuitOpenError as e:
+            logger.error(f"Cochl API 호출 생략 (빠른 실패): {str(e)}")
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"Cochl API HTTP 에러: {e.response.status_code} - {e.response.text}")
             raise
@@ -108,6 +137,122 @@ class CochlAPIClient:
             logger.error(f"Cochl API 호출 중 예상치 못한 에러: {str(e)}")
             raise
 
+    def parse_detections(self, data: dict) -> List[DetectionResult]:
+        """
+        분석 응답을 DetectionResult 리스트로 변환 (실제 Cochl API 응답 형식에 맞게 조정 필요)
+
+        예상 응답 형식:
+        {
+            "detections": [
+                {"tag": "scream", "confidence": 0.95, "start_time": 12.5, "end_time": 13.8}
+            ]
+        }
+        """
+        results = []
+        for detection in data.get("detections", []):
+            results.append(DetectionResult(
+                tag=detection.get("tag", "unknown"),
+                confidence=detection.get("confidence", 0.0),
+                start_time=detection.get("start_time", 0.0),
+                end_time=detection.get("end_time", 0.0)
+            ))
+        return results
+
+    async def _post_analyze(self, file_bytes: bytes, filename: str) -> dict:
+        """분석 요청 1회 전송 후 응답 JSON 반환"""
+        # 실제 Cochl API 엔드포인트 및 요청 형식에 맞게 조정 필요
+        # 파일 업로드
+        files = {"file": (filename, file_bytes)}
+
+        # 실제 API 엔드포인트는 Cochl 문서 참조
+        # 예시: POST https://api.cochl.ai/v1/analyze
+        response = await self._client().post(
+            f"{self.api_url}/analyze",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            files=files
+        )
+
+        response.raise_for_status()
+        return response.json()
+
+    async def _hedged(self, func, *args):
+        """
+        헤지 요청: 첫 요청이 최근 p95 지연시간 안에 끝나지 않으면
+        같은 요청을 한 번 더 보내고 먼저 끝난 결과를 사용합니다
+
+        헤지 요청도 "cochl" 속도 제한 토큰을 받은 뒤에 보내며, 토큰을
+        기다리는 사이 첫 요청이 끝나면 헤지 요청은 보내지 않습니다.
+        """
+        delay = self.breaker.latency.percentile(95)
+        if not self.hedge_enabled or delay is None or len(self.breaker.latency) < self.HEDGE_MIN_SAMPLES:
+            return await func(*args)
+
+        tasks = [asyncio.ensure_future(func(*args))]
+        token = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+
+            token = asyncio.ensure_future(self.rate_limiter.acquire("cochl"))
+            await asyncio.wait([tasks[0], token], return_when=asyncio.FIRST_COMPLETED)
+            if tasks[0].done():
+                return tasks[0].result()
+
+            self.hedged_requests += 1
+            logger.info(f"⏱️ Cochl 응답 지연 ({delay:.2f}초 초과) - 헤지 요청 전송")
+            tasks.append(asyncio.ensure_future(func(*args)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 먼저 끝난 요청 외의 나머지 요청(과 토큰 대기)은 취소
+            for task in tasks + ([token] if token else []):
+                if not task.done():
+                    task.cancel()
+
+    async def submit_file(self, file_bytes: bytes, filename: str) -> str:
+        """
+        비동기 작업 모드: 파일만 전송하고 원격 작업 ID를 받아 바로 반환
+
+        결과는 CochlJobPoller가 상태 조회로 받아오므로 분석이 끝날 때까지
+        HTTP 연결을 붙잡고 있지 않습니다.
+
+        반환값:
+            Cochl 쪽 작업 ID
+        """
+        logger.info(f"Cochl API로 분석 작업 제출: {filename}")
+        await self.rate_limiter.acquire("cochl")
+        try:
+            data = await self.breaker.call(
+                self._post_submit, file_bytes, filename,
+                is_failure=_is_dependency_failure
+            )
+        except CircuitOpenError as e:
+            logger.error(f"Cochl 작업 제출 생략 (빠른 실패): {str(e)}")
+            raise
+
+        remote_id = data.get("task_id") or data.get("id")
+        if not remote_id:
+            raise ValueError(f"Cochl 작업 제출 응답에 task_id가 없습니다: {data}")
+        return str(remote_id)
+
+    async def _post_submit(self, file_bytes: bytes, filename: str) -> dict:
+        """작업 제출 1회 전송 (실제 Cochl API 엔드포인트에 맞게 조정 필요)"""
+        response = await self._client().post(
+            f"{self.api_url}/analyze/async",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            files={"file": (filename, file_bytes)}
+        )
+        response.raise_for_status()
+        return response.json()
+
     async def get_analysis_status(self, task_id: str) -> dict:
         """
         분석 작업 상태 조회 (비동기 처리용)
@@ -119,19 +264,91 @@ class CochlAPIClient:
             상태 정보 딕셔너리
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.api_url}/status/{task_id}",
-                    headers=self.headers
-                )
-
-                response.raise_for_status()
-                return response.json()
+            return await self._guarded_status(self._client(), task_id)
 
         except Exception as e:
             logger.error(f"상태 조회 에러: {str(e)}")
             raise
 
+    async def get_analysis_statuses(self, task_ids: List[str]) -> Dict[str, dict]:
+        """
+        여러 작업의 상태를 한 번에 조회
+
+        일괄 조회 엔드포인트가 없으면(404/405) 공유 연결 풀에서
+        작업별 조회를 동시에 보냅니다. 작업별 조회가 404면 원격 작업이 없으므로
+        status="not_found"로 돌려주어 바로 실패 처리되게 하고, 그 밖의 조회
+        실패는 결과에서 빠지며 다음 폴링 때 다시 조회됩니다.
+
+        조회 요청도 분석 요청과 같은 "cochl" 속도 제한과 서킷 브레이커를
+        거칩니다 (서킷이 열려 있으면 CircuitOpenError). 상태 조회는 분석보다
+        훨씬 빨리 끝나므로 헤지 기준 지연시간 표본에는 넣지 않습니다.
+
+        반환값:
+            {작업 ID: 상태 정보}
+        """
+        import httpx
+
+        client = self._client()
+        if self._batch_status_supported:
+            try:
+                await self.rate_limiter.acquire("cochl")
+                data = await self.breaker.call(
+                    self._post_status_batch, client, task_ids,
+                    is_failure=_is_dependency_failure, sample=False
+                )
+                return {str(item.get("task_id")): item for item in data.get("statuses", [])}
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405):
+                    raise
+                self._batch_status_supported = False
+                logger.info("Cochl 일괄 상태 조회 미지원 - 작업별 조회로 전환")
+
+        async def fetch(task_id: str) -> dict:
+            try:
+                return await self._guarded_status(client, task_id)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                return {"task_id": task_id, "status": "not_found", "error": "원격 작업을 찾을 수 없음 (404)"}
+
+        results = await asyncio.gather(*(fetch(task_id) for task_id in task_ids), return_exceptions=True)
+        return {
+            task_id: result for task_id, result in zip(task_ids, results)
+            if not isinstance(result, Exception)
+        }
+
+    async def _guarded_status(self, client, task_id: str) -> dict:
+        """작업별 상태 조회 1회 (속도 제한 + 서킷 브레이커)"""
+        await self.rate_limiter.acquire("cochl")
+        return await self.breaker.call(
+            self._get_status, client, task_id,
+            is_failure=_is_dependency_failure, sample=False
+        )
+
+    async def _post_status_batch(self, client, task_ids: List[str]) -> dict:
+        response = await client.post(
+            f"{self.api_url}/status/batch",
+            headers=self.headers,
+            json={"task_ids": task_ids}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_status(self, client, task_id: str) -> dict:
+        response = await client.get(f"{self.api_url}/status/{task_id}", headers=self.headers, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+
+def _is_dependency_failure(error: Exception) -> bool:
+    """4xx 응답(요청 오류)은 의존성 장애로 집계하지 않습니다 (429 제외)"""
+    import httpx
+
+    if isinstance(error, httpx.HTTPStatusError):
+        code = error.response.status_code
+        return code >= 500 or code == 429
+    return True
+
 
 class MockCochlAPIClient(CochlAPIClient):
     """
@@ -139,8 +356,12 @@ class MockCochlAPIClient(CochlAPIClient):
     실제 API 호출 없이 더미 데이터를 반환합니다.
     """
 
+    # 비동기 작업 모드에서 작업 하나가 끝나기까지 걸리는 시간 (초)
+    JOB_SECONDS = 1.0
+
     def __init__(self, api_key: str = "mock_key", api_url: str = "mock://api"):
         super().__init__(api_key, api_url)
+        self._jobs: Dict[str, tuple] = {}
         logger.info("Mock Cochl API 클라이언트 초기화 (테스트 모드)")
 
     async def analyze_file(self, file_bytes: bytes, filename: str) -> List[DetectionResult]:
@@ -152,27 +373,63 @@ class MockCochlAPIClient(CochlAPIClient):
         # 짧은 지연 시뮬레이션
         await asyncio.sleep(1)
 
-        # 더미 탐지 결과 반환
-        # 파일명에 특정 키워드가 있으면 해당 사운드를 탐지한 것처럼 반환
-        results = []
+        results = self.parse_detections({"detections": self._mock_detections(filename)})
+        logger.info(f"Mock 분석 완료: {len(results)}개 탐지")
+        return results
+
+    async def submit_file(self, file_bytes: bytes, filename: str) -> str:
+        """Mock 작업 제출: JOB_SECONDS 뒤에 완료되는 작업 등록"""
+        remote_id = f"mock_job_{uuid.uuid4().hex[:12]}"
+        self._jobs[remote_id] = (time.monotonic() + self.JOB_SECONDS, filename)
+        logger.info(f"Mock 작업 제출: {filename} -> {remote_id}")
+        return remote_id
+
+    async def get_analysis_status(self, task_id: str) -> dict:
+        return (await self.get_analysis_statuses([task_id])).get(task_id, {"task_id": task_id, "status": "not_found"})
+
+    async def get_analysis_statuses(self, task_ids: List[str]) -> Dict[str, dict]:
+        """Mock 일괄 상태 조회 (완료된 작업은 결과를 돌려주고 목록에서 제거)"""
+        now = time.monotonic()
+        statuses = {}
+        for task_id in task_ids:
+            job = self._jobs.get(task_id)
+            if job is None:
+                statuses[task_id] = {"task_id": task_id, "status": "not_found"}
+            elif job[0] > now:
+                statuses[task_id] = {"task_id": task_id, "status": "processing"}
+            else:
+                del self._jobs[task_id]
+                statuses[task_id] = {
+                    "task_id": task_id,
+                    "status": "completed",
+                    "detections": self._mock_detections(job[1])
+                }
+        return statuses
+
+    @staticmethod
+    def _mock_detections(filename: str) -> List[dict]:
+        """
+        더미 탐지 결과
+        파일명에 특정 키워드가 있으면 해당 사운드를 탐지한 것처럼 반환
+        """
+        detections = []
 
         filename_lower = filename.lower()
 
         if "scream" in filename_lower or "비명" in filename_lower:
-            results.append(DetectionResult("scream", 0.95, 2.5, 3.8))
+            detections.append({"tag": "scream", "confidence": 0.95, "start_time": 2.5, "end_time": 3.8})
 
         if "glass" in filename_lower or "유리" in filename_lower:
-            results.append(DetectionResult("glass_break", 0.88, 5.2, 6.0))
+            detections.append({"tag": "glass_break", "confidence": 0.88, "start_time": 5.2, "end_time": 6.0})
 
         if "siren" in filename_lower or "사이렌" in filename_lower:
-            results.append(DetectionResult("siren", 0.92, 0.0, 10.0))
+            detections.append({"tag": "siren", "confidence": 0.92, "start_time": 0.0, "end_time": 10.0})
 
         if "gunshot" in filename_lower or "총" in filename_lower:
-            results.append(DetectionResult("gunshot", 0.97, 1.2, 1.5))
+            detections.append({"tag": "gunshot", "confidence": 0.97, "start_time": 1.2, "end_time": 1.5})
 
         # 키워드가 없으면 랜덤 일반 소리 탐지
-        if not results:
-            results.append(DetectionResult("conversation", 0.65, 0.0, 30.0))
+        if not detections:
+            detections.append({"tag": "conversation", "confidence": 0.65, "start_time": 0.0, "end_time": 30.0})
 
-        logger.info(f"Mock 분석 완료: {len(results)}개 탐지")
-        return results
+        return detections
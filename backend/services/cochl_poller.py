@@ -0,0 +1,210 @@
+"""
+Cochl 비동기 작업 폴러: 제출한 분석 작업들의 상태를 하나의 코루틴에서 모아서 조회
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from backend.services.cochl_api import DetectionResult
+from backend.utils.lazy import resolve
+
+logger = logging.getLogger(__name__)
+
+# 원격 작업 상태 (실제 Cochl API 응답 값에 맞게 조정 필요)
+COMPLETED_STATES = ("completed", "done", "succeeded", "success")
+FAILED_STATES = ("failed", "error", "cancelled", "not_found")
+
+
+class CochlJobError(Exception):
+    """원격 분석 작업이 실패했거나 제한 시간 안에 끝나지 않았을 때 발생"""
+
+
+class _Job:
+    __slots__ = ("future", "submitted_at", "next_check", "interval", "deadline")
+
+    def __init__(self, future: asyncio.Future, now: float, interval: float, timeout: float):
+        self.future = future
+        self.submitted_at = now
+        self.next_check = now + interval
+        self.interval = interval
+        self.deadline = now + timeout
+
+
+class CochlJobPoller:
+    """
+    진행 중인 원격 작업 전체를 하나의 폴링 루프에서 추적합니다
+
+    - 작업마다 조회 간격을 min_interval부터 backoff배씩 늘려 max_interval까지 (적응형 백오프)
+    - 조회 시각이 된 작업들을 batch_size개씩 묶어 한 번에 상태 조회
+    - 결과가 도착하면 wait()로 기다리던 쪽을 깨움
+
+    작업 수백 개가 진행 중이어도 열린 연결은 폴링 요청 하나뿐입니다.
+    """
+
+    def __init__(
+        self,
+        client,
+        min_interval: float = 0.5,
+        max_interval: float = 15.0,
+        backoff: float = 1.5,
+        batch_size: int = 100,
+        job_timeout: float = 1800
+    ):
+        """
+        매개변수:
+            client: submit_file / get_analysis_statuses를 제공하는 Cochl 클라이언트
+            min_interval: 제출 직후 첫 조회까지의 간격 (초)
+            max_interval: 조회 간격 상한 (초)
+            backoff: 아직 처리 중일 때 간격을 늘리는 배수
+            batch_size: 한 번에 조회할 최대 작업 수
+            job_timeout: 작업 하나를 기다리는 최대 시간 (초)
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.job_timeout = job_timeout
+
+        self._jobs: Dict[str, _Job] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.completed = 0
+        self.failed = 0
+        self.polls = 0
+        self.checks = 0
+        self.poll_errors = 0
+        self.total_wait = 0.0
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """폴링 중단 (기다리던 작업은 실패 처리)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for remote_id, job in self._jobs.items():
+            if not job.future.done():
+                job.future.set_exception(CochlJobError(f"서버 종료로 작업 추적 중단: {remote_id}"))
+        self._jobs.clear()
+
+    async def wait(self, remote_id: str) -> List[DetectionResult]:
+        """
+        제출한 작업의 결과를 기다림
+
+        반환값:
+            DetectionResult 리스트
+        """
+        await self.start()
+        now = time.monotonic()
+        job = _Job(asyncio.get_running_loop().create_future(), now, self.min_interval, self.job_timeout)
+        self._jobs[remote_id] = job
+        self._wakeup.set()
+
+        try:
+            data = await job.future
+        finally:
+            self._jobs.pop(remote_id, None)
+            self.total_wait += time.monotonic() - job.submitted_at
+        return (await resolve(self.client)).parse_detections(data)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 예상치 못한 오류로 루프가 멈추면 기다리는 작업이 모두 시간 초과까지 멈추므로 계속 진행
+                logger.error(f"❌ Cochl 작업 폴링 루프 오류: {e}", exc_info=True)
+                await asyncio.sleep(self.min_interval)
+
+    async def _step(self):
+        """조회 시각이 된 작업 묶음을 한 번 조회 (없으면 다음 조회 시각까지 대기)"""
+        if not self._jobs:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+            return
+
+        now = time.monotonic()
+        next_due = min(job.next_check for job in self._jobs.values())
+        if next_due > now:
+            # 새 작업이 들어오면 더 이른 조회 시각이 생길 수 있으므로 깨어나서 다시 계산
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), next_due - now)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        # 곧 조회할 작업도 함께 묶어 조회 횟수를 줄임
+        horizon = now + self.min_interval / 2
+        due = sorted(
+            (remote_id for remote_id, job in self._jobs.items() if job.next_check <= horizon),
+            key=lambda remote_id: self._jobs[remote_id].next_check
+        )[:self.batch_size]
+        await self._poll(due)
+
+    async def _poll(self, remote_ids: List[str]):
+        """작업 묶음 상태 조회 후 완료/실패/대기 처리"""
+        self.polls += 1
+        self.checks += len(remote_ids)
+        try:
+            client = await resolve(self.client)
+            statuses = await client.get_analysis_statuses(remote_ids)
+        except Exception as e:
+            self.poll_errors += 1
+            logger.warning(f"⚠️ Cochl 작업 상태 조회 실패 ({len(remote_ids)}개): {e}")
+            statuses = {}
+
+        now = time.monotonic()
+        for remote_id in remote_ids:
+            job = self._jobs.get(remote_id)
+            if job is None:
+                continue
+            if job.future.done():
+                # 기다리던 쪽이 취소됨
+                del self._jobs[remote_id]
+                continue
+
+            status = statuses.get(remote_id) or {}
+            state = str(status.get("status", "")).lower()
+            if state in COMPLETED_STATES:
+                self.completed += 1
+                del self._jobs[remote_id]
+                job.future.set_result(status)
+            elif state in FAILED_STATES:
+                self.failed += 1
+                del self._jobs[remote_id]
+                job.future.set_exception(
+                    CochlJobError(f"Cochl 작업 실패: {remote_id} ({status.get('error') or state})")
+                )
+            elif now >= job.deadline:
+                self.failed += 1
+                del self._jobs[remote_id]
+                job.future.set_exception(
+                    CochlJobError(f"Cochl 작업 시간 초과: {remote_id} ({self.job_timeout:.0f}초)")
+                )
+            else:
+                # 아직 처리 중이거나 조회 실패: 간격을 늘려 다음에 다시 조회
+                job.interval = min(job.interval * self.backoff, self.max_interval)
+                job.next_check = now + job.interval
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "in_flight": len(self._jobs),
+            "completed": self.completed,
+            "failed": self.failed,
+            "polls": self.polls,
+            "status_checks": self.checks,
+            "poll_errors": self.poll_errors,
+            "avg_batch": round(self.checks / self.polls, 1) if self.polls else 0,
+            "avg_wait_ms": round(self.total_wait / finished * 1000, 1) if finished else 0,
+        }
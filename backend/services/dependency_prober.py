@@ -0,0 +1,216 @@
+"""
+의존성 상태 점검: 외부 서비스 응답 시간/오류율을 백그라운드에서 주기적으로 측정하고 캐시
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from backend.utils.loop_monitor import LoopMonitor
+
+logger = logging.getLogger(__name__)
+
+# 의존성 상태
+UNKNOWN = "unknown"    # 아직 점검하지 않음
+UP = "up"
+DEGRADED = "degraded"  # 최근 점검 중 일부 실패 또는 느림
+DOWN = "down"          # 연속 실패
+
+
+class _Dependency:
+    def __init__(self, name: str, probe: Callable[[], Awaitable[None]], critical: bool, window: int):
+        self.name = name
+        self.probe = probe
+        self.critical = critical
+        # 최근 점검 결과 (성공 여부, 응답 시간)
+        self.results: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+
+
+class DependencyProber:
+    """
+    의존성별 점검 함수를 interval마다 동시에 실행하여 결과를 캐시
+
+    /health/ready는 마지막 점검 결과(snapshot)만 읽으므로 요청마다 I/O가 없습니다.
+    점검 함수는 정상이면 반환하고, 비정상이면 예외를 던집니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = 15.0,
+        timeout: float = 5.0,
+        window: int = 20,
+        down_after: int = 3,
+        slow_seconds: float = 2.0,
+        loop_monitor: Optional[LoopMonitor] = None
+    ):
+        """
+        매개변수:
+            interval: 점검 주기 (초)
+            timeout: 점검 1회 제한 시간 (초)
+            window: 오류율/응답 시간 계산에 쓰는 최근 점검 횟수
+            down_after: 이 횟수만큼 연속 실패하면 down
+            slow_seconds: 최근 응답 시간 중앙값이 이보다 길면 degraded
+            loop_monitor: 이벤트 루프 지연 측정기 (준비 상태에 함께 보고)
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.window = window
+        self.down_after = down_after
+        self.slow_seconds = slow_seconds
+        self._dependencies: Dict[str, _Dependency] = {}
+        self._queues: Dict[str, Callable[[], int]] = {}
+        self._snapshot: Dict[str, dict] = {}
+        self.loop_monitor = loop_monitor
+        self._task: Optional[asyncio.Task] = None
+        self._http = None
+
+    def register(self, name: str, probe: Callable[[], Awaitable[None]], critical: bool = False):
+        """
+        점검 대상 등록
+
+        매개변수:
+            name: 의존성 이름
+            probe: 점검 함수 (정상이면 반환, 비정상이면 예외)
+            critical: True면 down일 때 준비 안 됨(503)으로 보고
+        """
+        self._dependencies[name] = _Dependency(name, probe, critical, self.window)
+        self._snapshot[name] = self._describe(self._dependencies[name])
+
+    def watch_queue(self, name: str, depth: Callable[[], int]):
+        """준비 상태에 함께 보고할 대기열 길이 (메모리 값만 읽는 함수)"""
+        self._queues[name] = depth
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._probe_loop())
+            logger.info(f"🩺 의존성 점검 시작: {', '.join(self._dependencies) or '없음'} ({self.interval:.0f}초 주기)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def http_probe(self, url: str) -> Callable[[], Awaitable[None]]:
+        """
+        URL의 호스트(scheme://host)로 HEAD 요청을 보내는 점검 함수
+
+        Webhook URL 자체를 호출하면 알림이 실행되므로 호스트 루트만 확인합니다.
+        응답이 오면(5xx 제외) 정상으로 봅니다 (DNS/TLS/네트워크 왕복 확인).
+        """
+        parts = urlsplit(url)
+        target = f"{parts.scheme}://{parts.netloc}/"
+
+        async def probe():
+            if self._http is None:
+                import httpx
+                self._http = httpx.AsyncClient(timeout=self.timeout)
+            response = await self._http.head(target)
+            if response.status_code >= 500:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+        return probe
+
+    async def probe_all(self):
+        """모든 의존성을 동시에 한 번 점검하고 결과 캐시 갱신"""
+        await asyncio.gather(*(self._probe(dependency) for dependency in self._dependencies.values()))
+
+    async def _probe_loop(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"❌ 의존성 점검 오류: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self, dependency: _Dependency):
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(dependency.probe(), self.timeout)
+            ok, error = True, None
+        except asyncio.TimeoutError:
+            ok, error = False, f"{self.timeout:.0f}초 내 응답 없음"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        elapsed = time.monotonic() - started
+
+        previous = self._snapshot.get(dependency.name, {}).get("status")
+        dependency.results.append((ok, elapsed))
+        dependency.consecutive_failures = 0 if ok else dependency.consecutive_failures + 1
+        dependency.last_error = error if not ok else dependency.last_error
+        dependency.last_checked = time.time()
+        snapshot = self._describe(dependency)
+        self._snapshot[dependency.name] = snapshot
+
+        if snapshot["status"] != previous and previous not in (None, UNKNOWN):
+            log = logger.info if snapshot["status"] == UP else logger.warning
+            log(f"🩺 의존성 상태 변경: {dependency.name} {previous} → {snapshot['status']} ({error or 'ok'})")
+
+    def _describe(self, dependency: _Dependency) -> dict:
+        results = dependency.results
+        if not results:
+            return {"status": UNKNOWN, "critical": dependency.critical}
+
+        latencies = sorted(elapsed for ok, elapsed in results if ok)
+        median = latencies[len(latencies) // 2] if latencies else None
+        error_rate = sum(1 for ok, _ in results if not ok) / len(results)
+        if dependency.consecutive_failures >= self.down_after:
+            status = DOWN
+        elif dependency.consecutive_failures or error_rate >= 0.5 or (median is not None and median > self.slow_seconds):
+            status = DEGRADED
+        else:
+            status = UP
+        return {
+            "status": status,
+            "critical": dependency.critical,
+            "latency_ms": round(results[-1][1] * 1000, 1),
+            "latency_p50_ms": round(median * 1000, 1) if median is not None else None,
+            "error_rate": round(error_rate, 3),
+            "checks": len(results),
+            "consecutive_failures": dependency.consecutive_failures,
+            "last_error": dependency.last_error,
+            "last_checked": dependency.last_checked
+        }
+
+    @property
+    def loop_lag(self) -> float:
+        """현재 이벤트 루프 지연 (초)"""
+        return self.loop_monitor.current_lag if self.loop_monitor else 0.0
+
+    @property
+    def max_loop_lag(self) -> float:
+        """최근 측정 구간의 최대 이벤트 루프 지연 (초)"""
+        if not self.loop_monitor:
+            return 0.0
+        return self.loop_monitor.lag.percentile(100) or 0.0
+
+    def snapshot(self) -> Dict[str, dict]:
+        """마지막 점검 결과 (I/O 없음)"""
+        return self._snapshot
+
+    def queue_depths(self) -> Dict[str, int]:
+        depths = {}
+        for name, depth in self._queues.items():
+            try:
+                depths[name] = depth()
+            except Exception as e:
+                logger.error(f"대기열 길이 조회 실패: {name} - {e}")
+                depths[name] = -1
+        return depths
+
+    def stats(self) -> dict:
+        return {
+            "dependencies": self._snapshot,
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "max_loop_lag_ms": round(self.max_loop_lag * 1000, 1),
+            "queues": self.queue_depths()
+        }
+
@@ -0,0 +1,75 @@
+"""
+탐지 구간 병합: 분석 구간(window)마다 잘게 나뉘어 온 같은 소리를 하나의 이벤트로 합침
+"""
+import logging
+from typing import Dict, List
+
+from backend.services.cochl_api import DetectionResult
+
+logger = logging.getLogger(__name__)
+
+
+def merge_detections(detections: List[DetectionResult], gap_seconds: float = 1.0) -> List[DetectionResult]:
+    """
+    같은 태그의 탐지 중 겹치거나 gap_seconds 이내로 붙어 있는 구간을 하나로 병합
+
+    태그별로 시작 시각 순으로 정렬한 뒤 한 번 훑으면서, 다음 구간의 시작이
+    현재 병합 구간의 끝 + gap_seconds 이내이면 이어 붙입니다 (O(n log n)).
+    병합된 이벤트의 confidence는 최고 신뢰도이며, 평균 신뢰도와 합친
+    구간 수를 함께 기록합니다.
+
+    매개변수:
+        detections: Cochl 탐지 결과 (구간 단위)
+        gap_seconds: 이 간격(초) 이하로 떨어진 구간까지 같은 이벤트로 간주
+
+    반환값:
+        병합된 탐지 결과 (시작 시각 순)
+    """
+    if len(detections) < 2:
+        return list(detections)
+
+    by_tag: Dict[str, List[DetectionResult]] = {}
+    for detection in detections:
+        by_tag.setdefault(detection.tag, []).append(detection)
+
+    merged: List[DetectionResult] = []
+    for tag, items in by_tag.items():
+        items.sort(key=lambda d: (d.start_time, d.end_time))
+        current = None
+        confidence_sum = 0.0
+        for detection in items:
+            if current is not None and detection.start_time <= current.end_time + gap_seconds:
+                current.end_time = max(current.end_time, detection.end_time)
+                current.window_count += detection.window_count
+                confidence_sum += detection.mean_confidence * detection.window_count
+                if detection.peak_confidence > current.peak_confidence:
+                    current.peak_confidence = detection.peak_confidence
+                continue
+
+            if current is not None:
+                _close(current, confidence_sum)
+                merged.append(current)
+            current = _copy(detection)
+            confidence_sum = detection.mean_confidence * detection.window_count
+        _close(current, confidence_sum)
+        merged.append(current)
+
+    merged.sort(key=lambda d: (d.start_time, d.tag))
+    if len(merged) < len(detections):
+        logger.info(f"🔗 탐지 구간 병합: {len(detections)}개 → {len(merged)}개")
+    return merged
+
+
+def _copy(detection: DetectionResult) -> DetectionResult:
+    """원본을 바꾸지 않도록 복사 (병합 정보 포함)"""
+    copy = DetectionResult(detection.tag, detection.confidence, detection.start_time, detection.end_time)
+    copy.event_id = detection.event_id
+    copy.peak_confidence = detection.peak_confidence
+    copy.mean_confidence = detection.mean_confidence
+    copy.window_count = detection.window_count
+    return copy
+
+
+def _close(merged: DetectionResult, confidence_sum: float):
+    merged.mean_confidence = round(confidence_sum / merged.window_count, 4)
+    merged.confidence = merged.peak_confidence
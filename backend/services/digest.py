@@ -0,0 +1,253 @@
+"""
+주기 요약(Digest): 긴급 기준 미만 이벤트를 사이트별로 모아 한 번에 전송
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class _SiteDigest:
+    """사이트 하나의 요약 버퍼 (태그별 건수와 신뢰도가 가장 높은 예시만 보관)"""
+
+    __slots__ = ("site_id", "started_at", "total", "tags", "other_count", "attempts")
+
+    def __init__(self, site_id: Optional[str]):
+        self.site_id = site_id
+        self.started_at = time.time()
+        self.total = 0
+        # 태그 → {"count", "max_severity", "peak": 신뢰도가 가장 높은 이벤트}
+        self.tags: Dict[str, dict] = {}
+        self.other_count = 0
+        # 전송 시도 횟수 (실패한 요약은 다음 주기에 한 번 더 전송)
+        self.attempts = 0
+
+    def add(self, tag: str, confidence: float, severity: int, timestamp: Optional[str],
+            event_id: Optional[str], max_tags: int):
+        self.total += 1
+        entry = self.tags.get(tag)
+        if entry is None:
+            if len(self.tags) >= max_tags:
+                # 태그 종류 수도 제한하여 버퍼 크기를 고정
+                self.other_count += 1
+                return
+            entry = self.tags[tag] = {"count": 0, "max_severity": severity, "peak": None}
+        entry["count"] += 1
+        if severity > entry["max_severity"]:
+            entry["max_severity"] = severity
+        peak = entry["peak"]
+        if peak is None or confidence > peak["confidence"]:
+            entry["peak"] = {
+                "confidence": confidence,
+                "severity": severity,
+                "timestamp": timestamp,
+                "event_id": event_id,
+            }
+
+    def merge(self, other: "_SiteDigest", max_tags: int):
+        """전송에 실패한 이전 요약을 이 요약에 합침"""
+        self.started_at = min(self.started_at, other.started_at)
+        self.total += other.total
+        self.other_count += other.other_count
+        self.attempts = max(self.attempts, other.attempts)
+        for tag, previous in other.tags.items():
+            entry = self.tags.get(tag)
+            if entry is None:
+                if len(self.tags) >= max_tags:
+                    self.other_count += previous["count"]
+                    continue
+                self.tags[tag] = previous
+                continue
+            entry["count"] += previous["count"]
+            entry["max_severity"] = max(entry["max_severity"], previous["max_severity"])
+            if entry["peak"] is None or (
+                previous["peak"] is not None and previous["peak"]["confidence"] > entry["peak"]["confidence"]
+            ):
+                entry["peak"] = previous["peak"]
+
+    def to_payload(self) -> dict:
+        tags = sorted(
+            ({"tag": tag, **entry} for tag, entry in self.tags.items()),
+            key=lambda item: item["count"],
+            reverse=True
+        )
+        summary = ", ".join(f"{item['tag']} {item['count']}건" for item in tags[:5])
+        if len(tags) > 5 or self.other_count:
+            summary += " 외"
+        site = self.site_id or "기본"
+        return {
+            "type": "digest",
+            "site_id": self.site_id,
+            "period_start": datetime.fromtimestamp(self.started_at).isoformat(),
+            "period_end": datetime.now().isoformat(),
+            "total_events": self.total,
+            "tags": tags,
+            "other_tags_count": self.other_count,
+            "message": f"📋 [{site}] 일반 이벤트 요약: 총 {self.total}건 ({summary})",
+        }
+
+
+class DigestAggregator:
+    """
+    긴급 기준 미만 이벤트를 사이트별로 모아 주기적으로 요약 1건씩 전송
+
+    이벤트마다 외부 호출을 하지 않고 interval마다 (또는 사이트 버퍼가
+    max_events건에 도달하면 즉시) 사이트당 한 번만 전송합니다.
+    버퍼는 사이트 수(max_sites)와 사이트별 태그 수(max_tags)로 제한되며,
+    종료 시 남은 요약을 모두 전송합니다.
+
+    요약은 긴급 알림과 같은 Webhook으로 나가지만 속도 제한 버킷(bucket)을 따로
+    쓰므로, 요약이 한꺼번에 나가도 긴급 알림이 토큰을 기다리지 않습니다.
+    전송에 실패한 요약은 버리지 않고 다음 주기 요약에 합쳐 한 번 더 보냅니다.
+    """
+
+    def __init__(
+        self,
+        resolve_target: Callable[[Optional[str]], object],
+        interval: float = 300.0,
+        max_events: int = 500,
+        max_sites: int = 1000,
+        max_tags: int = 100,
+        bucket: str = "zapier_digest"
+    ):
+        """
+        매개변수:
+            resolve_target: site_id → 전송 대상 (ZapierIntegration, 없으면 None)
+            interval: 요약 전송 주기 (초)
+            max_events: 사이트별 최대 누적 건수 (도달하면 바로 전송)
+            max_sites: 동시에 모으는 최대 사이트 수 (넘으면 새 사이트 이벤트는 버림)
+            max_tags: 사이트별 최대 태그 종류 수 (넘는 태그는 건수만 집계)
+            bucket: 요약 전송에 쓰는 속도 제한 버킷
+        """
+        self.resolve_target = resolve_target
+        self.interval = interval
+        self.max_events = max_events
+        self.max_sites = max_sites
+        self.max_tags = max_tags
+        self.bucket = bucket
+
+        self._digests: Dict[Optional[str], _SiteDigest] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._sending: Set[asyncio.Task] = set()
+
+        self.buffered = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.no_destination = 0
+
+    def add(
+        self,
+        site_id: Optional[str],
+        tag: str,
+        confidence: float,
+        severity: int,
+        timestamp: Optional[str] = None,
+        event_id: Optional[str] = None
+    ) -> bool:
+        """
+        이벤트 1건을 사이트 요약에 추가
+
+        반환값:
+            추가 여부 (사이트 수 제한으로 버려지면 False)
+        """
+        site_id = str(site_id) if site_id is not None else None
+        digest = self._digests.get(site_id)
+        if digest is None:
+            if len(self._digests) >= self.max_sites:
+                self.dropped += 1
+                return False
+            digest = self._digests[site_id] = _SiteDigest(site_id)
+
+        digest.add(tag, confidence, severity, timestamp, event_id, self.max_tags)
+        self.buffered += 1
+        if digest.total >= self.max_events:
+            # 크기 제한 도달: 이 사이트만 바로 전송 (요청 경로는 기다리지 않음)
+            del self._digests[site_id]
+            task = asyncio.ensure_future(self._send(digest))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+        return True
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._flush_loop())
+            logger.info(f"📋 주기 요약 시작: {self.interval:g}초 간격, 사이트별 최대 {self.max_events}건")
+
+    async def stop(self):
+        """주기 전송을 멈추고 남은 요약을 모두 전송"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+        # 종료 중 실패하여 다시 버퍼에 들어간 요약 재전송
+        await self.flush()
+
+    async def flush(self):
+        """모든 사이트의 요약을 전송하고 버퍼를 비움"""
+        if not self._digests:
+            return
+        digests, self._digests = self._digests, {}
+        await asyncio.gather(*(self._send(digest) for digest in digests.values()))
+
+    async def _send(self, digest: _SiteDigest):
+        target = self.resolve_target(digest.site_id)
+        if target is None:
+            self.no_destination += 1
+            return
+        payload = digest.to_payload()
+        digest.attempts += 1
+        try:
+            success = await target.send_payload(
+                payload, f"요약 site={digest.site_id} events={digest.total}", bucket=self.bucket
+            )
+        except Exception as e:
+            logger.error(f"❌ 요약 전송 중 오류: {str(e)}")
+            success = False
+        if success:
+            self.sent += 1
+        elif digest.attempts < 2 and self._rebuffer(digest):
+            self.retried += 1
+            logger.warning(f"⚠️ 요약 전송 실패, 다음 주기에 재전송: site={digest.site_id}, {digest.total}건")
+        else:
+            self.failed += 1
+            logger.error(f"❌ 요약 전송 실패: site={digest.site_id}, {digest.total}건")
+
+    def _rebuffer(self, digest: _SiteDigest) -> bool:
+        """실패한 요약을 버퍼에 되돌림 (그 사이 새로 쌓인 요약이 있으면 합침)"""
+        current = self._digests.get(digest.site_id)
+        if current is None:
+            if len(self._digests) >= self.max_sites:
+                return False
+            self._digests[digest.site_id] = digest
+            return True
+        current.merge(digest, self.max_tags)
+        return True
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ 주기 요약 전송 실패: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "sites_pending": len(self._digests),
+            "events_pending": sum(digest.total for digest in self._digests.values()),
+            "buffered": self.buffered,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "no_destination": self.no_destination,
+        }
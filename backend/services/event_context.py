@@ -0,0 +1,75 @@
+"""
+LLM 시간 컨텍스트: 분석 대상 이벤트 주변의 이벤트만 골라 프롬프트 크기를 일정하게 유지
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+
+class EventTimeline:
+    """
+    작업마다 한 번 만드는 시작 시각 순 이벤트 인덱스
+
+    이벤트마다 전체 목록을 정렬하지 않고, 시작 시각 배열에서 이분 탐색으로
+    대상 위치를 찾은 뒤 양쪽으로 가까운 이벤트를 넓혀 갑니다.
+
+    event_id는 같은 응답의 탐지끼리 겹칠 수 있으므로 이벤트 객체 자체(id())로
+    위치를 찾습니다. 목록에 없는 이벤트는 시작 시각으로 위치를 정합니다.
+    """
+
+    def __init__(self, events: Sequence[dict]):
+        self.events: List[dict] = sorted(events, key=lambda e: e["start_time"])
+        self.start_times: List[float] = [e["start_time"] for e in self.events]
+        self._positions: Dict[int, int] = {id(e): p for p, e in enumerate(self.events)}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def position(self, event: dict) -> int:
+        """시작 시각 순 위치 (0부터)"""
+        position = self._positions.get(id(event))
+        if position is None:
+            position = min(bisect_left(self.start_times, event["start_time"]), len(self.events) - 1)
+        return position
+
+    def context(self, event: dict, max_events: int, window_seconds: float) -> Tuple[List[dict], dict, dict]:
+        """
+        대상 이벤트 주변 컨텍스트
+
+        ±window_seconds 안의 이벤트 중 시작 시각이 가장 가까운 max_events개(대상 포함)를
+        고릅니다. window_seconds가 0 이하이면 시간 제한 없이 가장 가까운 max_events개입니다.
+
+        반환값:
+            (주변 이벤트 목록 (시간순), 이전 구간 요약, 이후 구간 요약)
+            요약은 {"count", "from", "to", "tags": {태그: 건수}} (해당 이벤트가 없으면 빈 dict)
+        """
+        position = self.position(event)
+        center = self.start_times[position]
+
+        if window_seconds > 0:
+            lo = bisect_left(self.start_times, center - window_seconds)
+            hi = bisect_right(self.start_times, center + window_seconds)
+        else:
+            lo, hi = 0, len(self.events)
+
+        # 대상에서 양쪽으로 가까운 쪽부터 넓혀 감
+        left, right = position, position + 1
+        while right - left < max_events and (left > lo or right < hi):
+            if right >= hi or (left > lo and center - self.start_times[left - 1] <= self.start_times[right] - center):
+                left -= 1
+            else:
+                right += 1
+
+        return self.events[left:right], self._summarize(0, left), self._summarize(right, len(self.events))
+
+    def _summarize(self, start: int, end: int) -> dict:
+        if start >= end:
+            return {}
+        tags: Dict[str, int] = {}
+        for e in self.events[start:end]:
+            tags[e["tag"]] = tags.get(e["tag"], 0) + 1
+        return {
+            "count": end - start,
+            "from": self.start_times[start],
+            "to": self.events[end - 1]["end_time"],
+            "tags": dict(sorted(tags.items(), key=lambda item: -item[1]))
+        }
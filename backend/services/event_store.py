@@ -0,0 +1,384 @@
+"""
+이벤트 저장소: 처리된 소리 이벤트를 SQLite에 추가 전용으로 저장하고 조회
+"""
+import asyncio
+import base64
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    event_id TEXT,
+    task_id TEXT,
+    tag TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    severity INTEGER NOT NULL,
+    is_emergency INTEGER NOT NULL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts, id);
+CREATE INDEX IF NOT EXISTS idx_events_severity_ts ON events (severity, ts, id);
+CREATE INDEX IF NOT EXISTS idx_events_tag_severity_ts ON events (tag, severity, ts, id);
+"""
+
+COLUMNS = "id, ts, source, event_id, task_id, tag, confidence, severity, is_emergency, payload"
+
+# 심각도 점수 범위 (ManagerAgent 기준 1-10)
+MIN_SEVERITY, MAX_SEVERITY = 1, 10
+
+
+def parse_epoch(value: str) -> float:
+    """
+    ISO 8601 문자열 또는 epoch 초를 epoch 초로 변환
+
+    예외:
+        ValueError: 해석할 수 없는 값
+    """
+    try:
+        epoch = float(value)
+    except ValueError:
+        pass
+    else:
+        if not math.isfinite(epoch):
+            raise ValueError(f"시각 형식이 잘못되었습니다: {value}")
+        return epoch
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        raise ValueError(f"시각 형식이 잘못되었습니다: {value}")
+
+
+def to_epoch(value: Optional[str]) -> float:
+    """이벤트 시각 변환 (없거나 잘못되면 현재 시각, 수신한 이벤트 기록용)"""
+    if not value:
+        return time.time()
+    try:
+        return parse_epoch(value)
+    except ValueError:
+        return time.time()
+
+
+def encode_cursor(ts: float, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{ts!r}:{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    ts, _, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+    return float(ts), int(row_id)
+
+
+class EventStore:
+    """
+    추가 전용 이벤트 저장소
+
+    - 쓰기는 메모리 버퍼에 모았다가 배치로 한 번에 기록합니다
+      (기록에 실패한 배치는 버퍼 앞에 되돌려 다음 기록 때 다시 시도, 최대 max_pending건)
+    - 시각/태그/심각도 인덱스로 조회하며 (ts, id) 커서로 페이지를 나눕니다
+    - 보존 기간이 지난 이벤트는 주기적으로 삭제하고, 비워진 페이지는
+      incremental_vacuum으로 파일에서 반납합니다
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/events.db",
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        retention_days: float = 30,
+        compaction_interval: float = 3600,
+        max_pending: int = 50000
+    ):
+        """
+        이벤트 저장소 초기화
+
+        매개변수:
+            db_path: SQLite 파일 경로
+            batch_size: 이만큼 쌓이면 즉시 기록
+            flush_interval: 버퍼를 기록하는 최대 간격 (초)
+            retention_days: 보존 기간 (일, 0이면 삭제하지 않음)
+            compaction_interval: 보존 기간 정리 주기 (초)
+            max_pending: 기록 실패 시 메모리에 보관하는 최대 이벤트 수 (넘으면 오래된 것부터 버림)
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.compaction_interval = compaction_interval
+        self.max_pending = max_pending
+
+        self._buffer: List[tuple] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        # SQLite 연결은 스레드별로 하나씩: 쓰기 전용 / 읽기 전용
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store-write")
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store-read")
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self):
+        """DB 연결 및 백그라운드 기록/정리 작업 시작"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self._open_writer)
+        await loop.run_in_executor(self._reader, self._open_reader)
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._flush_loop()),
+            asyncio.ensure_future(self._compaction_loop()),
+        ]
+        logger.info(f"이벤트 저장소 시작: {self.db_path} (보존 {self.retention_days:g}일)")
+
+    async def stop(self):
+        """남은 버퍼를 기록하고 연결 종료"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        if self._write_conn:
+            await loop.run_in_executor(self._writer, self._write_conn.close)
+        if self._read_conn:
+            await loop.run_in_executor(self._reader, self._read_conn.close)
+        self._writer.shutdown(wait=True)
+        self._reader.shutdown(wait=True)
+        logger.info(f"이벤트 저장소 종료: 총 {self.written}건 기록" + (f", {self.dropped}건 버림" if self.dropped else ""))
+
+    def _open_writer(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        # 새 DB는 삭제로 비워진 페이지를 조금씩 반납할 수 있도록 생성 (기존 DB는 정리 때 전환)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._write_conn = conn
+
+    def _open_reader(self):
+        self._read_conn = sqlite3.connect(self.db_path)
+        self._read_conn.row_factory = sqlite3.Row
+
+    def append(
+        self,
+        source: str,
+        tag: str,
+        confidence: float,
+        severity: int,
+        is_emergency: bool,
+        timestamp: Optional[str] = None,
+        event_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        payload: Optional[Dict] = None
+    ):
+        """
+        이벤트 1건을 버퍼에 추가 (기록은 백그라운드에서 배치로 수행)
+
+        매개변수:
+            source: 이벤트 출처 ("webhook", "file" 등)
+            timestamp: 이벤트 발생 시각 (ISO 8601, 없으면 현재 시각)
+            payload: 원본 데이터 등 추가 정보
+        """
+        self._buffer.append((
+            to_epoch(timestamp), source, event_id, task_id, tag.lower(), confidence,
+            severity, int(is_emergency),
+            json.dumps(payload, ensure_ascii=False) if payload else None
+        ))
+        if len(self._buffer) >= self.batch_size and self._wakeup:
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        """아직 기록하지 않은 이벤트 수"""
+        return len(self._buffer)
+
+    async def ping(self):
+        """읽기 연결로 SELECT 1 실행 (상태 점검용)"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._reader, lambda: self._read_conn.execute("SELECT 1").fetchone())
+
+    async def flush(self):
+        """버퍼에 쌓인 이벤트를 한 번의 트랜잭션으로 기록"""
+        if not self._buffer or not self._write_conn:
+            return
+        batch, self._buffer = self._buffer, []
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._writer, self._insert_batch, batch)
+        except Exception:
+            self._requeue(batch)
+            raise
+        self.written += len(batch)
+
+    def _requeue(self, batch: List[tuple]):
+        """기록하지 못한 배치를 버퍼 앞에 되돌림 (max_pending을 넘는 오래된 이벤트는 버림)"""
+        self._buffer[:0] = batch
+        overflow = len(self._buffer) - self.max_pending
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.error(f"❌ 이벤트 기록 대기 한도 초과: 오래된 이벤트 {overflow}건 버림")
+        logger.warning(f"⚠️ 이벤트 {len(batch)}건 기록 실패 - 다음 기록 때 재시도 (대기 {len(self._buffer)}건)")
+
+    def _insert_batch(self, batch: List[tuple]):
+        with self._write_conn:
+            self._write_conn.executemany(
+                "INSERT INTO events (ts, source, event_id, task_id, tag, confidence, "
+                "severity, is_emergency, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch
+            )
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ 이벤트 기록 실패: {e}", exc_info=True)
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.error(f"❌ 이벤트 보존 기간 정리 실패: {e}", exc_info=True)
+
+    async def compact(self) -> int:
+        """보존 기간이 지난 이벤트 삭제 후 비워진 페이지 반납 (삭제 건수 반환)"""
+        if self.retention_days <= 0:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        loop = asyncio.get_running_loop()
+        deleted = await loop.run_in_executor(self._writer, self._delete_before, cutoff)
+        if deleted:
+            logger.info(f"🧹 이벤트 보존 기간 정리: {deleted}건 삭제")
+            await loop.run_in_executor(self._writer, self._vacuum)
+        return deleted
+
+    def _vacuum(self, pages: int = 1000):
+        """
+        비워진 페이지를 파일에서 반납
+
+        incremental 모드가 아닌 기존 DB는 한 번만 전체 VACUUM으로 전환하고,
+        이후에는 pages씩 나누어 incremental_vacuum하여 쓰기 잠금을 짧게 유지합니다.
+        """
+        conn = self._write_conn
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            started = time.monotonic()
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            logger.info(f"🧹 이벤트 저장소 incremental vacuum 모드로 전환 ({time.monotonic() - started:.1f}초)")
+            return
+        freed = 0
+        while True:
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free:
+                break
+            # incremental_vacuum은 한 단계에 한 페이지씩 반납하므로 끝까지 실행되는 executescript 사용
+            conn.executescript(f"PRAGMA incremental_vacuum({min(free, pages)});")
+            freed += min(free, pages)
+        if freed:
+            logger.info(f"🧹 이벤트 저장소 빈 페이지 {freed}개 반납")
+
+    def _delete_before(self, cutoff: float, chunk: int = 10000) -> int:
+        # 긴 쓰기 잠금을 피하기 위해 작은 단위로 나누어 삭제
+        deleted = 0
+        while True:
+            with self._write_conn:
+                cursor = self._write_conn.execute(
+                    "DELETE FROM events WHERE id IN "
+                    "(SELECT id FROM events WHERE ts < ? ORDER BY ts LIMIT ?)",
+                    (cutoff, chunk)
+                )
+            deleted += cursor.rowcount
+            if cursor.rowcount < chunk:
+                return deleted
+
+    async def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        tag: Optional[str] = None,
+        min_severity: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        시간순 이벤트 조회
+
+        반환값:
+            (이벤트 리스트, 다음 페이지 커서 또는 None)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._reader, self._query, since, until, tag, min_severity, cursor, limit
+        )
+
+    def _query(self, since, until, tag, min_severity, cursor, limit):
+        conditions, params = [], []
+        if cursor:
+            conditions.append("(ts, id) > (?, ?)")
+            params.extend(decode_cursor(cursor))
+        elif since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+
+        if tag is None and min_severity is None:
+            rows = self._select(conditions, params, limit + 1)
+        else:
+            # 심각도 단계별로 (tag, severity, ts) 인덱스 범위를 각각 읽고 병합합니다
+            # 각 범위가 이미 시각순이므로 단계마다 limit+1개만 읽으면 충분합니다
+            rows = []
+            lowest = max(MIN_SEVERITY, min_severity or MIN_SEVERITY)
+            for severity in range(lowest, MAX_SEVERITY + 1):
+                level = ["severity = ?"] + (["tag = ?"] if tag else [])
+                level_params = [severity] + ([tag] if tag else [])
+                rows.extend(self._select(level + conditions, level_params + params, limit + 1))
+            rows.sort(key=lambda row: (row["ts"], row["id"]))
+            rows = rows[:limit + 1]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["ts"], rows[-1]["id"])
+        return [self._to_dict(row) for row in rows], next_cursor
+
+    def _select(self, conditions: List[str], params: list, limit: int) -> List[sqlite3.Row]:
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._read_conn.execute(
+            f"SELECT {COLUMNS} FROM events {where} ORDER BY ts, id LIMIT ?",
+            params + [limit]
+        ).fetchall()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        return {
+            "id": row["id"],
+            "timestamp": datetime.fromtimestamp(row["ts"]).isoformat(),
+            "source": row["source"],
+            "event_id": row["event_id"],
+            "task_id": row["task_id"],
+            "tag": row["tag"],
+            "confidence": row["confidence"],
+            "severity_score": row["severity"],
+            "is_emergency": bool(row["is_emergency"]),
+            "payload": json.loads(row["payload"]) if row["payload"] else None,
+        }
@@ -0,0 +1,348 @@
+"""
+분석 작업 대기열: SQLite 기반의 영속 작업 큐 (웹 서버와 분석 워커 프로세스가 공유)
+
+웹 서버는 업로드 파일을 디스크에 저장하고 작업을 등록한 뒤 결과만 조회하며,
+분석은 별도 워커 프로세스(python -m backend.worker)가 임대(lease)를 받아 처리합니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    content_type TEXT,
+    file_size INTEGER NOT NULL,
+    site_id TEXT,
+    device_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    collected INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_collect ON jobs (collected, status, updated_at);
+"""
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+JOB_FIELDS = (
+    "id", "status", "priority", "file_path", "filename", "content_type", "file_size", "site_id",
+    "device_id", "attempts", "lease_owner", "lease_expires", "progress", "result", "error",
+    "collected", "created_at", "updated_at"
+)
+
+
+class JobQueue:
+    """
+    SQLite 작업 큐
+
+    - 작업은 우선순위, 등록 순서대로 하나씩 임대(claim)됩니다
+    - 워커는 처리 중 주기적으로 임대를 연장(heartbeat)하며 진행 상황을 기록합니다
+    - 워커가 죽어 임대가 만료되면 다른 워커가 다시 가져가며,
+      max_attempts번 시도해도 끝나지 않으면 실패로 처리합니다
+    - 웹 서버는 끝난 작업을 모아(collect) 결과를 반영합니다
+
+    모든 DB 작업은 전용 스레드 하나에서 실행되므로 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/jobs.db",
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        collect_interval: float = 0.5,
+        retention_seconds: float = 24 * 3600
+    ):
+        """
+        매개변수:
+            db_path: SQLite 파일 경로
+            lease_seconds: 작업 임대 시간 (이 시간 동안 heartbeat가 없으면 다른 워커가 가져감)
+            max_attempts: 작업당 최대 시도 횟수
+            collect_interval: 끝난 작업 확인 주기 (초, 웹 서버용)
+            retention_seconds: 반영이 끝난 작업을 보관하는 시간 (초)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.collect_interval = collect_interval
+        self.retention_seconds = retention_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-queue")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[dict], Awaitable[None]]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._counts: Dict[str, int] = {}
+        self.collected = 0
+
+    # ---- 연결 ----
+
+    async def open(self):
+        await self._call(self._open)
+
+    async def close(self):
+        if self._conn:
+            await self._call(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    def _open(self):
+        if self._conn is not None:
+            return
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ---- 웹 서버: 등록 / 조회 / 결과 반영 ----
+
+    async def enqueue(
+        self,
+        job_id: str,
+        file_path: str,
+        filename: str,
+        content_type: Optional[str],
+        file_size: int,
+        priority: int,
+        site_id: Optional[str] = None,
+        device_id: Optional[str] = None
+    ):
+        """작업 등록 (업로드 파일은 file_path에 미리 저장되어 있어야 함)"""
+        now = time.time()
+        await self._call(
+            self._execute,
+            "INSERT INTO jobs (id, status, priority, file_path, filename, content_type, file_size, "
+            "site_id, device_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, QUEUED, int(priority), file_path, filename, content_type, file_size,
+             site_id, device_id, now, now)
+        )
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """작업 조회 (progress/result는 해석된 값)"""
+        return await self._call(self._get, job_id)
+
+    def subscribe(self, listener: Callable[[dict], Awaitable[None]]):
+        """끝난 작업(completed/failed)을 받을 콜백 등록 (웹 서버에서 결과 반영용)"""
+        self._listeners.append(listener)
+
+    async def start(self):
+        """끝난 작업 반영 루프 시작"""
+        await self.open()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._collect_loop())
+        logger.info(f"📥 분석 작업 대기열 사용: {self.db_path} (임대 {self.lease_seconds:g}초)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.close()
+
+    async def _collect_loop(self):
+        last_purge = 0.0
+        while True:
+            try:
+                await self.collect()
+                if time.monotonic() - last_purge > 600:
+                    last_purge = time.monotonic()
+                    purged = await self._call(self._purge, time.time() - self.retention_seconds)
+                    if purged:
+                        logger.info(f"🧹 오래된 분석 작업 {purged}건 정리")
+            except Exception as e:
+                logger.error(f"❌ 분석 작업 결과 반영 실패: {e}")
+            await asyncio.sleep(self.collect_interval)
+
+    async def collect(self) -> int:
+        """끝난 작업을 콜백에 전달하고 반영 완료로 표시"""
+        self._counts = await self._call(self._status_counts)
+        jobs = await self._call(self._uncollected, 100)
+        for job in jobs:
+            for listener in self._listeners:
+                try:
+                    await listener(job)
+                except Exception as e:
+                    logger.error(f"❌ 분석 작업 결과 반영 중 오류: job_id={job['id']}, {e}", exc_info=True)
+        if jobs:
+            await self._call(self._mark_collected, [job["id"] for job in jobs])
+            self.collected += len(jobs)
+        return len(jobs)
+
+    # ---- 워커: 임대 / 연장 / 완료 ----
+
+    async def claim(self, worker_id: str) -> Optional[dict]:
+        """가장 먼저 처리할 작업 1건을 임대 (없으면 None)"""
+        return await self._call(self._claim, worker_id)
+
+    async def heartbeat(self, job_id: str, worker_id: str, progress: Optional[dict] = None) -> bool:
+        """
+        임대 연장 (+ 진행 상황 기록)
+
+        반환값:
+            임대 유지 여부 (False면 만료되어 다른 워커가 가져간 것이므로 처리 중단)
+        """
+        return await self._call(self._heartbeat, job_id, worker_id, progress)
+
+    async def complete(self, job_id: str, worker_id: str, result: dict) -> bool:
+        return await self._call(self._finish, job_id, worker_id, COMPLETED, json.dumps(result, ensure_ascii=False), None)
+
+    async def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> str:
+        """
+        작업 실패 기록
+
+        반환값:
+            다음 상태 (시도 횟수가 남아 있으면 queued, 아니면 failed)
+        """
+        return await self._call(self._fail, job_id, worker_id, error, retry)
+
+    async def release(self, job_id: str, worker_id: str):
+        """처리하지 못한 작업을 시도 횟수 차감 없이 대기열로 반환 (워커 종료 시)"""
+        await self._call(
+            self._execute,
+            "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+            "attempts = MAX(attempts - 1, 0), updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            (QUEUED, time.time(), job_id, worker_id, RUNNING)
+        )
+
+    # ---- DB 작업 (전용 스레드에서 실행) ----
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _decode(self, row: sqlite3.Row) -> dict:
+        job = dict(row)
+        for key in ("progress", "result"):
+            if job.get(key):
+                job[key] = json.loads(job[key])
+        return job
+
+    def _get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._decode(row) if row else None
+
+    def _claim(self, worker_id: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 임대가 만료된 작업: 시도 횟수가 남았으면 다시 대기열로, 아니면 실패 처리
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, "작업 임대가 반복해서 만료되었습니다 (워커 중단)", now, RUNNING, now, self.max_attempts)
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ?",
+                    (QUEUED, now, RUNNING, now)
+                )
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (RUNNING, worker_id, now + self.lease_seconds, now, row["id"])
+                )
+                job = conn.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return self._decode(job)
+
+    def _heartbeat(self, job_id: str, worker_id: str, progress: Optional[dict]) -> bool:
+        now = time.time()
+        if progress is None:
+            sql, params = (
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker_id, RUNNING)
+            )
+        else:
+            sql, params = (
+                "UPDATE jobs SET lease_expires = ?, progress = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (now + self.lease_seconds, json.dumps(progress, ensure_ascii=False), now, job_id, worker_id, RUNNING)
+            )
+        return self._execute(sql, params) == 1
+
+    def _finish(self, job_id: str, worker_id: str, status: str, result: Optional[str], error: Optional[str]) -> bool:
+        return self._execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            (status, result, error, time.time(), job_id, worker_id, RUNNING)
+        ) == 1
+
+    def _fail(self, job_id: str, worker_id: str, error: str, retry: bool) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return FAILED
+        status = QUEUED if retry and row["attempts"] < self.max_attempts else FAILED
+        self._finish(job_id, worker_id, status, None, error)
+        return status
+
+    def _uncollected(self, limit: int) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE collected = 0 AND status IN (?, ?) "
+                "ORDER BY updated_at LIMIT ?",
+                (COMPLETED, FAILED, limit)
+            ).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def _mark_collected(self, job_ids: List[str]):
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET collected = 1 WHERE id = ?", [(job_id,) for job_id in job_ids])
+
+    def _status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def _purge(self, before: float) -> int:
+        return self._execute("DELETE FROM jobs WHERE collected = 1 AND updated_at < ?", (before,))
+
+    def stats(self) -> dict:
+        return {
+            "path": self.db_path,
+            "queued": self._counts.get(QUEUED, 0),
+            "running": self._counts.get(RUNNING, 0),
+            "completed": self._counts.get(COMPLETED, 0),
+            "failed": self._counts.get(FAILED, 0),
+            "collected": self.collected,
+        }
@@ -1,25 +1,74 @@
 """
 LLM 기반 상황 분석 서비스 (Claude API)
 """
+import asyncio
 import logging
 import os
+import time
 from typing import List, Dict, Optional
-from anthropic import Anthropic
+
+from backend.services.event_context import EventTimeline
+from backend.utils.rate_limiter import RateLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# 해석 등급
+TIER_SKIPPED = "skipped"    # 해석 생략
+TIER_TEMPLATE = "template"  # 고정 문구 (API 호출 없음)
+TIER_SMALL = "small"        # 작은 모델
+TIER_LARGE = "large"        # 큰 모델
+
 
 class LLMAnalyzer:
     """
     Claude API를 사용하여 소리 이벤트의 시간적 순서를 분석하고 상황을 해석
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    # 429 응답 시 Retry-After 이후 재시도하는 최대 횟수
+    MAX_ATTEMPTS = 5
+
+    LARGE_MODEL = "claude-sonnet-4-5-20250929"
+    SMALL_MODEL = "claude-haiku-4-5-20251001"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        context_events: int = 10,
+        context_seconds: float = 60.0,
+        min_severity: int = 4,
+        low_severity_template: bool = True,
+        large_margin: int = 1,
+        small_model: Optional[str] = SMALL_MODEL,
+        large_model: str = LARGE_MODEL
+    ):
+        """
+        매개변수:
+            context_events: 프롬프트에 나열할 주변 이벤트 최대 수 (분석 대상 포함)
+            context_seconds: 분석 대상 전후로 나열할 시간 범위 (초, 0 이하면 제한 없음)
+            min_severity: 이 점수 미만은 API를 호출하지 않음
+            low_severity_template: min_severity 미만에 고정 문구를 붙일지 (False면 해석 없음)
+            large_margin: 긴급 기준 - large_margin 점 이상이면 큰 모델 사용
+            small_model: 그 사이 점수에 사용할 모델 (없으면 큰 모델 사용)
+            large_model: 긴급 근처 점수에 사용할 모델
+        """
+        self.min_severity = min_severity
+        self.low_severity_template = low_severity_template
+        self.large_margin = large_margin
+        self.small_model = small_model or None
+        self.large_model = large_model
+        # 모델별 평균 응답 시간 (지수 이동 평균, 절감 시간 추정용)
+        self.latency: Dict[str, float] = {}
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.client = None
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.context_events = max(1, context_events)
+        self.context_seconds = context_seconds
 
         if self.api_key:
             try:
+                # 지연 import: anthropic 패키지 로드 비용을 서버 시작 경로에서 제외
+                from anthropic import Anthropic
                 self.client = Anthropic(api_key=self.api_key)
                 logger.info("✅ LLM Analyzer 초기화 완료 (Claude API)")
             except Exception as e:
@@ -28,13 +77,48 @@ class LLMAnalyzer:
         else:
             logger.warning("⚠️ ANTHROPIC_API_KEY가 설정되지 않았습니다. LLM 분석 비활성화")
 
-    async def analyze_event(self, event: Dict, all_events: List[Dict]) -> Optional[str]:
+    def choose_tier(self, severity: int, threshold: int) -> str:
+        """심각도 점수와 긴급 기준으로 해석 등급 결정"""
+        if severity < self.min_severity:
+            return TIER_TEMPLATE if self.low_severity_template else TIER_SKIPPED
+        if severity >= threshold - self.large_margin or not self.small_model:
+            return TIER_LARGE
+        return TIER_SMALL
+
+    def model_for(self, tier: str) -> str:
+        return self.small_model if tier == TIER_SMALL and self.small_model else self.large_model
+
+    def expected_seconds(self, tier: str) -> Optional[float]:
+        """등급별 평균 API 응답 시간 (아직 호출한 적이 없으면 None)"""
+        return self.latency.get(self.model_for(tier))
+
+    @staticmethod
+    def template_interpretation(event: Dict) -> str:
+        """낮은 심각도 이벤트용 고정 문구"""
+        return (
+            f"{event['start_time']:.1f}초~{event['end_time']:.1f}초에 {event['tag']} 소리가 탐지되었습니다 "
+            f"(신뢰도 {event['confidence']*100:.1f}%). 심각도 {event['severity_score']}/10으로 "
+            f"일상적인 소리로 판단되어 상세 해석을 생략했습니다."
+        )
+
+    async def analyze_event(
+        self,
+        event: Dict,
+        all_events: List[Dict],
+        timeline: Optional[EventTimeline] = None,
+        model: Optional[str] = None
+    ) -> Optional[str]:
         """
         개별 이벤트에 대한 상황 해석 생성
 
+        프롬프트에는 주변 이벤트만 나열하고 나머지는 구간별 건수로 요약하므로
+        녹음이 길어져도 프롬프트 크기가 일정합니다.
+
         Args:
             event: 현재 분석할 이벤트
             all_events: 전체 이벤트 리스트 (시간적 컨텍스트 제공)
+            timeline: all_events로 미리 만든 인덱스 (여러 이벤트를 분석할 때 재사용)
+            model: 사용할 모델 (없으면 큰 모델)
 
         Returns:
             상황 해석 문자열 또는 None (실패 시)
@@ -43,18 +127,24 @@ class LLMAnalyzer:
             return None
 
         try:
-            # 시간순 정렬
-            sorted_events = sorted(all_events, key=lambda x: x['start_time'])
+            if timeline is None:
+                timeline = EventTimeline(all_events)
+            nearby, before, after = timeline.context(event, self.context_events, self.context_seconds)
 
-            # 컨텍스트 구성
+            # 컨텍스트 구성 (번호는 전체 이벤트 중 순번)
+            first = timeline.position(nearby[0]) + 1
             context_lines = []
-            for idx, e in enumerate(sorted_events, 1):
+            if before:
+                context_lines.append(f"   (앞부분 생략) {self._summary_line(before)}")
+            for idx, e in enumerate(nearby, first):
                 # 현재 분석 중인 이벤트 표시
-                marker = "→ " if e['event_id'] == event['event_id'] else "  "
+                marker = "→ " if e is event else "  "
                 context_lines.append(
                     f"{marker}{idx}. {e['tag']} (신뢰도: {e['confidence']*100:.1f}%, "
                     f"시간: {e['start_time']:.1f}초~{e['end_time']:.1f}초)"
                 )
+            if after:
+                context_lines.append(f"   (뒷부분 생략) {self._summary_line(after)}")
 
             context = "\n".join(context_lines)
 
@@ -74,20 +164,55 @@ class LLMAnalyzer:
 4. 한국어로 작성
 5. 전문적이고 명확한 어조"""
 
-            # Claude API 호출
-            message = self.client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=300,  # 비용 절감
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
+            message = await self._create_message(prompt, model or self.large_model)
+            if message is None:
+                return None
 
             interpretation = message.content[0].text.strip()
-            logger.info(f"✅ LLM 분석 완료: event_id={event['event_id']}")
+            logger.info(f"✅ LLM 분석 완료: event_id={event['event_id']}, model={model or self.large_model}")
             return interpretation
 
         except Exception as e:
             logger.error(f"❌ LLM 분석 실패: {e}", exc_info=True)
             return None
+
+    @staticmethod
+    def _summary_line(summary: Dict, max_tags: int = 5) -> str:
+        """생략된 구간을 한 줄로 요약 (건수가 많은 태그 max_tags개까지)"""
+        tags = list(summary["tags"].items())
+        text = ", ".join(f"{tag} {count}건" for tag, count in tags[:max_tags])
+        if len(tags) > max_tags:
+            text += f" 외 {len(tags) - max_tags}종"
+        return f"{summary['from']:.1f}초~{summary['to']:.1f}초: 총 {summary['count']}건 ({text})"
+
+    async def _create_message(self, prompt: str, model: str):
+        """
+        속도 제한을 지키며 Claude API 호출 (429 응답 시 Retry-After 후 재시도)
+        """
+        from anthropic import RateLimitError
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            await self.rate_limiter.acquire("anthropic")
+            try:
+                # 동기 클라이언트이므로 스레드에서 실행하여 이벤트 루프 차단 방지
+                started = time.monotonic()
+                message = await loop.run_in_executor(None, lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=300,  # 비용 절감
+                    messages=[{
+                        "role": "user",
+                        "content": prompt
+                    }]
+                ))
+                elapsed = time.monotonic() - started
+                previous = self.latency.get(model)
+                self.latency[model] = elapsed if previous is None else previous * 0.8 + elapsed * 0.2
+                return message
+            except RateLimitError as e:
+                retry_after = parse_retry_after(e.response.headers.get("retry-after"))
+                self.rate_limiter.defer("anthropic", retry_after)
+                logger.warning(f"⚠️ Claude API 할당량 초과 (429) - 재시도 대기 ({attempt}/{self.MAX_ATTEMPTS})")
+
+        logger.error(f"❌ LLM 분석 실패: 할당량 초과로 {self.MAX_ATTEMPTS}회 재시도 후 포기")
+        return None
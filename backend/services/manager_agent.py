@@ -3,6 +3,7 @@ Manager Agent: 소리 분석 및 심각도 평가
 """
 import logging
 from datetime import datetime
+from typing import Dict, Optional
 from backend.models.sound_event import SoundEvent
 
 logger = logging.getLogger(__name__)
@@ -44,18 +45,19 @@ class ManagerAgent:
         """
         logger.info("Manager Agent 초기화 완료")
 
-    def calculate_severity(self, sound_event: SoundEvent) -> int:
+    def calculate_severity(self, sound_event: SoundEvent, severity_map: Optional[Dict[str, int]] = None) -> int:
         """
         소리 이벤트의 심각도를 계산합니다
 
         매개변수:
             sound_event: Cochl로부터 받은 소리 이벤트
+            severity_map: 사이트별 심각도 표 (없으면 SOUND_SEVERITY_MAP 사용)
 
         반환값:
             심각도 점수 (1-10)
         """
         # 1. 소리 종류에 따른 기본 점수 가져오기
-        base_score = self.SOUND_SEVERITY_MAP.get(
+        base_score = (severity_map or self.SOUND_SEVERITY_MAP).get(
             sound_event.tag.lower(),  # 소문자로 변환하여 매칭
             5  # 매핑되지 않은 소리는 기본값 5점
         )
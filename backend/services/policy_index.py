@@ -0,0 +1,336 @@
+"""
+사이트/장치별 정책 인덱스: 심각도 재정의, 긴급 기준 점수, 야간(조용한 시간대) 기준, 알림 대상
+
+정책 파일(JSON) 형식:
+{
+    "default": {"timezone": "Asia/Seoul"},
+    "sites": {
+        "hq": {
+            "emergency_threshold": 6,
+            "severity_overrides": {"dog_bark": 3},
+            "quiet_hours": [{"start": "22:00", "end": "06:00", "emergency_threshold": 4}],
+            "zapier_webhook_url": "https://hooks.zapier.com/hooks/catch/...",
+            "devices": {
+                "lobby-mic-1": {"severity_overrides": {"door_slam": 7}}
+            }
+        }
+    }
+}
+
+장치 설정은 사이트 설정을, 사이트 설정은 default를 덮어씁니다
+(severity_overrides는 태그 단위로 병합). 모든 조합을 불러올 때 미리 계산해
+두므로 조회는 딕셔너리 조회 한두 번으로 끝납니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8: 서버 로컬 시간 사용
+    ZoneInfo = None
+
+logger = logging.getLogger(__name__)
+
+# 정책 파일에서 사용할 수 있는 설정 키
+POLICY_KEYS = ("emergency_threshold", "severity_overrides", "quiet_hours", "zapier_webhook_url", "timezone")
+
+
+class PolicyError(Exception):
+    """정책 파일 형식이 잘못되었을 때 발생"""
+
+
+def _parse_clock(value: str) -> int:
+    """'HH:MM' → 자정 이후 분"""
+    try:
+        hour, minute = str(value).split(":")
+        minutes = int(hour) * 60 + int(minute)
+    except ValueError:
+        raise PolicyError(f"시각 형식이 잘못되었습니다 (HH:MM): {value}")
+    if not 0 <= minutes <= 24 * 60:
+        raise PolicyError(f"시각 범위가 잘못되었습니다: {value}")
+    return minutes
+
+
+class SitePolicy:
+    """사이트(+장치)에 적용되는 최종 정책 (불러올 때 미리 병합)"""
+
+    __slots__ = (
+        "site_id", "device_id", "severity_map", "emergency_threshold",
+        "quiet_hours", "timezone", "zapier_webhook_url", "zapier"
+    )
+
+    def __init__(
+        self,
+        site_id: Optional[str],
+        device_id: Optional[str],
+        severity_map: Dict[str, int],
+        emergency_threshold: int,
+        quiet_hours: List[Tuple[int, int, int]],
+        timezone=None,
+        zapier_webhook_url: Optional[str] = None,
+        zapier=None
+    ):
+        self.site_id = site_id
+        self.device_id = device_id
+        self.severity_map = severity_map
+        self.emergency_threshold = emergency_threshold
+        self.quiet_hours = quiet_hours
+        self.timezone = timezone
+        self.zapier_webhook_url = zapier_webhook_url
+        self.zapier = zapier
+
+    def threshold_at(self, now: Optional[datetime] = None) -> int:
+        """
+        지금 적용할 긴급 기준 점수
+
+        조용한 시간대(quiet_hours) 안이면 그 시간대의 기준 점수를 사용합니다.
+        (예: 야간에는 작은 소리도 긴급으로 판단하도록 기준을 낮춤)
+        """
+        if not self.quiet_hours:
+            return self.emergency_threshold
+        local = now or datetime.now(self.timezone)
+        minute = local.hour * 60 + local.minute
+        for start, end, threshold in self.quiet_hours:
+            inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+            if inside:
+                return threshold
+        return self.emergency_threshold
+
+    def describe(self) -> dict:
+        return {
+            "site_id": self.site_id,
+            "device_id": self.device_id,
+            "emergency_threshold": self.emergency_threshold,
+            "current_threshold": self.threshold_at(),
+            "quiet_hours": [
+                {"start": f"{s // 60:02d}:{s % 60:02d}", "end": f"{e // 60:02d}:{e % 60:02d}", "emergency_threshold": t}
+                for s, e, t in self.quiet_hours
+            ],
+            "timezone": str(self.timezone) if self.timezone else None,
+            "alert_destination": "site" if self.zapier_webhook_url else "default",
+            "severity_map": self.severity_map,
+        }
+
+
+class PolicyIndex:
+    """
+    (site_id, device_id) → SitePolicy 미리 계산된 인덱스
+
+    정책 파일이 바뀌면(mtime) 다시 불러오며, 새 인덱스를 모두 만든 뒤
+    한 번에 교체하므로 조회 중인 요청은 항상 완전한 정책을 봅니다.
+    파일에 오류가 있으면 기존 정책을 유지합니다.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        base_severity_map: Optional[Dict[str, int]] = None,
+        default_threshold: int = 7,
+        default_zapier=None,
+        zapier_factory: Optional[Callable[[str], object]] = None,
+        check_interval: float = 5.0
+    ):
+        """
+        매개변수:
+            path: 정책 파일 경로 (없으면 기본 정책만 사용)
+            base_severity_map: 기본 심각도 표 (ManagerAgent.SOUND_SEVERITY_MAP)
+            default_threshold: 기본 긴급 기준 점수
+            default_zapier: 기본 알림 대상 (ZapierIntegration)
+            zapier_factory: 사이트별 Webhook URL로 알림 대상을 만드는 함수
+            check_interval: 파일 변경 확인 주기 (초)
+        """
+        self.path = path
+        self.base_severity_map = {k.lower(): v for k, v in (base_severity_map or {}).items()}
+        self.default_threshold = default_threshold
+        self.default_zapier = default_zapier
+        self.zapier_factory = zapier_factory
+        self.check_interval = check_interval
+
+        # 같은 URL의 알림 대상은 재사용 (서킷 브레이커/속도 제한 상태 유지)
+        self._destinations: Dict[str, object] = {}
+        self._index: Dict[Tuple[Optional[str], Optional[str]], SitePolicy] = {}
+        self._default = self._compile(None, None, {})
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self.lookups = 0
+
+        if path:
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"❌ 정책 파일 로드 실패 (기본 정책 사용): {e}")
+
+    @property
+    def default(self) -> SitePolicy:
+        return self._default
+
+    def resolve(self, metadata: Optional[dict]) -> SitePolicy:
+        """
+        이벤트 메타데이터(site_id, device_id)로 정책 조회
+
+        장치 정책 → 사이트 정책 → 기본 정책 순으로 찾습니다.
+        """
+        self.lookups += 1
+        if not metadata:
+            return self._default
+        site_id = metadata.get("site_id")
+        if site_id is None:
+            return self._default
+        site_id = str(site_id)
+        index = self._index
+        device_id = metadata.get("device_id")
+        if device_id is not None:
+            policy = index.get((site_id, str(device_id)))
+            if policy is not None:
+                return policy
+        return index.get((site_id, None), self._default)
+
+    def reload_if_changed(self) -> bool:
+        """파일이 바뀌었으면 다시 불러옴"""
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        # 오류가 있는 파일은 다시 바뀔 때까지 재시도하지 않음
+        self._mtime = mtime
+        self.reload()
+        return True
+
+    def reload(self):
+        """
+        정책 파일을 읽어 인덱스를 새로 만든 뒤 교체
+
+        예외:
+            PolicyError / OSError / ValueError: 파일 오류 (기존 정책 유지)
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime
+            with open(self.path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            default, index = self._build(config)
+        except Exception as e:
+            self.last_error = str(e)
+            raise
+
+        self._default, self._index = default, index
+        self._mtime = mtime
+        self.loaded_at = time.time()
+        self.reloads += 1
+        self.last_error = None
+        sites = sum(1 for _, device_id in index if device_id is None)
+        logger.info(f"📋 정책 로드 완료: 사이트 {sites}개, 장치 {len(index) - sites}개")
+
+    def _build(self, config: dict):
+        if not isinstance(config, dict):
+            raise PolicyError("정책 파일 최상위는 객체여야 합니다")
+        default_config = self._layer({}, config.get("default") or {})
+        default = self._compile(None, None, default_config)
+
+        index: Dict[Tuple[Optional[str], Optional[str]], SitePolicy] = {}
+        for site_id, site in (config.get("sites") or {}).items():
+            if not isinstance(site, dict):
+                raise PolicyError(f"사이트 정책은 객체여야 합니다: {site_id}")
+            site_config = self._layer(default_config, site)
+            index[(str(site_id), None)] = self._compile(str(site_id), None, site_config)
+            for device_id, device in (site.get("devices") or {}).items():
+                if not isinstance(device, dict):
+                    raise PolicyError(f"장치 정책은 객체여야 합니다: {site_id}/{device_id}")
+                index[(str(site_id), str(device_id))] = self._compile(
+                    str(site_id), str(device_id), self._layer(site_config, device)
+                )
+        return default, index
+
+    @staticmethod
+    def _layer(base: dict, overrides: dict) -> dict:
+        """상위 설정 위에 하위 설정을 덮어씀 (severity_overrides는 태그 단위 병합)"""
+        merged = dict(base)
+        for key in POLICY_KEYS:
+            if key not in overrides:
+                continue
+            if key == "severity_overrides":
+                merged[key] = {**base.get(key, {}), **{k.lower(): v for k, v in overrides[key].items()}}
+            else:
+                merged[key] = overrides[key]
+        return merged
+
+    def _compile(self, site_id: Optional[str], device_id: Optional[str], config: dict) -> SitePolicy:
+        severity_map = {**self.base_severity_map, **config.get("severity_overrides", {})}
+        for tag, score in severity_map.items():
+            if not isinstance(score, (int, float)) or not 1 <= score <= 10:
+                raise PolicyError(f"심각도는 1-10 사이여야 합니다: {tag}={score}")
+
+        threshold = int(config.get("emergency_threshold", self.default_threshold))
+        quiet_hours = [
+            (
+                _parse_clock(item["start"]),
+                _parse_clock(item["end"]),
+                int(item.get("emergency_threshold", threshold))
+            )
+            for item in config.get("quiet_hours", [])
+        ]
+
+        timezone = None
+        if config.get("timezone") and ZoneInfo is not None:
+            try:
+                timezone = ZoneInfo(config["timezone"])
+            except Exception:
+                raise PolicyError(f"알 수 없는 시간대: {config['timezone']}")
+
+        url = config.get("zapier_webhook_url")
+        zapier = self.default_zapier
+        if url and self.zapier_factory:
+            zapier = self._destinations.get(url)
+            if zapier is None:
+                zapier = self._destinations[url] = self.zapier_factory(url)
+
+        return SitePolicy(site_id, device_id, severity_map, threshold, quiet_hours, timezone, url, zapier)
+
+    @property
+    def destinations(self) -> List[object]:
+        """지금까지 만든 사이트별 알림 대상 (종료 시 연결 정리용)"""
+        return list(self._destinations.values())
+
+    async def start(self):
+        """정책 파일 변경 감시 시작"""
+        if self.path and self._task is None:
+            self._task = asyncio.ensure_future(self._watch_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"❌ 정책 파일 다시 불러오기 실패 (기존 정책 유지): {e}")
+
+    def stats(self) -> dict:
+        sites = sum(1 for _, device_id in self._index if device_id is None)
+        return {
+            "path": self.path,
+            "sites": sites,
+            "devices": len(self._index) - sites,
+            "destinations": len(self._destinations),
+            "reloads": self.reloads,
+            "loaded_at": datetime.fromtimestamp(self.loaded_at).isoformat() if self.loaded_at else None,
+            "last_error": self.last_error,
+            "lookups": self.lookups,
+        }
@@ -0,0 +1,116 @@
+"""
+작업 결과 인덱스: 완료된 분석 결과를 페이지/필터 단위로 조회하기 위한 인덱스
+"""
+import base64
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"p:{position}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    예외:
+        ValueError: 잘못된 cursor 값
+    """
+    try:
+        prefix, _, position = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+    except Exception:
+        raise ValueError(f"잘못된 cursor 값입니다: {cursor}")
+    if prefix != "p" or not position.isdigit():
+        raise ValueError(f"잘못된 cursor 값입니다: {cursor}")
+    return int(position)
+
+
+class TaskResultIndex:
+    """
+    작업이 완료될 때 한 번 만드는 결과 인덱스
+
+    결과를 녹음 내 시작 시각 순으로 정렬한 위치(position)를 기준으로
+    태그별/긴급 이벤트 위치 목록과 필터용 값(시작 시각, 심각도)을 정수/실수
+    배열로만 보관합니다. 결과 본문은 보관하지 않으므로 결과를 디스크로
+    내린 작업도 같은 인덱스로 필요한 줄만 읽어올 수 있습니다.
+
+    cursor는 위치 기반이라 필터를 바꿔도 같은 지점부터 이어서 조회됩니다.
+    """
+
+    def __init__(self, results: Sequence[dict]):
+        order = sorted(range(len(results)), key=lambda i: (results[i]["start_time"], i))
+        # 위치 → 원래 결과 번호
+        self.order: List[int] = order
+        self.start_times: List[float] = [results[i]["start_time"] for i in order]
+        self.severities: List[int] = [results[i]["severity_score"] for i in order]
+        self.emergency_flags: List[bool] = [bool(results[i]["is_emergency"]) for i in order]
+
+        self.by_tag: Dict[str, List[int]] = {}
+        self.emergencies: List[int] = []
+        for position, i in enumerate(order):
+            self.by_tag.setdefault(results[i]["tag"].lower(), []).append(position)
+            if results[i]["is_emergency"]:
+                self.emergencies.append(position)
+
+        # 태그별 건수 (많은 순)
+        self.tag_counts: Dict[str, int] = dict(
+            sorted(((tag, len(p)) for tag, p in self.by_tag.items()), key=lambda item: -item[1])
+        )
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def query(
+        self,
+        tags: Optional[Iterable[str]] = None,
+        min_severity: Optional[int] = None,
+        since_seconds: Optional[float] = None,
+        until_seconds: Optional[float] = None,
+        emergencies_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[int], int, Optional[str]]:
+        """
+        조건에 맞는 결과 위치 조회
+
+        매개변수:
+            tags: 소리 종류 (여러 개면 그중 하나)
+            min_severity: 최소 심각도 점수
+            since_seconds / until_seconds: 녹음 내 시작 시각 범위 (초, until 미포함)
+            emergencies_only: 긴급 이벤트만
+            cursor: 이전 응답의 next_cursor
+            limit: 페이지 크기
+
+        반환값:
+            (원래 결과 번호 목록, 조건에 맞는 전체 건수, next_cursor)
+
+        예외:
+            ValueError: 잘못된 cursor 값
+        """
+        # 시간 범위 → 위치 범위
+        lo = bisect_left(self.start_times, since_seconds) if since_seconds is not None else 0
+        hi = bisect_left(self.start_times, until_seconds) if until_seconds is not None else len(self.order)
+
+        # 후보 위치 목록 (태그 목록은 위치 순으로 병합)
+        candidates: Optional[Sequence[int]] = None
+        if tags:
+            lists = [self.by_tag.get(tag.lower(), []) for tag in set(tags)]
+            candidates = lists[0] if len(lists) == 1 else list(merge(*lists))
+        elif emergencies_only:
+            candidates = self.emergencies
+
+        if candidates is None:
+            positions: Iterable[int] = range(lo, hi)
+        else:
+            positions = candidates[bisect_left(candidates, lo):bisect_left(candidates, hi)]
+
+        matched = [
+            p for p in positions
+            if (min_severity is None or self.severities[p] >= min_severity)
+            and (not emergencies_only or self.emergency_flags[p])
+        ]
+
+        start = bisect_left(matched, decode_cursor(cursor)) if cursor else 0
+        page = matched[start:start + limit]
+        next_cursor = encode_cursor(page[-1] + 1) if start + limit < len(matched) else None
+        return [self.order[p] for p in page], len(matched), next_cursor
@@ -0,0 +1,224 @@
+"""
+롤링 집계: 최근 1분/1시간/1일 동안의 태그별 건수, 긴급 비율, 최고 심각도
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 심각도 점수 범위 (ManagerAgent 기준 1-10)
+MAX_SEVERITY = 10
+
+
+class _Bucket:
+    """시간 구간 하나의 집계값"""
+
+    __slots__ = ("index", "total", "emergencies", "tags", "severities")
+
+    def __init__(self):
+        self.index = -1
+        self.total = 0
+        self.emergencies = 0
+        self.tags: Counter = Counter()
+        self.severities = [0] * (MAX_SEVERITY + 1)
+
+
+class RollingWindow:
+    """
+    고정 개수의 버킷을 원형으로 재사용하는 시간 창
+
+    누적 합계를 따로 유지하고 만료된 버킷만큼 빼므로 기록과 조회가
+    창 길이와 무관하게 상수 시간에 처리됩니다. 최고 심각도는 점수별
+    건수로 관리하여 만료 시에도 다시 계산할 필요가 없습니다.
+    """
+
+    def __init__(self, span_seconds: float, bucket_count: int):
+        self.span = span_seconds
+        self.width = span_seconds / bucket_count
+        self.buckets = [_Bucket() for _ in range(bucket_count)]
+        self.head = -1  # 가장 최근 버킷 번호
+        self.total = 0
+        self.emergencies = 0
+        self.tags: Counter = Counter()
+        self.severities = [0] * (MAX_SEVERITY + 1)
+
+    def _advance(self, now: float):
+        index = int(now // self.width)
+        if index <= self.head:
+            return
+        # 새로 들어갈 버킷 자리에 남아 있는 오래된 집계를 누적값에서 제거
+        start = max(self.head + 1, index - len(self.buckets) + 1)
+        for i in range(start, index + 1):
+            self._expire(self.buckets[i % len(self.buckets)])
+        self.head = index
+
+    def _expire(self, bucket: _Bucket):
+        if bucket.total:
+            self.total -= bucket.total
+            self.emergencies -= bucket.emergencies
+            self.tags.subtract(bucket.tags)
+            for tag in bucket.tags:
+                if self.tags[tag] <= 0:
+                    del self.tags[tag]
+            for severity, count in enumerate(bucket.severities):
+                self.severities[severity] -= count
+        bucket.index = -1
+        bucket.total = 0
+        bucket.emergencies = 0
+        bucket.tags = Counter()
+        bucket.severities = [0] * (MAX_SEVERITY + 1)
+
+    def add(self, now: float, tag: str, severity: int, is_emergency: bool):
+        self._advance(now)
+        index = int(now // self.width)
+        if index <= self.head - len(self.buckets):
+            return  # 창 밖의 오래된 이벤트
+        bucket = self.buckets[index % len(self.buckets)]
+        bucket.index = index
+        severity = max(0, min(MAX_SEVERITY, severity))
+
+        bucket.total += 1
+        bucket.tags[tag] += 1
+        bucket.severities[severity] += 1
+        self.total += 1
+        self.tags[tag] += 1
+        self.severities[severity] += 1
+        if is_emergency:
+            bucket.emergencies += 1
+            self.emergencies += 1
+
+    def snapshot(self, now: float) -> dict:
+        self._advance(now)
+        max_severity = next(
+            (s for s in range(MAX_SEVERITY, -1, -1) if self.severities[s] > 0), None
+        )
+        return {
+            "window_seconds": int(self.span),
+            "total": self.total,
+            "emergency_count": self.emergencies,
+            "emergency_rate": round(self.emergencies / self.total, 4) if self.total else 0.0,
+            "max_severity": max_severity,
+            "tags": dict(self.tags.most_common()),
+        }
+
+    def dump(self) -> dict:
+        return {
+            "head": self.head,
+            "buckets": [
+                [b.index, b.total, b.emergencies, dict(b.tags), b.severities]
+                for b in self.buckets if b.total
+            ],
+        }
+
+    def load(self, data: dict, now: float):
+        """스냅샷 복원 (창 밖으로 밀려난 버킷은 버림)"""
+        current = int(now // self.width)
+        self.head = max(current, data.get("head", -1))
+        for index, total, emergencies, tags, severities in data.get("buckets", []):
+            if index <= current - len(self.buckets) or index > current:
+                continue
+            bucket = self.buckets[index % len(self.buckets)]
+            bucket.index, bucket.total, bucket.emergencies = index, total, emergencies
+            bucket.tags = Counter(tags)
+            bucket.severities = list(severities)
+            self.total += total
+            self.emergencies += emergencies
+            self.tags.update(tags)
+            for severity, count in enumerate(severities):
+                self.severities[severity] += count
+
+
+class RollingStats:
+    """
+    대시보드용 롤링 집계 (최근 1분 / 1시간 / 1일)
+
+    이벤트가 채점될 때마다 record()로 갱신하고, 주기적으로 스냅샷을
+    파일에 저장하여 재시작 후에도 집계를 이어갑니다.
+    """
+
+    WINDOWS = {
+        "minute": (60, 60),      # 1초 버킷 60개
+        "hour": (3600, 60),      # 1분 버킷 60개
+        "day": (86400, 96),      # 15분 버킷 96개
+    }
+
+    def __init__(self, snapshot_path: Optional[str] = "data/stats_snapshot.json", snapshot_interval: float = 60):
+        """
+        롤링 집계 초기화
+
+        매개변수:
+            snapshot_path: 스냅샷 파일 경로 (None이면 저장하지 않음)
+            snapshot_interval: 스냅샷 저장 주기 (초)
+        """
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.windows: Dict[str, RollingWindow] = {
+            name: RollingWindow(span, count) for name, (span, count) in self.WINDOWS.items()
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, tag: str, severity: int, is_emergency: bool, now: Optional[float] = None):
+        """채점된 이벤트 1건 반영"""
+        now = time.time() if now is None else now
+        tag = tag.lower()
+        for window in self.windows.values():
+            window.add(now, tag, severity, is_emergency)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """창별 현재 집계"""
+        now = time.time()
+        return {name: window.snapshot(now) for name, window in self.windows.items()}
+
+    async def start(self):
+        """스냅샷 복원 후 주기적 저장 시작"""
+        self._restore()
+        if self.snapshot_path:
+            self._task = asyncio.ensure_future(self._snapshot_loop())
+
+    async def stop(self):
+        """주기적 저장 중단 후 마지막 스냅샷 저장"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.save()
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"❌ 집계 스냅샷 저장 실패: {e}")
+
+    def save(self):
+        """스냅샷 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.snapshot_path:
+            return
+        data = {
+            "saved_at": time.time(),
+            "windows": {name: window.dump() for name, window in self.windows.items()},
+        }
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _restore(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            for name, window_data in data.get("windows", {}).items():
+                if name in self.windows:
+                    self.windows[name].load(window_data, now)
+            logger.info(f"롤링 집계 스냅샷 복원: {self.snapshot_path}")
+        except Exception as e:
+            logger.error(f"❌ 집계 스냅샷 복원 실패 (빈 상태로 시작): {e}")
@@ -0,0 +1,175 @@
+"""
+샘플 파일 카탈로그: 샘플 폴더 목록과 오디오 메타데이터(형식, 길이)를 캐시
+"""
+import asyncio
+import logging
+import os
+import struct
+import wave
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_FORMATS = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+}
+
+# MPEG 오디오 프레임 헤더 표 (버전 → 비트레이트 kbps / 샘플레이트 Hz)
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],   # MPEG-1 Layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],       # MPEG-2/2.5 Layer III
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+class SampleCatalog:
+    """
+    샘플 폴더 인덱스
+
+    폴더의 수정 시각(mtime)이 바뀔 때만 다시 읽습니다. 파일 추가/삭제/이름 변경은
+    폴더 mtime을 바꾸므로 바로 반영되고, 다시 읽을 때도 크기와 mtime이 같은
+    파일은 이전에 계산한 길이를 재사용합니다.
+    같은 이름으로 내용만 덮어쓴 경우 목록의 크기/길이는 다음 폴더 변경 때 갱신됩니다
+    (파일 전송은 매번 현재 파일 상태를 사용).
+    """
+
+    def __init__(self, directory: str = "samples", url_prefix: str = "/api/v1/samples"):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._mtime_ns: Optional[int] = None
+        self._entries: Dict[str, dict] = {}
+        self._listing: List[dict] = []
+        self._lock = asyncio.Lock()
+        self.scans = 0
+
+    async def entries(self) -> List[dict]:
+        """샘플 목록 (폴더가 바뀌었으면 다시 읽음)"""
+        await self._refresh()
+        return self._listing
+
+    async def get(self, name: str) -> Optional[dict]:
+        """이름으로 샘플 조회 (목록에 없는 이름은 None, 경로 조작 방지)"""
+        await self._refresh()
+        return self._entries.get(name)
+
+    async def _refresh(self):
+        loop = asyncio.get_running_loop()
+        mtime_ns = await loop.run_in_executor(None, _dir_mtime_ns, self.directory)
+        if mtime_ns == self._mtime_ns:
+            return
+        async with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            entries = await loop.run_in_executor(None, self._scan)
+            self._entries = entries
+            self._listing = [
+                {key: value for key, value in entry.items() if key not in ("path", "mtime_ns")}
+                for entry in sorted(entries.values(), key=lambda e: e["name"])
+            ]
+            self._mtime_ns = mtime_ns
+            self.scans += 1
+            logger.info(f"🎵 샘플 목록 갱신: {len(entries)}개 ({self.directory})")
+
+    def _scan(self) -> Dict[str, dict]:
+        entries: Dict[str, dict] = {}
+        if not os.path.isdir(self.directory):
+            return entries
+        with os.scandir(self.directory) as it:
+            for item in it:
+                ext = os.path.splitext(item.name)[1].lower()
+                if ext not in SAMPLE_FORMATS or not item.is_file():
+                    continue
+                stat = item.stat()
+                previous = self._entries.get(item.name)
+                if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+                    entries[item.name] = previous
+                    continue
+                entries[item.name] = {
+                    "id": item.name.replace(".", "_"),
+                    "name": item.name,
+                    "url": f"{self.url_prefix}/{item.name}",
+                    "description": f"{item.name} 샘플 파일",
+                    "size": stat.st_size,
+                    "format": SAMPLE_FORMATS[ext],
+                    "duration_seconds": probe_duration(item.path, ext),
+                    "path": item.path,
+                    "mtime_ns": stat.st_mtime_ns
+                }
+        return entries
+
+    def stats(self) -> dict:
+        return {"directory": self.directory, "samples": len(self._entries), "scans": self.scans}
+
+
+def _dir_mtime_ns(directory: str) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def probe_duration(path: str, ext: str) -> Optional[float]:
+    """오디오 길이 (초, 알 수 없으면 None)"""
+    try:
+        if ext == ".wav":
+            with wave.open(path, "rb") as w:
+                return round(w.getnframes() / float(w.getframerate()), 3)
+        if ext == ".mp3":
+            return _mp3_duration(path)
+    except Exception as e:
+        logger.warning(f"⚠️ 샘플 길이 확인 실패: {path} - {e}")
+    return None
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    """
+    첫 프레임 헤더로 MP3 길이 계산
+
+    Xing/Info(VBR) 헤더가 있으면 프레임 수로, 없으면 고정 비트레이트로 가정하여
+    (파일 크기 - ID3 태그) / 비트레이트로 계산합니다.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(10)
+        offset = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            # ID3v2 태그 크기 (synchsafe 정수)
+            offset = 10 + ((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F))
+        f.seek(offset)
+        data = f.read(64 * 1024)
+
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            continue
+        header = _mp3_frame_header(data[i:i + 4])
+        if header is None:
+            continue
+        version, bitrate, sample_rate, mono = header
+        samples_per_frame = 1152 if version == 3 else 576
+
+        # Xing/Info 헤더 (VBR 파일의 총 프레임 수)
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        xing = i + 4 + side_info
+        if data[xing:xing + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+            if flags & 1:
+                frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+                return round(frames * samples_per_frame / sample_rate, 3)
+
+        return round((size - offset - i) * 8 / (bitrate * 1000), 3)
+    return None
+
+
+def _mp3_frame_header(header: bytes) -> Optional[Tuple[int, int, int, bool]]:
+    """(MPEG 버전 비트, 비트레이트 kbps, 샘플레이트, 모노 여부) 또는 None"""
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    mono = (header[3] >> 6) == 3
+    return version, bitrate, sample_rate, mono
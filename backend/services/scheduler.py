@@ -0,0 +1,130 @@
+"""
+우선순위 스케줄러: 실시간 긴급 이벤트와 대량 분석 작업 분리
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """작업 우선순위 클래스 (숫자가 작을수록 우선)"""
+    LIVE_EMERGENCY = 0   # 실시간 긴급 이벤트 (Webhook, 점수 >= 기준)
+    LIVE_NORMAL = 1      # 실시간 일반 이벤트
+    INTERACTIVE = 2      # 사용자 파일 업로드
+    BULK = 3             # 대량/오프라인 분석
+
+
+# 클래스별 기본 예산: (동시 작업 수, 외부 연결 수)
+# LIVE_NORMAL은 스트림 구간 분석마다 연결 1개를 Cochl 응답까지 점유하므로
+# Cochl 기본 허용 속도(600/분 = 초당 10건)에 응답 1초 안팎을 가정하여 여유 있게 잡음
+DEFAULT_BUDGETS: Dict[Priority, Tuple[int, int]] = {
+    Priority.LIVE_EMERGENCY: (16, 8),
+    Priority.LIVE_NORMAL: (16, 16),
+    Priority.INTERACTIVE: (4, 4),
+    Priority.BULK: (2, 2),
+}
+
+
+def parse_budgets(spec: str) -> Dict[Priority, Tuple[int, int]]:
+    """
+    환경 변수 문자열에서 클래스별 예산을 읽습니다
+
+    형식: "live_emergency=16:8,bulk=1:1" (지정하지 않은 클래스는 기본값 사용)
+
+    잘못된 항목은 경고만 남기고 건너뛰므로 해당 클래스는 기본값을 유지합니다
+    (오타 하나로 서버가 시작되지 않는 일이 없도록).
+    """
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        workers, _, connections = value.partition(":")
+        try:
+            priority = Priority[name.strip().upper()]
+        except KeyError:
+            logger.warning(
+                f"⚠️ SCHEDULER_BUDGETS 항목 무시: '{item}' - 알 수 없는 클래스 "
+                f"(사용 가능: {', '.join(p.name.lower() for p in Priority)})"
+            )
+            continue
+        try:
+            budget = (max(1, int(workers)), max(1, int(connections or workers)))
+        except ValueError:
+            logger.warning(
+                f"⚠️ SCHEDULER_BUDGETS 항목 무시: '{item}' - 형식은 <클래스>=<작업 수>[:<연결 수>] "
+                f"({name.strip().lower()}는 기본값 {budgets[priority][0]}:{budgets[priority][1]} 사용)"
+            )
+            continue
+        budgets[priority] = budget
+    return budgets
+
+
+class PriorityScheduler:
+    """
+    우선순위 클래스별로 독립된 작업 슬롯과 외부 연결 슬롯을 관리합니다
+
+    각 클래스는 자신만의 예산을 가지므로 대량 분석이 밀려 있어도
+    긴급 알림은 항상 비어 있는 슬롯을 사용할 수 있습니다.
+    """
+
+    def __init__(self, budgets: Optional[Dict[Priority, Tuple[int, int]]] = None):
+        """
+        스케줄러 초기화
+
+        매개변수:
+            budgets: 클래스별 (동시 작업 수, 외부 연결 수)
+        """
+        self.budgets = dict(budgets or DEFAULT_BUDGETS)
+        # 세마포어는 실행 중인 이벤트 루프에서 처음 사용할 때 생성합니다
+        self._workers: Dict[Priority, asyncio.Semaphore] = {}
+        self._connections: Dict[Priority, asyncio.Semaphore] = {}
+        self._waiting: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._running: Dict[Priority, int] = {p: 0 for p in Priority}
+
+        logger.info(
+            "우선순위 스케줄러 초기화: "
+            + ", ".join(f"{p.name.lower()}={w}:{c}" for p, (w, c) in sorted(self.budgets.items()))
+        )
+
+    def _semaphore(self, pool: Dict[Priority, asyncio.Semaphore], priority: Priority, index: int):
+        if priority not in pool:
+            pool[priority] = asyncio.Semaphore(self.budgets[priority][index])
+        return pool[priority]
+
+    @asynccontextmanager
+    async def worker(self, priority: Priority):
+        """해당 클래스의 작업 슬롯을 점유합니다"""
+        semaphore = self._semaphore(self._workers, priority, 0)
+        self._waiting[priority] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[priority] -= 1
+
+        self._running[priority] += 1
+        try:
+            yield
+        finally:
+            self._running[priority] -= 1
+            semaphore.release()
+
+    @asynccontextmanager
+    async def connection(self, priority: Priority):
+        """해당 클래스의 외부 연결 슬롯을 점유합니다 (Cochl, Zapier, Claude 호출)"""
+        async with self._semaphore(self._connections, priority, 1):
+            yield
+
+    def stats(self) -> Dict[str, dict]:
+        """클래스별 대기/실행 중인 작업 수"""
+        return {
+            p.name.lower(): {
+                "workers": self.budgets[p][0],
+                "connections": self.budgets[p][1],
+                "running": self._running[p],
+                "waiting": self._waiting[p],
+            }
+            for p in Priority
+        }
@@ -2,8 +2,11 @@
 Zapier 통합: 외부 도구 연동
 """
 import logging
-import requests
+import time
+from typing import Optional
 from backend.models.sound_event import EmergencyAlert
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.utils.rate_limiter import RateLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -13,63 +16,140 @@ class ZapierIntegration:
     Zapier Webhook을 통해 Slack, Jira 등과 연동하는 클래스
     """
 
-    def __init__(self, webhook_url: str):
+    # 429 응답 시 Retry-After 이후 재전송을 시도하는 최대 횟수
+    MAX_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        webhook_url: str,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         """
         Zapier 통합 초기화
 
         매개변수:
             webhook_url: Zapier Webhook URL
+            breaker: 서킷 브레이커 (없으면 기본 설정으로 생성)
+            rate_limiter: 공용 속도 제한기 ("zapier" 버킷 사용)
         """
         self.webhook_url = webhook_url
+        self.breaker = breaker or CircuitBreaker("zapier", slow_call_seconds=3.0)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._http = None
         logger.info(f"Zapier 통합 초기화: {webhook_url[:50]}...")
 
-    def send_alert(self, alert: EmergencyAlert) -> bool:
+    def _client(self):
+        """
+        알림/재시도마다 TCP+TLS 연결을 새로 맺지 않도록 공유하는 HTTP 클라이언트 (처음 사용 시 생성)
+        """
+        if self._http is None:
+            import httpx  # 지연 import: 서버 시작 시간 단축
+
+            self._http = httpx.AsyncClient(timeout=10.0)  # 10초 타임아웃
+        return self._http
+
+    async def aclose(self):
+        """공유 HTTP 클라이언트 종료"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def send_alert(self, alert: EmergencyAlert) -> bool:
         """
         긴급 알림을 Zapier로 전송합니다
 
+        할당량을 넘겨 429를 받으면 Retry-After만큼 기다렸다가 다시 보내므로
+        버스트 알림도 잃어버리지 않고 허용 속도에 맞춰 전달됩니다.
+
         매개변수:
             alert: 긴급 알림 데이터
 
         반환값:
             성공 여부 (True/False)
         """
-        try:
-            # 1. 알림 데이터를 JSON으로 변환
-            payload = alert.model_dump()
-
-            # 2. Zapier Webhook으로 POST 요청 전송
-            logger.info(f"Zapier로 알림 전송 시작: severity={alert.severity_score}")
-
-            response = requests.post(
-                self.webhook_url,
-                json=payload,  # JSON 형식으로 데이터 전송
-                headers={"Content-Type": "application/json"},
-                timeout=10  # 10초 타임아웃
-            )
-
-            # 3. 응답 확인
-            response.raise_for_status()  # 에러 발생시 예외 발생
-
-            # 4. 성공 로그
-            logger.info(
-                f"Zapier 알림 전송 성공: "
-                f"status_code={response.status_code}, "
-                f"response={response.text[:100]}"
-            )
-
-            return True
-
-        except requests.exceptions.Timeout:
-            # 타임아웃 에러 처리
-            logger.error("Zapier 알림 전송 실패: 타임아웃")
-            return False
-
-        except requests.exceptions.RequestException as e:
-            # 기타 네트워크 에러 처리
-            logger.error(f"Zapier 알림 전송 실패: {str(e)}")
-            return False
-
-        except Exception as e:
-            # 예상치 못한 에러 처리
-            logger.error(f"Zapier 알림 전송 중 오류 발생: {str(e)}")
-            return False
+        # 1. 알림 데이터를 JSON으로 변환
+        return await self.send_payload(alert.model_dump(), f"알림 severity={alert.severity_score}")
+
+    async def send_payload(self, payload: dict, description: str = "알림", bucket: str = "zapier") -> bool:
+        """
+        임의의 JSON 데이터를 Zapier로 전송합니다 (긴급 알림, 주기 요약 등)
+
+        속도 제한, 429 재시도, 서킷 브레이커는 send_alert와 동일하게 적용됩니다.
+
+        매개변수:
+            payload: 전송할 JSON 데이터
+            description: 로그에 표시할 설명
+            bucket: 속도 제한 버킷 (주기 요약은 긴급 알림과 토큰을 다투지 않도록 별도 버킷 사용)
+
+        반환값:
+            성공 여부 (True/False)
+        """
+        import httpx  # 지연 import: 서버 시작 시간 단축
+
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            # 속도 제한: 허용 속도에 맞춰 순서대로 전송
+            await self.rate_limiter.acquire(bucket)
+
+            # 서킷이 열려 있으면 10초 타임아웃을 기다리지 않고 즉시 실패
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                logger.error(f"Zapier 알림 전송 생략 (빠른 실패): {str(e)}")
+                return False
+
+            started = time.monotonic()
+            try:
+                # 2. Zapier Webhook으로 POST 요청 전송
+                logger.info(f"Zapier로 전송 시작: {description}")
+
+                response = await self._client().post(
+                    self.webhook_url,
+                    json=payload,  # JSON 형식으로 데이터 전송
+                    headers={"Content-Type": "application/json"}
+                )
+
+                # 할당량 초과: 장애가 아니므로 서킷에는 정상으로 기록하고 재시도
+                if response.status_code == 429:
+                    self.breaker.record_success(time.monotonic() - started)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.rate_limiter.defer(bucket, retry_after)
+                    logger.warning(
+                        f"Zapier 할당량 초과 (429) - 재시도 대기 "
+                        f"({attempt}/{self.MAX_ATTEMPTS})"
+                    )
+                    continue
+
+                # 3. 응답 확인
+                response.raise_for_status()  # 에러 발생시 예외 발생
+                self.breaker.record_success(time.monotonic() - started)
+
+                # 4. 성공 로그
+                logger.info(
+                    f"Zapier 알림 전송 성공: "
+                    f"status_code={response.status_code}, "
+                    f"response={response.text[:100]}"
+                )
+
+                return True
+
+            except httpx.TimeoutException:
+                # 타임아웃 에러 처리
+                self.breaker.record_failure(time.monotonic() - started)
+                logger.error("Zapier 알림 전송 실패: 타임아웃")
+                return False
+
+            except httpx.HTTPError as e:
+                # 기타 네트워크 에러 처리
+                self.breaker.record_failure(time.monotonic() - started)
+                logger.error(f"Zapier 알림 전송 실패: {str(e)}")
+                return False
+
+            except Exception as e:
+                # 예상치 못한 에러 처리
+                self.breaker.record_failure(time.monotonic() - started)
+                logger.error(f"Zapier 알림 전송 중 오류 발생: {str(e)}")
+                return False
+
+        logger.error(f"Zapier 알림 전송 실패: 할당량 초과로 {self.MAX_ATTEMPTS}회 재시도 후 포기")
+        return False
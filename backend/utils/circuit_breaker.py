@@ -0,0 +1,219 @@
+"""
+서킷 브레이커: 외부 의존성(Cochl, Zapier) 장애 시 빠른 실패 처리
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출을 즉시 거부했을 때 발생"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 서킷 열림 ({retry_in:.1f}초 후 재시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class LatencyTracker:
+    """최근 호출 지연시간을 고정 크기로 보관하고 백분위수를 계산합니다"""
+
+    def __init__(self, size: int = 100):
+        self._samples = deque(maxlen=size)
+
+    def add(self, latency: float):
+        self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    실패율 또는 느린 호출 비율이 기준을 넘으면 열리는 서킷 브레이커
+
+    - closed: 정상 호출, 최근 window_size개 호출 결과를 기록
+    - open: open_seconds 동안 모든 호출을 즉시 거부 (CircuitOpenError)
+    - half_open: 시험 호출을 허용하고 성공하면 닫고, 실패하면 다시 엽니다
+
+    동기 코드(스레드)와 비동기 코드 양쪽에서 사용할 수 있도록 락으로 보호합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        서킷 브레이커 초기화
+
+        매개변수:
+            name: 의존성 이름 (로그 및 /health 표시용)
+            failure_rate_threshold: 실패율이 이 값 이상이면 열림
+            slow_call_seconds: 이 시간보다 오래 걸린 호출은 느린 호출로 간주
+            slow_call_rate_threshold: 느린 호출 비율이 이 값 이상이면 열림
+            window_size: 판단에 사용할 최근 호출 수
+            min_calls: 판단에 필요한 최소 호출 수
+            open_seconds: 열린 상태 유지 시간
+            half_open_max_calls: half_open 상태에서 동시에 허용할 시험 호출 수
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.latency = LatencyTracker()
+        self._outcomes = deque(maxlen=window_size)  # (실패 여부, 느림 여부)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"🔌 {self.name} 서킷 half-open: 시험 호출 허용")
+        return self._state
+
+    def before_call(self):
+        """
+        호출 전 확인. 열려 있으면 CircuitOpenError를 발생시킵니다
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN:
+                self._rejected += 1
+                retry_in = self.open_seconds - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.name, max(0.0, retry_in))
+            if state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._half_open_calls += 1
+
+    def record_success(self, latency: float, sample: bool = True):
+        """
+        성공한 호출 기록 (느린 호출이면 느림으로 집계)
+
+        sample이 False면 지연시간 백분위수(latency)에는 넣지 않습니다
+        (요청 오류 응답, 성격이 다른 가벼운 호출 등).
+        """
+        self._record(False, latency, sample)
+
+    def record_failure(self, latency: float):
+        """실패한 호출 기록"""
+        self._record(True, latency, False)
+
+    def _record(self, failed: bool, latency: float, sample: bool):
+        slow = latency >= self.slow_call_seconds
+        if sample:
+            self.latency.add(latency)
+
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN:
+                self._half_open_calls = max(0, self._half_open_calls - 1)
+                if failed or slow:
+                    self._open("half-open 시험 호출 실패")
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"✅ {self.name} 서킷 닫힘: 정상 복구")
+                return
+
+            self._outcomes.append((failed, slow))
+            if state == CLOSED and len(self._outcomes) >= self.min_calls:
+                total = len(self._outcomes)
+                failure_rate = sum(1 for f, _ in self._outcomes if f) / total
+                slow_rate = sum(1 for _, s in self._outcomes if s) / total
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open(f"실패율 {failure_rate:.0%}")
+                elif slow_rate >= self.slow_call_rate_threshold:
+                    self._open(f"느린 호출 비율 {slow_rate:.0%}")
+
+    def _open(self, reason: str):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        logger.warning(f"🚫 {self.name} 서킷 열림 ({reason}) - {self.open_seconds:.0f}초간 빠른 실패")
+
+    async def call(self, func, *args, is_failure=None, sample: bool = True):
+        """
+        코루틴 함수를 서킷 브레이커로 감싸 실행합니다
+
+        매개변수:
+            func: 실행할 코루틴 함수
+            is_failure: 예외를 실패로 집계할지 판단하는 함수 (기본: 모든 예외)
+                실패가 아닌 예외(요청 오류 등)는 정상으로 집계하되 지연시간 표본에서는 제외
+            sample: False면 성공한 호출도 지연시간 표본에서 제외
+        """
+        self.before_call()
+        started = time.monotonic()
+        try:
+            result = await func(*args)
+        except asyncio.CancelledError:
+            # 헤지 요청 취소 등은 결과로 집계하지 않고 시험 호출 슬롯만 반환
+            with self._lock:
+                if self._state == HALF_OPEN:
+                    self._half_open_calls = max(0, self._half_open_calls - 1)
+            raise
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(time.monotonic() - started)
+            else:
+                self.record_success(time.monotonic() - started, sample=False)
+            raise
+        self.record_success(time.monotonic() - started, sample)
+        return result
+
+    def snapshot(self) -> dict:
+        """현재 상태 (/health 표시용)"""
+        with self._lock:
+            state = self._current_state()
+            total = len(self._outcomes)
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow = sum(1 for _, s in self._outcomes if s)
+            rejected = self._rejected
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "state": state,
+            "recent_calls": total,
+            "failure_rate": round(failures / total, 3) if total else 0.0,
+            "slow_call_rate": round(slow / total, 3) if total else 0.0,
+            "rejected_calls": rejected,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
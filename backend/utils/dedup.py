@@ -0,0 +1,187 @@
+"""
+중복 감지: Webhook 재전송을 event_id(또는 본문 해시) 기준으로 한 번만 처리
+"""
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+# 조회 결과
+NEW = "new"              # 처음 보는 키
+CACHED = "cached"        # 최근 처리한 키 (원본 응답 보관 중)
+IN_FLIGHT = "in_flight"  # 같은 키를 지금 처리 중
+PROBABLE = "probable"    # 응답은 만료됐지만 블룸 필터상 이미 처리한 것으로 보이는 키 (오탐 가능)
+
+
+def idempotency_key(body: dict) -> str:
+    """event_id가 있으면 그대로, 없으면 정규화한 본문의 SHA-256 해시"""
+    event_id = body.get("event_id") if isinstance(body, dict) else None
+    if event_id:
+        return f"id:{event_id}"
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 기반 블룸 필터"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.size = bits
+        self.hashes = max(1, round(bits / capacity * math.log(2)))
+        self.bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class IdempotencyCache:
+    """
+    최근 처리한 이벤트의 응답을 보관하는 고정 메모리 중복 감지기
+
+    - LRU: 최근 max_entries개 키의 원본 응답을 ttl초 동안 보관
+    - 블룸 필터 2세대: LRU에서 밀려난 키도 ttl~2*ttl 동안 '처리됨'으로 기억
+    - 처리 중인 키는 Future로 공유하여 동시에 도착한 재전송이 같은 결과를 받음
+    - 기록(저장소/집계)까지 마친 키는 응답이 5xx여도 ttl 동안 기억하여,
+      재시도가 다시 처리되더라도 같은 이벤트를 두 번 기록하지 않도록 함
+
+    블룸 필터는 오탐 가능성이 있으므로 PROBABLE 결과는 호출 측에서
+    판단하도록 따로 구분합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 600,
+        bloom_capacity: int = 500000,
+        bloom_error_rate: float = 0.0001
+    ):
+        """
+        매개변수:
+            max_entries: 응답을 보관할 최대 키 수
+            ttl: 응답 보관 시간 (초)
+            bloom_capacity: 블룸 필터 한 세대가 담을 키 수
+            bloom_error_rate: 블룸 필터 오탐률
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+
+        self._entries: "OrderedDict[str, Tuple[float, int, dict]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # 기록까지 마친 키 → 만료 시각
+        self._recorded: "OrderedDict[str, float]" = OrderedDict()
+        self._current = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._previous = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._current_count = 0
+        self._rotated_at = time.monotonic()
+
+        self.hits = 0
+        self.probable_hits = 0
+        self.misses = 0
+
+    def _rotate_bloom(self, now: float):
+        """ttl이 지나거나 용량이 차면 세대 교체 (오래된 세대는 버림)"""
+        if now - self._rotated_at >= self.ttl or self._current_count >= self.bloom_capacity:
+            self._previous = self._current
+            self._current = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            self._current_count = 0
+            self._rotated_at = now
+
+    def lookup(self, key: str):
+        """
+        키 상태 조회
+
+        반환값:
+            (상태, 값) - CACHED: (상태 코드, 응답), IN_FLIGHT: Future, 그 외: None
+        """
+        now = time.monotonic()
+        self._rotate_bloom(now)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, status_code, content = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CACHED, (status_code, content)
+            del self._entries[key]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.hits += 1
+            return IN_FLIGHT, future
+
+        if key in self._current or key in self._previous:
+            self.probable_hits += 1
+            return PROBABLE, None
+
+        self.misses += 1
+        return NEW, None
+
+    def begin(self, key: str):
+        """처리 시작 표시 (같은 키의 동시 요청은 이 결과를 기다림)"""
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+
+    def complete(self, key: str, status_code: int, content: dict):
+        """
+        처리 완료 기록
+
+        5xx 응답은 재시도가 다시 처리되어야 하므로 보관하지 않습니다.
+        """
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result((status_code, content))
+        if status_code >= 500:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, status_code, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if key not in self._current:
+            self._current.add(key)
+            self._current_count += 1
+
+    def mark_recorded(self, key: str):
+        """이벤트 기록(저장소/집계) 완료 표시"""
+        self._recorded[key] = time.monotonic() + self.ttl
+        self._recorded.move_to_end(key)
+        while len(self._recorded) > self.max_entries:
+            self._recorded.popitem(last=False)
+
+    def recorded(self, key: str) -> bool:
+        """이미 기록한 키인지 (5xx 응답 후 재시도 등)"""
+        expires_at = self._recorded.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._recorded[key]
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "recorded": len(self._recorded),
+            "hits": self.hits,
+            "probable_hits": self.probable_hits,
+            "misses": self.misses,
+            "bloom_bytes": len(self._current.bits) + len(self._previous.bits),
+        }
@@ -0,0 +1,152 @@
+"""
+파일 응답: HTTP Range(부분 요청)와 조건부 요청을 지원하며 파일을 메모리에 올리지 않고 전송
+"""
+import os
+from email.utils import formatdate
+from typing import Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from backend.utils.http_cache import etag_matches
+
+# 서버가 지원하면 커널에서 바로 전송 (ASGI zero-copy send 확장)
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+CHUNK_SIZE = 256 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """요청한 범위가 파일 크기를 벗어남 (416)"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더 → (시작, 끝) 바이트 위치 (끝 포함)
+
+    단일 범위만 지원합니다. 여러 범위를 요청하거나 형식이 잘못되면
+    None을 돌려주며, 이때는 전체 파일로 응답합니다 (RFC 9110 허용).
+
+    예외:
+        RangeNotSatisfiable: 범위가 파일 크기를 벗어남
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if not first:
+            # 뒤에서부터 N바이트 (bytes=-500)
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """
+    파일 응답
+
+    - ETag/Last-Modified/Cache-Control 헤더와 If-None-Match(304) 지원
+    - Range 요청은 206, 범위를 벗어나면 416 (If-Range가 현재 ETag와 다르면 전체 전송)
+    - 서버가 zero-copy send 확장을 지원하면 파일 디스크립터를 넘겨 커널에서 전송하고,
+      아니면 CHUNK_SIZE씩 스레드에서 읽어 전송 (파일 전체를 메모리에 올리지 않음)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        media_type: str,
+        headers: Optional[dict] = None,
+        cache_control: str = "public, max-age=3600",
+        stat_result: Optional[os.stat_result] = None
+    ):
+        self.status_code = 200
+        self.background = None
+        self.path = path
+        self.media_type = media_type
+        self.extra_headers = headers or {}
+        self.cache_control = cache_control
+        self.stat_result = stat_result
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        stat = self.stat_result or await anyio.to_thread.run_sync(os.stat, self.path)
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        request_headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": formatdate(stat.st_mtime, usegmt=True),
+            "cache-control": self.cache_control,
+            **{key.lower(): value for key, value in self.extra_headers.items()}
+        }
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            await self._start(send, 304, headers)
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        status, start, end = 200, 0, size - 1
+        if_range = request_headers.get("if-range")
+        if size > 0 and (not if_range or if_range.strip() == etag):
+            try:
+                byte_range = parse_range(request_headers.get("range"), size)
+            except RangeNotSatisfiable:
+                headers["content-range"] = f"bytes */{size}"
+                await self._start(send, 416, headers)
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if byte_range:
+                status, (start, end) = 206, byte_range
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        count = max(0, end - start + 1)
+        headers["content-type"] = self.media_type
+        headers["content-length"] = str(count)
+        await self._start(send, status, headers)
+
+        if scope.get("method") == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f.fileno(),
+                    "offset": start,
+                    "count": count,
+                    "more_body": False
+                })
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(start)
+            remaining = count
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # 전송 중 파일이 줄어든 경우 응답 종료
+            await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _start(send: Send, status: int, headers: dict):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()]
+        })
@@ -0,0 +1,162 @@
+"""
+HTTP 응답 캐시: 변하지 않는 응답을 한 번만 직렬화하고 ETag/압축본과 함께 보관
+"""
+import hashlib
+from typing import Callable, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from backend.utils import wire_formats
+
+# 이보다 작은 응답은 압축하지 않음 (압축 이득보다 헤더/CPU 비용이 큼)
+MIN_COMPRESS_SIZE = 1024
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Accept-Encoding 헤더가 해당 인코딩을 허용하는지 확인 (q=0 제외)"""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """서버가 지원하는 압축 방식 중 클라이언트가 허용하는 첫 번째 (br > gzip)"""
+    for encoding in wire_formats.available_encodings():
+        if accepts_encoding(accept_encoding, encoding):
+            return encoding
+    return None
+
+
+class CachedPayload:
+    """
+    직렬화된 응답 본문과 강한 ETag, 압축본을 보관합니다
+
+    완료된 작업처럼 더 이상 변하지 않는 응답에 사용하며, 같은 요청이
+    반복되어도 직렬화와 압축은 한 번만 수행됩니다.
+    압축본은 바이트가 다른 별도 표현이므로 ETag에 인코딩 접미사를 붙입니다
+    (예: "<해시>-gzip"). etag는 압축하지 않은 원본의 ETag입니다.
+    """
+
+    def __init__(self, body: bytes, media_type: str = wire_formats.JSON):
+        self.body = body
+        self.media_type = media_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        """압축본 (처음 요청 시 한 번만 압축)"""
+        if encoding not in self._encoded:
+            self._encoded[encoding] = wire_formats.compress(self.body, encoding)
+        return self._encoded[encoding]
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """인코딩별 ETag (원본은 etag 그대로)"""
+        if not encoding:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    @property
+    def size(self) -> int:
+        """보관 중인 바이트 수 (원본 + 압축본)"""
+        return len(self.body) + sum(len(b) for b in self._encoded.values())
+
+    def respond(self, request: Request, cache_control: str = "private, max-age=0, must-revalidate") -> Response:
+        """
+        조건부 요청이면 304, 아니면 클라이언트가 허용하는 인코딩으로 본문 응답
+        """
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if len(self.body) < MIN_COMPRESS_SIZE:
+            encoding = None
+        etag = self.etag_for(encoding)
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept, Accept-Encoding"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        body = self.body
+        if encoding:
+            body = self.encoded(encoding)
+            headers["Content-Encoding"] = encoding
+
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class CachedResource:
+    """
+    하나의 응답 내용을 형식(JSON / MessagePack / NDJSON)별로 한 번씩 직렬화하여 보관
+
+    형식마다 본문이 다르므로 ETag도 형식별로 따로 계산됩니다.
+    """
+
+    def __init__(self, content: dict, ndjson_records: Optional[Callable[[dict], Iterable]] = None):
+        """
+        매개변수:
+            content: 응답 내용
+            ndjson_records: NDJSON 응답 시 내용을 줄 단위 레코드로 나누는 함수
+        """
+        self.content = content
+        self.ndjson_records = ndjson_records or (lambda content: [content])
+        self._payloads: Dict[str, CachedPayload] = {}
+
+    def representation(self, media_type: str) -> CachedPayload:
+        if media_type not in self._payloads:
+            if media_type == wire_formats.NDJSON:
+                body = wire_formats.encode_ndjson(self.ndjson_records(self.content))
+            else:
+                body = wire_formats.encode(self.content, media_type)
+            self._payloads[media_type] = CachedPayload(body, media_type)
+        return self._payloads[media_type]
+
+    @property
+    def size(self) -> int:
+        return sum(payload.size for payload in self._payloads.values())
+
+    def respond(self, request: Request) -> Response:
+        """Accept 헤더에 맞는 형식으로 응답"""
+        media_type = wire_formats.negotiate(request.headers.get("accept"))
+        return self.representation(media_type).respond(request)
+
+
+def render(
+    content,
+    request: Request,
+    status_code: int = 200,
+    ndjson_records: Optional[Callable[[dict], Iterable]] = None
+) -> Response:
+    """
+    캐시하지 않는 응답을 Accept 헤더에 맞는 형식으로 직렬화 (진행 중인 작업, Webhook 응답 등)
+    """
+    media_type = wire_formats.negotiate(request.headers.get("accept"))
+    if media_type == wire_formats.NDJSON:
+        records = ndjson_records(content) if ndjson_records else (content if isinstance(content, list) else [content])
+        body = wire_formats.encode_ndjson(records)
+    else:
+        body = wire_formats.encode(content, media_type)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= MIN_COMPRESS_SIZE:
+        body = wire_formats.compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,132 @@
+"""
+지연 생성 서비스: 처음 사용하거나 시작 후 백그라운드 준비 단계에서 생성
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyService:
+    """
+    서비스 객체를 대신하는 프록시
+
+    속성에 처음 접근할 때 factory로 실제 객체를 만들고 이후에는 그대로
+    전달합니다. 서버는 무거운 클라이언트가 준비되기 전에도 요청을 받을 수 있습니다.
+
+    이벤트 루프에서는 await aget()(또는 resolve())으로 실제 객체를 받아 사용하세요.
+    get()/속성 접근은 생성이 끝날 때까지 스레드 잠금을 기다리므로, 루프에서
+    호출하면 warm_up()이 생성하는 동안 루프 전체(Webhook 포함)가 멈춥니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], object]):
+        """
+        매개변수:
+            name: 서비스 이름 (로그 및 시작 보고서용)
+            factory: 실제 객체를 만드는 함수
+        """
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        # 루프에서 진행 중인 생성 작업 (warm_up과 aget이 함께 기다림)
+        self._pending: Optional[asyncio.Future] = None
+        self.init_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._instance is not None
+
+    def get(self):
+        """실제 객체 반환 (없으면 생성, 스레드/동기 코드용)"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    try:
+                        self._instance = self._factory()
+                    except Exception as e:
+                        self.error = str(e)
+                        logger.error(f"❌ {self._name} 초기화 실패: {e}", exc_info=True)
+                        raise
+                    self.init_seconds = time.perf_counter() - started
+                    self.error = None
+                    logger.info(f"✅ {self._name} 준비 완료 ({self.init_seconds * 1000:.0f}ms)")
+        return self._instance
+
+    async def aget(self):
+        """
+        실제 객체 반환 (이벤트 루프용)
+
+        아직 없으면 스레드에서 생성하고 그동안 루프는 다른 요청을 처리합니다.
+        생성 중이면 같은 작업을 기다리며, 실패하면 다음 호출 때 다시 시도합니다.
+        """
+        if self._instance is not None:
+            return self._instance
+        loop = asyncio.get_running_loop()
+        if self._pending is None or self._pending.done() or self._pending.get_loop() is not loop:
+            self._pending = loop.run_in_executor(None, self.get)
+        # 기다리던 요청이 취소되어도 다른 대기자가 쓰는 생성 작업은 유지
+        return await asyncio.shield(self._pending)
+
+    async def warm_up(self):
+        """이벤트 루프를 막지 않도록 스레드에서 미리 생성 (실패해도 서버는 계속 동작)"""
+        try:
+            await self.aget()
+        except Exception:
+            pass
+
+    def __getattr__(self, item):
+        return getattr(self.get(), item)
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "ready": self.ready,
+            "init_ms": round(self.init_seconds * 1000, 1) if self.init_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+async def resolve(service):
+    """LazyService면 실제 객체를 기다려 반환, 아니면 그대로 반환 (워커는 실제 객체를 바로 전달)"""
+    if isinstance(service, LazyService):
+        return await service.aget()
+    return service
+
+
+class StartupReport:
+    """모듈 import 및 시작 단계별 소요 시간 기록"""
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        매개변수:
+            started: 측정 시작 시각 (time.perf_counter 값, 없으면 지금)
+        """
+        self._started = started if started is not None else time.perf_counter()
+        self._last = self._started
+        self.phases: Dict[str, float] = {}
+        self.services: Dict[str, LazyService] = {}
+
+    def mark(self, phase: str):
+        """직전 mark 이후 경과 시간을 phase 이름으로 기록"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def track(self, service: Optional[LazyService]):
+        if service is not None:
+            self.services[service._name] = service
+
+    def snapshot(self) -> dict:
+        return {
+            "phases_ms": {name: round(sec * 1000, 1) for name, sec in self.phases.items()},
+            "services": {name: service.status() for name, service in self.services.items()},
+        }
+
+    def log(self):
+        phases = ", ".join(f"{name}={sec * 1000:.0f}ms" for name, sec in self.phases.items())
+        logger.info(f"⏱️ 시작 시간 보고: {phases}")
@@ -0,0 +1,153 @@
+"""
+이벤트 루프 감시: 스케줄링 지연을 계속 측정하고, 루프가 멈추면 멈춘 지점의 스택을 기록
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Optional
+
+from backend.utils.circuit_breaker import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    이벤트 루프 지연 측정 + 블로킹 호출 감지
+
+    루프 안의 작업은 interval마다 깨어나 예약 시각보다 늦은 만큼을 지연으로
+    기록하고 마지막 실행 시각(heartbeat)을 갱신합니다. 별도 감시 스레드는
+    heartbeat가 stall_seconds 이상 멈추면 그 순간 루프 스레드의 스택을
+    sys._current_frames()로 가져와 기록합니다. 루프가 멈춰 있는 동안 잡은
+    스택이므로 블로킹 중인 코루틴/콜백의 위치가 그대로 남습니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        stall_seconds: float = 0.25,
+        window: int = 3000,
+        max_reports: int = 20
+    ):
+        """
+        매개변수:
+            interval: 지연 측정 간격 (초)
+            stall_seconds: 이 시간 이상 루프가 응답하지 않으면 멈춤으로 보고
+            window: 백분위수 계산에 쓰는 최근 측정 수 (기본 3000 = 약 5분)
+            max_reports: 보관할 최근 멈춤 보고 수
+        """
+        self.interval = interval
+        self.stall_seconds = stall_seconds
+        self.lag = LatencyTracker(window)
+        self.reports: Deque[dict] = deque(maxlen=max_reports)
+        self.current_lag = 0.0
+        self.stalls = 0
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._active_report: Optional[dict] = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"⏱️ 이벤트 루프 감시 시작 (멈춤 기준 {self.stall_seconds * 1000:.0f}ms)")
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _measure(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.current_lag = max(0.0, now - expected)
+            self.lag.add(self.current_lag)
+            self._heartbeat = now
+
+    def _watch(self):
+        """감시 스레드: heartbeat가 멈추면 루프 스레드 스택 기록"""
+        while not self._stopped.wait(self.stall_seconds / 2):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            report = self._active_report
+            if stalled >= self.stall_seconds:
+                if report is None:
+                    self._active_report = self._capture(stalled)
+                else:
+                    report["duration_ms"] = round(stalled * 1000, 1)
+            elif report is not None:
+                # 루프가 다시 돌기 시작함
+                self._active_report = None
+                logger.warning(
+                    f"🐢 이벤트 루프 멈춤 종료: 약 {report['duration_ms']:.0f}ms 이상 차단 "
+                    f"({report['location']})"
+                )
+
+    def _capture(self, stalled: float) -> dict:
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        location = _location(frame) if frame is not None else "알 수 없음"
+        report = {
+            "detected_at": time.time(),
+            "duration_ms": round(stalled * 1000, 1),
+            "location": location,
+            "stack": "".join(stack[-30:])
+        }
+        self.reports.append(report)
+        self.stalls += 1
+        logger.warning(
+            f"🐢 이벤트 루프 멈춤 감지: {stalled * 1000:.0f}ms 동안 응답 없음 - {location}\n{report['stack']}"
+        )
+        return report
+
+    def recent_stalls(self) -> list:
+        """최근 멈춤 보고 (스택 포함)"""
+        return list(self.reports)
+
+    def stats(self) -> dict:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "lag_ms": ms(self.current_lag),
+            "lag_p50_ms": ms(self.lag.percentile(50)),
+            "lag_p95_ms": ms(self.lag.percentile(95)),
+            "lag_p99_ms": ms(self.lag.percentile(99)),
+            "lag_max_ms": ms(self.lag.percentile(100)),
+            "samples": len(self.lag),
+            "stall_threshold_ms": ms(self.stall_seconds),
+            "stalls": self.stalls,
+            "recent_stalls": [
+                {key: value for key, value in report.items() if key != "stack"} for report in self.reports
+            ]
+        }
+
+
+def _location(frame) -> str:
+    """블로킹 지점: 스택에서 가장 안쪽의 프로젝트 코드 (없으면 가장 안쪽 프레임)"""
+    innermost = frame
+    while frame is not None:
+        if "/backend/" in frame.f_code.co_filename.replace("\\", "/"):
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    return f"{frame.f_code.co_filename}:{frame.f_lineno} ({frame.f_code.co_name})"
@@ -0,0 +1,154 @@
+"""
+메모리 예산: 처리 중인 업로드와 보관 중인 결과가 사용하는 메모리를 프로세스 전체에서 집계
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBudgetExceeded(Exception):
+    """대기 시간 안에 필요한 메모리를 확보하지 못했을 때 발생"""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Reservation:
+    """확보한 메모리 (release()는 여러 번 호출해도 한 번만 반납)"""
+
+    __slots__ = ("budget", "nbytes", "label")
+
+    def __init__(self, budget: "MemoryBudget", nbytes: int, label: str):
+        self.budget = budget
+        self.nbytes = nbytes
+        self.label = label
+
+    def release(self):
+        if self.nbytes:
+            nbytes, self.nbytes = self.nbytes, 0
+            self.budget._release(nbytes, self.label)
+
+
+class MemoryBudget:
+    """
+    바이트 단위 메모리 예산
+
+    reserve()는 예산이 부족하면 먼저 요청한 순서대로 대기하고 (큰 요청이
+    작은 요청에 계속 밀리지 않도록 FIFO), timeout 안에 확보하지 못하면
+    MemoryBudgetExceeded를 발생시킵니다.
+    """
+
+    def __init__(self, limit_bytes: int):
+        """
+        매개변수:
+            limit_bytes: 전체 예산 (바이트)
+        """
+        self.limit_bytes = limit_bytes
+        self.used_bytes = 0
+        self.peak_bytes = 0
+        self._by_label: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[int, str, asyncio.Future]] = deque()
+
+        self.reserved = 0
+        self.queued = 0
+        self.refused = 0
+
+    @property
+    def available_bytes(self) -> int:
+        return max(0, self.limit_bytes - self.used_bytes)
+
+    def used_by(self, label: str) -> int:
+        """용도(label)별 사용량 (바이트)"""
+        return self._by_label.get(label, 0)
+
+    def try_reserve(self, nbytes: int, label: str) -> Optional[Reservation]:
+        """기다리지 않고 확보 (부족하거나 대기 중인 요청이 있으면 None)"""
+        if self._waiters or nbytes > self.available_bytes:
+            return None
+        return self._grant(nbytes, label)
+
+    async def reserve(self, nbytes: int, timeout: float, label: str) -> Reservation:
+        """
+        메모리 확보 (부족하면 최대 timeout초 대기)
+
+        예외:
+            MemoryBudgetExceeded: 예산보다 큰 요청이거나 대기 시간 초과
+        """
+        if nbytes > self.limit_bytes:
+            self.refused += 1
+            raise MemoryBudgetExceeded(f"요청 크기({nbytes} bytes)가 메모리 예산({self.limit_bytes} bytes)보다 큽니다")
+
+        reservation = self.try_reserve(nbytes, label)
+        if reservation is not None:
+            return reservation
+        if timeout <= 0:
+            self.refused += 1
+            raise MemoryBudgetExceeded("메모리 예산이 부족합니다")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (nbytes, label, future)
+        self._waiters.append(entry)
+        self.queued += 1
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except BaseException as e:
+            if entry in self._waiters:
+                # 맨 앞 요청이 빠지면 뒤의 작은 요청은 확보 가능할 수 있음
+                self._waiters.remove(entry)
+                self._wake()
+            elif future.done() and not future.cancelled():
+                # 확보 직후 시간 초과/취소된 경우 반납
+                future.result().release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.refused += 1
+                raise MemoryBudgetExceeded(f"{timeout:g}초 안에 메모리를 확보하지 못했습니다", retry_after=timeout)
+            raise
+
+    def charge(self, nbytes: int, label: str) -> Reservation:
+        """
+        예산과 관계없이 사용량에 반영 (이미 메모리에 있는 데이터 집계용)
+
+        예산을 넘은 상태에서는 새 reserve() 요청이 반납될 때까지 대기합니다.
+        """
+        return self._grant(nbytes, label)
+
+    def _grant(self, nbytes: int, label: str) -> Reservation:
+        self.used_bytes += nbytes
+        self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+        self._by_label[label] = self._by_label.get(label, 0) + nbytes
+        self.reserved += 1
+        return Reservation(self, nbytes, label)
+
+    def _release(self, nbytes: int, label: str):
+        self.used_bytes -= nbytes
+        self._by_label[label] = self._by_label.get(label, 0) - nbytes
+        self._wake()
+
+    def _wake(self):
+        """대기 중인 요청을 순서대로, 예산이 허락하는 만큼 깨움"""
+        while self._waiters:
+            nbytes, label, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if nbytes > self.available_bytes:
+                return
+            self._waiters.popleft()
+            future.set_result(self._grant(nbytes, label))
+
+    def stats(self) -> dict:
+        return {
+            "limit_bytes": self.limit_bytes,
+            "used_bytes": self.used_bytes,
+            "available_bytes": self.available_bytes,
+            "peak_bytes": self.peak_bytes,
+            "used_by": dict(self._by_label),
+            "waiting": len(self._waiters),
+            "reserved": self.reserved,
+            "queued": self.queued,
+            "refused": self.refused,
+        }
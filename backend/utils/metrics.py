@@ -0,0 +1,33 @@
+"""
+지표 레지스트리: 각 서비스가 등록한 지표를 /metrics 엔드포인트로 노출
+"""
+import logging
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# 지표 이름 -> 현재 값을 딕셔너리로 반환하는 함수
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, provider: Callable[[], dict]):
+    """
+    지표 제공 함수 등록 (같은 이름으로 다시 등록하면 교체)
+
+    매개변수:
+        name: 지표 그룹 이름 (예: "rate_limiter")
+        provider: 호출 시 현재 지표를 반환하는 함수
+    """
+    _providers[name] = provider
+
+
+def collect() -> Dict[str, dict]:
+    """등록된 모든 지표 수집 (실패한 항목은 에러 메시지로 대체)"""
+    snapshot = {}
+    for name, provider in list(_providers.items()):
+        try:
+            snapshot[name] = provider()
+        except Exception as e:
+            logger.error(f"지표 수집 실패: {name} - {e}")
+            snapshot[name] = {"error": str(e)}
+    return snapshot
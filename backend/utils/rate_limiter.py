@@ -0,0 +1,162 @@
+"""
+토큰 버킷 기반 비동기 속도 제한기 (Zapier, Claude API 할당량 준수)
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from backend.utils.circuit_breaker import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 값을 초 단위로 변환합니다 (초 또는 HTTP 날짜 형식)
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰이 채워지고 최대 burst개까지 쌓이는 버킷
+
+    대기자는 도착 순서대로 한 명씩 토큰을 기다리므로 버스트가
+    허용 속도에 맞춰 고르게 풀려 나갑니다.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+        # 지표
+        self.waiting = 0
+        self.acquired = 0
+        self.deferrals = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_times = LatencyTracker(size=500)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _delay(self, now: float) -> float:
+        """토큰 1개를 얻기까지 남은 시간"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> float:
+        """토큰 1개를 얻을 때까지 기다리고 대기 시간을 반환합니다"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._delay(time.monotonic())
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                self.tokens -= 1
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.wait_times.add(waited)
+        return waited
+
+    def defer(self, seconds: float):
+        """
+        서버가 429와 Retry-After를 돌려주면 그 시간 동안 토큰 발급을 멈춥니다
+        """
+        self.deferrals += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+
+    def stats(self) -> dict:
+        p95 = self.wait_times.percentile(95)
+        return {
+            "rate_per_second": round(self.rate, 3),
+            "burst": self.capacity,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "deferrals": self.deferrals,
+            "wait_seconds_total": round(self.total_wait, 3),
+            "wait_seconds_avg": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "wait_seconds_p95": round(p95, 4) if p95 is not None else None,
+            "wait_seconds_max": round(self.max_wait, 4),
+        }
+
+
+class RateLimiter:
+    """
+    의존성별 토큰 버킷을 관리하는 공용 속도 제한기
+
+    사용 예:
+        limiter.configure("zapier", rate_per_minute=300, burst=10)
+        await limiter.acquire("zapier")
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, key: str, rate_per_minute: float, burst: int = 1):
+        """의존성별 허용 속도 설정"""
+        self._buckets[key] = TokenBucket(rate_per_minute / 60.0, burst)
+        logger.info(f"속도 제한 설정: {key}={rate_per_minute:g}/분 (burst={burst})")
+
+    async def acquire(self, key: str) -> float:
+        """
+        토큰을 얻을 때까지 대기 (설정되지 않은 키는 바로 통과)
+
+        반환값:
+            대기한 시간 (초)
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire()
+        if waited > 1.0:
+            logger.info(f"⏳ {key} 속도 제한 대기: {waited:.2f}초")
+        return waited
+
+    def defer(self, key: str, retry_after: Optional[float], default: float = 1.0):
+        """Retry-After(초)만큼 해당 의존성 호출을 멈춥니다"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        seconds = retry_after if retry_after is not None else default
+        bucket.defer(seconds)
+        logger.warning(f"🐢 {key} 429 응답 - {seconds:.1f}초 후 재개")
+
+    def stats(self) -> Dict[str, dict]:
+        """의존성별 대기 시간 지표"""
+        return {key: bucket.stats() for key, bucket in self._buckets.items()}
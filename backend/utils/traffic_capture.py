@@ -0,0 +1,110 @@
+"""
+트래픽 기록: 수신한 Webhook 본문과 업로드 메타데이터를 시각과 함께 JSONL 파일로 저장
+
+기록한 파일은 scripts/replay_traffic.py로 원래 도착 간격 그대로 다시 보낼 수 있습니다.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TrafficRecorder:
+    """
+    요청 경로에서는 메모리에 한 줄씩 쌓기만 하고, 파일 쓰기는 주기적으로
+    스레드에서 모아서 처리합니다. 파일이 max_bytes를 넘으면 기록을 멈춥니다.
+
+    레코드 형식 (한 줄에 하나):
+        {"ts": 1700000000.123, "kind": "webhook", "content_type": "...", "content_encoding": null, "body": {...}}
+        {"ts": 1700000001.456, "kind": "upload", "filename": "...", "size": 1234, ...}
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, flush_interval: float = 0.5):
+        """
+        매개변수:
+            path: 기록 파일 경로 (JSONL, 이어서 기록)
+            max_bytes: 파일 최대 크기 (넘으면 기록 중단)
+            flush_interval: 파일 쓰기 주기 (초)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+
+        self._pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self._written = os.path.getsize(path) if os.path.exists(path) else 0
+        self.full = self._written >= max_bytes
+
+        self.recorded = 0
+        self.skipped = 0
+
+    def record(self, kind: str, **fields):
+        """레코드 1건 추가 (직렬화할 수 없는 값은 문자열로 기록)"""
+        if self.full:
+            self.skipped += 1
+            return
+        self._pending.append(json.dumps({"ts": time.time(), "kind": kind, **fields}, ensure_ascii=False, default=str))
+        self.recorded += 1
+
+    def record_webhook(self, body, content_type: Optional[str], content_encoding: Optional[str]):
+        """해석한 Webhook 본문 기록 (재생 시 같은 형식/압축으로 다시 인코딩)"""
+        self.record("webhook", content_type=content_type, content_encoding=content_encoding, body=body)
+
+    def record_raw_webhook(self, raw: bytes, content_type: Optional[str], content_encoding: Optional[str]):
+        """해석하지 못한 Webhook 본문은 원본 바이트 그대로 기록"""
+        self.record(
+            "webhook", content_type=content_type, content_encoding=content_encoding,
+            raw_b64=base64.b64encode(raw).decode("ascii")
+        )
+
+    async def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._task = asyncio.ensure_future(self._flush_loop())
+        logger.info(f"🎥 트래픽 기록 시작: {self.path}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        await asyncio.get_running_loop().run_in_executor(None, self._write, lines)
+
+    def _write(self, lines: List[str]):
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+        self._written += len(data)
+        if self._written >= self.max_bytes and not self.full:
+            self.full = True
+            logger.warning(f"⚠️ 트래픽 기록 파일이 최대 크기에 도달하여 기록을 중단합니다: {self.path}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ 트래픽 기록 실패: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "pending": len(self._pending),
+            "bytes": self._written,
+            "full": self.full,
+        }
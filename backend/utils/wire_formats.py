@@ -0,0 +1,194 @@
+"""
+전송 형식: JSON / MessagePack / NDJSON 인코딩과 gzip/brotli 압축 처리
+"""
+import gzip
+import json
+import zlib
+from typing import Iterable, List, Optional
+
+# 선택 의존성: 설치되어 있지 않으면 해당 형식만 비활성화됩니다
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 요청 본문 brotli 해제는 출력 크기 제한(output_buffer_limit, brotli>=1.2)이 있을 때만 허용
+# (1.1 이하는 입력 1KB만으로도 수백 MB가 한 번에 풀릴 수 있음)
+BROTLI_BOUNDED = brotli is not None and hasattr(brotli.Decompressor(), "can_accept_more_data")
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+NDJSON = "application/x-ndjson"
+
+# 압축 해제 후 허용하는 최대 본문 크기 기본값 (압축 폭탄 방지)
+MAX_DECOMPRESSED_SIZE = 10 * 1024 * 1024
+
+# 클라이언트가 보낼 수 있는 동의어
+_MEDIA_ALIASES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+
+class UnsupportedFormat(Exception):
+    """요청한 형식/인코딩을 처리할 수 없을 때 발생"""
+
+
+class PayloadTooLarge(Exception):
+    """압축 해제한 본문이 허용 크기를 넘을 때 발생"""
+
+
+def normalize_media_type(content_type: Optional[str]) -> str:
+    """Content-Type 헤더에서 지원하는 미디어 타입 추출 (알 수 없으면 JSON으로 간주)"""
+    if not content_type:
+        return JSON
+    media = content_type.split(";")[0].strip().lower()
+    return _MEDIA_ALIASES.get(media, JSON)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Accept 헤더로 응답 형식 결정 (q 값이 가장 높은 지원 형식, 기본 JSON)
+    """
+    if not accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for item in accept.split(","):
+        media, _, params = item.strip().partition(";")
+        media = _MEDIA_ALIASES.get(media.strip().lower())
+        if media is None or (media == MSGPACK and msgpack is None):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media, q
+    return best
+
+
+def available_encodings() -> List[str]:
+    """서버가 지원하는 압축 방식 (선호 순서)"""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def encode(content, media_type: str) -> bytes:
+    """단일 문서 직렬화 (NDJSON은 encode_ndjson 사용)"""
+    if media_type == MSGPACK:
+        if msgpack is None:
+            raise UnsupportedFormat("msgpack 패키지가 설치되어 있지 않습니다")
+        return msgpack.packb(content, use_bin_type=True)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_ndjson(records: Iterable) -> bytes:
+    """레코드마다 한 줄씩 JSON으로 직렬화"""
+    return b"".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        for record in records
+    )
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        if brotli is None:
+            raise UnsupportedFormat("brotli 패키지가 설치되어 있지 않습니다")
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    raise UnsupportedFormat(f"지원하지 않는 압축 방식: {encoding}")
+
+
+def decompress(body: bytes, content_encoding: Optional[str], max_size: int = MAX_DECOMPRESSED_SIZE) -> bytes:
+    """
+    Content-Encoding 헤더에 따라 요청 본문 압축 해제
+
+    출력 크기를 제한하며 조금씩 풀기 때문에, 작은 압축 본문이 아주 크게
+    풀리는 경우에도 max_size + 1바이트 이상은 메모리에 만들지 않습니다.
+
+    예외:
+        PayloadTooLarge: 풀린 크기가 max_size를 넘음
+        UnsupportedFormat: 지원하지 않는 압축 방식
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        return _gunzip(body, max_size)
+    if encoding == "br":
+        if brotli is None:
+            raise UnsupportedFormat("brotli 패키지가 설치되어 있지 않습니다")
+        if not BROTLI_BOUNDED:
+            raise UnsupportedFormat("설치된 brotli가 출력 크기 제한을 지원하지 않아 br 본문을 받지 않습니다 (brotli>=1.2 필요)")
+        return _unbrotli(body, max_size)
+    raise UnsupportedFormat(f"지원하지 않는 압축 방식: {encoding}")
+
+
+def _too_large(max_size: int) -> PayloadTooLarge:
+    return PayloadTooLarge(f"압축 해제한 본문이 {max_size} bytes를 넘습니다")
+
+
+def _gunzip(body: bytes, max_size: int) -> bytes:
+    """gzip 해제 (여러 멤버를 이어 붙인 본문 포함)"""
+    output = bytearray()
+    data = body
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    while True:
+        # max_length가 0이면 제한 없음이므로 항상 1 이상
+        output += decompressor.decompress(data, max_size + 1 - len(output))
+        if len(output) > max_size:
+            raise _too_large(max_size)
+        if decompressor.eof:
+            data = decompressor.unused_data
+            if not data.strip(b"\x00"):
+                return bytes(output)
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            continue
+        data = decompressor.unconsumed_tail
+        if not data:
+            raise EOFError("gzip 본문이 끝나기 전에 잘렸습니다")
+
+
+def _unbrotli(body: bytes, max_size: int) -> bytes:
+    decompressor = brotli.Decompressor()
+    output = bytearray()
+    output += decompressor.process(body, output_buffer_limit=max_size + 1)
+    while len(output) <= max_size and not decompressor.can_accept_more_data():
+        output += decompressor.process(b"", output_buffer_limit=max_size + 1 - len(output))
+    if len(output) > max_size:
+        raise _too_large(max_size)
+    if not decompressor.is_finished():
+        raise EOFError("brotli 본문이 끝나기 전에 잘렸습니다")
+    return bytes(output)
+
+
+def decode(body: bytes, media_type: str):
+    """
+    요청 본문 역직렬화
+
+    반환값:
+        JSON/MessagePack은 문서 그대로, NDJSON은 레코드 리스트
+    """
+    if media_type == MSGPACK:
+        if msgpack is None:
+            raise UnsupportedFormat("msgpack 패키지가 설치되어 있지 않습니다")
+        return msgpack.unpackb(body, raw=False)
+    if media_type == NDJSON:
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    return json.loads(body)
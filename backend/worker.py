@@ -0,0 +1,290 @@
+"""
+분석 워커: 영속 작업 대기열(JOB_QUEUE_PATH)에서 업로드 분석 작업을 가져와 처리
+
+웹 서버는 ANALYSIS_QUEUE=true일 때 업로드를 대기열에 등록만 하고,
+이 워커가 Cochl 분석 → 채점 → LLM 해석을 별도 프로세스에서 수행합니다.
+웹 서버와 같은 .env 설정, 같은 디스크(업로드 폴더/대기열 DB)를 사용해야 합니다.
+
+사용법:
+    python -m backend.worker                  # 워커 프로세스 1개
+    python -m backend.worker --workers 4      # 워커 프로세스 4개
+    python -m backend.worker --workers 4 --concurrency 2   # 프로세스당 동시 작업 2개
+
+종료(Ctrl+C / SIGTERM) 시 새 작업을 받지 않고, 처리 중인 작업은 grace 시간 안에
+끝나지 않으면 다른 워커가 이어받도록 대기열로 돌려보냅니다.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from backend.services.analysis import analyze_detections
+from backend.services.cochl_api import CochlAPIClient, MockCochlAPIClient
+from backend.services.cochl_poller import CochlJobPoller
+from backend.services.job_queue import JobQueue
+from backend.services.llm_analyzer import LLMAnalyzer
+from backend.services.manager_agent import ManagerAgent
+from backend.services.policy_index import PolicyIndex
+from backend.utils.circuit_breaker import CircuitBreaker
+from backend.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger("backend.worker")
+
+
+class AnalysisWorker:
+    """워커 프로세스 하나 (동시에 concurrency개의 작업 처리)"""
+
+    def __init__(self, index: int, concurrency: int, grace_seconds: float, idle_seconds: float):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        self.concurrency = concurrency
+        self.grace_seconds = grace_seconds
+        self.idle_seconds = idle_seconds
+        self.stopping: Optional[asyncio.Event] = None
+        self.processed = 0
+        self.failed = 0
+
+        emergency_threshold = int(os.getenv("EMERGENCY_THRESHOLD", "7"))
+        self.merge_gap_seconds = float(os.getenv("DETECTION_MERGE_GAP_SECONDS", "1.0"))
+
+        self.queue = JobQueue(
+            os.getenv("JOB_QUEUE_PATH", "data/jobs.db"),
+            lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "60")),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        )
+
+        # 외부 API 설정은 웹 서버와 같은 환경 변수 사용 (속도 제한은 프로세스별로 적용됨)
+        rate_limiter = RateLimiter()
+        rate_limiter.configure(
+            "cochl", float(os.getenv("COCHL_RATE_PER_MINUTE", "600")), int(os.getenv("COCHL_BURST", "20"))
+        )
+        rate_limiter.configure(
+            "anthropic", float(os.getenv("ANTHROPIC_RATE_PER_MINUTE", "50")), int(os.getenv("ANTHROPIC_BURST", "5"))
+        )
+        cochl_api_key = os.getenv("COCHL_API_KEY", "")
+        if cochl_api_key:
+            self.cochl_client = CochlAPIClient(
+                cochl_api_key,
+                os.getenv("COCHL_API_URL", "https://api.cochl.ai/v1"),
+                breaker=CircuitBreaker(
+                    "cochl",
+                    slow_call_seconds=float(os.getenv("COCHL_SLOW_CALL_SECONDS", "20")),
+                    open_seconds=float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+                ),
+                hedge_enabled=os.getenv("COCHL_HEDGE_ENABLED", "false").lower() == "true",
+                rate_limiter=rate_limiter
+            )
+        else:
+            self.cochl_client = MockCochlAPIClient()
+            logger.warning("⚠️ Mock Cochl API 클라이언트 사용 (테스트 모드)")
+
+        anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "")
+        self.llm_analyzer = LLMAnalyzer(
+            anthropic_api_key,
+            rate_limiter,
+            int(os.getenv("LLM_CONTEXT_EVENTS", "10")),
+            float(os.getenv("LLM_CONTEXT_SECONDS", "60")),
+            min_severity=int(os.getenv("LLM_MIN_SEVERITY", "4")),
+            low_severity_template=os.getenv("LLM_LOW_SEVERITY_TEMPLATE", "true").lower() == "true",
+            large_margin=int(os.getenv("LLM_LARGE_MARGIN", "1")),
+            small_model=os.getenv("LLM_SMALL_MODEL", LLMAnalyzer.SMALL_MODEL),
+            large_model=os.getenv("LLM_LARGE_MODEL", LLMAnalyzer.LARGE_MODEL)
+        ) if anthropic_api_key else None
+        self.manager = ManagerAgent()
+        self.policies = PolicyIndex(
+            os.getenv("POLICY_FILE", "") or None,
+            base_severity_map=self.manager.SOUND_SEVERITY_MAP,
+            default_threshold=emergency_threshold,
+            check_interval=float(os.getenv("POLICY_CHECK_SECONDS", "5"))
+        )
+        self.job_poller = None
+        if os.getenv("COCHL_JOB_MODE", "false").lower() == "true":
+            self.job_poller = CochlJobPoller(
+                self.cochl_client,
+                min_interval=float(os.getenv("COCHL_POLL_MIN_INTERVAL", "0.5")),
+                max_interval=float(os.getenv("COCHL_POLL_MAX_INTERVAL", "15")),
+                job_timeout=float(os.getenv("COCHL_JOB_TIMEOUT", "1800"))
+            )
+
+    async def run(self):
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        await self.queue.open()
+        await self.policies.start()
+        if self.job_poller:
+            await self.job_poller.start()
+        logger.info(f"👷 분석 워커 시작: {self.worker_id} (동시 작업 {self.concurrency}개)")
+
+        slots = [asyncio.ensure_future(self._slot()) for _ in range(self.concurrency)]
+        await asyncio.gather(*slots)
+
+        if self.job_poller:
+            await self.job_poller.stop()
+        await self.policies.stop()
+        if hasattr(self.cochl_client, "aclose"):
+            await self.cochl_client.aclose()
+        await self.queue.close()
+        logger.info(f"👷 분석 워커 종료: {self.worker_id} (완료 {self.processed}건, 실패 {self.failed}건)")
+
+    async def _slot(self):
+        """작업을 하나씩 가져와 처리 (종료 신호를 받으면 새 작업을 가져오지 않음)"""
+        while not self.stopping.is_set():
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"❌ 작업 가져오기 실패: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), self.idle_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_job(job)
+
+    async def _run_job(self, job: dict):
+        job_id = job["id"]
+        progress = {"stage": "claimed", "done": 0, "total": 0}
+        lease_lost = asyncio.Event()
+
+        async def keep_lease():
+            """임대 연장 + 진행 상황 기록 (임대를 잃으면 처리 중단)"""
+            while True:
+                await asyncio.sleep(self.queue.lease_seconds / 3)
+                if not await self.queue.heartbeat(job_id, self.worker_id, progress):
+                    lease_lost.set()
+                    return
+
+        def on_progress(stage: str, done: int, total: int):
+            progress.update(stage=stage, done=done, total=total)
+
+        started = time.monotonic()
+        work = asyncio.ensure_future(self._analyze(job, progress, on_progress))
+        lease = asyncio.ensure_future(keep_lease())
+        stop = asyncio.ensure_future(self.stopping.wait())
+        lost = asyncio.ensure_future(lease_lost.wait())
+        try:
+            await asyncio.wait({work, lost, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if stop.done() and not work.done():
+                # 종료 중: grace 시간만큼 마저 처리
+                await asyncio.wait({work, lost}, timeout=self.grace_seconds, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lease.cancel()
+            stop.cancel()
+            lost.cancel()
+
+        if not work.done():
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            if lease_lost.is_set():
+                logger.warning(f"⚠️ 작업 임대 만료 - 처리 중단: job_id={job_id}")
+            else:
+                await self.queue.release(job_id, self.worker_id)
+                logger.info(f"↩️ 종료로 처리하지 못한 작업 반환: job_id={job_id}")
+            return
+
+        try:
+            processed_results, summary = work.result()
+        except Exception as e:
+            self.failed += 1
+            state = await self.queue.fail(job_id, self.worker_id, str(e))
+            logger.error(
+                f"❌ 파일 분석 실패: job_id={job_id}, 시도 {job['attempts']}회, "
+                f"{'재시도 예정' if state == 'queued' else '최종 실패'} - {e}"
+            )
+            return
+
+        await self.queue.complete(job_id, self.worker_id, {"results": processed_results, "summary": summary})
+        self.processed += 1
+        logger.info(
+            f"✅ 파일 분석 완료: job_id={job_id}, detections={len(processed_results)}, "
+            f"{time.monotonic() - started:.1f}초"
+        )
+
+    async def _analyze(self, job: dict, progress: dict, on_progress):
+        progress["stage"] = "cochl"
+        file_bytes = await asyncio.get_running_loop().run_in_executor(None, read_upload, job["file_path"])
+        if self.job_poller:
+            remote_id = await self.cochl_client.submit_file(file_bytes, job["filename"])
+            del file_bytes
+            cochl_results = await self.job_poller.wait(remote_id)
+        else:
+            cochl_results = await self.cochl_client.analyze_file(file_bytes, job["filename"])
+            del file_bytes
+
+        policy = self.policies.resolve({"site_id": job["site_id"], "device_id": job["device_id"]})
+        return await analyze_detections(
+            cochl_results,
+            self.manager,
+            policy,
+            site_id=job["site_id"],
+            device_id=job["device_id"],
+            merge_gap_seconds=self.merge_gap_seconds,
+            llm_analyzer=self.llm_analyzer,
+            on_progress=on_progress
+        )
+
+
+def read_upload(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def run_process(index: int, concurrency: int, grace_seconds: float, idle_seconds: float):
+    """워커 프로세스 진입점"""
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s'
+    )
+    worker = AnalysisWorker(index, concurrency, grace_seconds, idle_seconds)
+    asyncio.run(worker.run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 파일 분석 워커")
+    parser.add_argument("--workers", type=int, default=1, help="워커 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=2, help="프로세스당 동시에 처리할 작업 수")
+    parser.add_argument("--grace", type=float, default=20.0, help="종료 시 처리 중인 작업을 기다리는 시간 (초)")
+    parser.add_argument("--idle", type=float, default=0.5, help="대기열이 비었을 때 다시 확인하는 간격 (초)")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        run_process(0, args.concurrency, args.grace, args.idle)
+        return
+
+    # 부모 프로세스는 자식 프로세스에 종료 신호만 전달
+    processes = [
+        multiprocessing.Process(
+            target=run_process, args=(index, args.concurrency, args.grace, args.idle), name=f"worker-{index}"
+        )
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
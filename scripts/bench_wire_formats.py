@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+전송 형식 벤치마크: JSON / MessagePack / NDJSON(gzip, brotli)
+
+분석 결과 조회 응답과 Webhook 일괄 수신 본문을 형식별로 직렬화/역직렬화하여
+CPU 시간과 전송 크기를 기존 JSONResponse 경로와 비교합니다.
+
+사용법:
+    python scripts/bench_wire_formats.py --detections 5000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from backend.routers.file_upload import task_ndjson_records  # noqa: E402
+from backend.utils import wire_formats  # noqa: E402
+
+TAGS = ["scream", "glass_break", "siren", "footsteps", "conversation", "traffic", "dog_bark"]
+
+
+def make_task_response(detections: int) -> dict:
+    """분석 결과 조회 응답과 같은 구조의 가짜 데이터"""
+    results = []
+    for i in range(detections):
+        tag = TAGS[i % len(TAGS)]
+        results.append({
+            "event_id": f"evt_{1700000000 + i}",
+            "tag": tag,
+            "confidence": 0.5 + (i % 50) / 100,
+            "start_time": i * 1.0,
+            "end_time": i * 1.0 + 0.96,
+            "severity_score": (i % 10) + 1,
+            "message": f"⚠️ [경고] 보안 이벤트 감지\n소리 종류: {tag}\n신뢰도: 87.0%\n심각도: 6/10",
+            "is_emergency": (i % 10) >= 6,
+            "interpretation": "직전 유리 깨짐 이후 2초 뒤 발생한 비명으로 침입 가능성이 높습니다. 즉시 확인이 필요합니다.",
+        })
+    return {
+        "task_id": "00000000-0000-0000-0000-000000000000",
+        "status": "completed",
+        "file_info": {"filename": "bench.wav", "size": 1024, "format": "audio/wav"},
+        "results": results,
+        "summary": {"total_detections": detections, "highest_severity": 10, "emergency_count": detections * 4 // 10},
+    }
+
+
+def timed(func, repeat: int) -> float:
+    """중앙값 실행 시간 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_results(detections: int, repeat: int):
+    content = make_task_response(detections)
+    variants = [
+        ("JSONResponse (기존)", lambda: JSONResponse(content).body, None, wire_formats.JSON),
+        ("JSON + gzip", lambda: wire_formats.compress(wire_formats.encode(content, wire_formats.JSON), "gzip"), "gzip", wire_formats.JSON),
+        ("MessagePack", lambda: wire_formats.encode(content, wire_formats.MSGPACK), None, wire_formats.MSGPACK),
+        ("NDJSON + gzip", lambda: wire_formats.compress(wire_formats.encode_ndjson(task_ndjson_records(content)), "gzip"), "gzip", wire_formats.NDJSON),
+        ("NDJSON + br", lambda: wire_formats.compress(wire_formats.encode_ndjson(task_ndjson_records(content)), "br"), "br", wire_formats.NDJSON),
+    ]
+    print(f"\n결과 조회 응답 ({detections}개 탐지, 중앙값 {repeat}회)")
+    print(f"{'형식':<22}{'크기(KB)':>10}{'인코딩(ms)':>12}{'디코딩(ms)':>12}")
+    for name, encode, encoding, media_type in variants:
+        body = encode()
+        encode_ms = timed(encode, repeat)
+        decode_ms = timed(lambda: wire_formats.decode(wire_formats.decompress(body, encoding), media_type), repeat)
+        print(f"{name:<22}{len(body) / 1024:>10.1f}{encode_ms:>12.2f}{decode_ms:>12.2f}")
+
+
+def bench_ingest(events: int, repeat: int):
+    batch = [
+        {"event_id": f"evt_{i}", "tag": TAGS[i % len(TAGS)], "confidence": 0.9,
+         "timestamp": "2024-01-01T00:00:00", "metadata": {"site_id": "hq", "device_id": f"mic-{i % 20}"}}
+        for i in range(events)
+    ]
+    bodies = [
+        ("JSON (이벤트별 요청)", [wire_formats.encode(e, wire_formats.JSON) for e in batch], None, wire_formats.JSON),
+        ("MessagePack 배열", [wire_formats.encode(batch, wire_formats.MSGPACK)], None, wire_formats.MSGPACK),
+        ("NDJSON + gzip", [wire_formats.compress(wire_formats.encode_ndjson(batch), "gzip")], "gzip", wire_formats.NDJSON),
+        ("NDJSON + br", [wire_formats.compress(wire_formats.encode_ndjson(batch), "br")], "br", wire_formats.NDJSON),
+    ]
+    print(f"\nWebhook 수신 본문 ({events}개 이벤트, 중앙값 {repeat}회)")
+    print(f"{'형식':<22}{'크기(KB)':>10}{'디코딩(ms)':>12}")
+    for name, payloads, encoding, media_type in bodies:
+        size = sum(len(p) for p in payloads)
+        decode_ms = timed(
+            lambda: [wire_formats.decode(wire_formats.decompress(p, encoding), media_type) for p in payloads],
+            repeat
+        )
+        print(f"{name:<22}{size / 1024:>10.1f}{decode_ms:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전송 형식 벤치마크")
+    parser.add_argument("--detections", type=int, default=5000, help="결과 조회 응답의 탐지 수")
+    parser.add_argument("--events", type=int, default=1000, help="Webhook 일괄 수신 이벤트 수")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    if wire_formats.msgpack is None or wire_formats.brotli is None:
+        print("msgpack, brotli 패키지가 필요합니다: pip install -r requirements.txt")
+        sys.exit(1)
+
+    bench_results(args.detections, args.repeat)
+    bench_ingest(args.events, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
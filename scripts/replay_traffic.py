@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+트래픽 재생: CAPTURE_FILE로 기록한 요청을 로컬 서버에 원래 도착 간격대로 다시 전송
+
+기록된 Webhook 본문은 같은 Content-Type/Content-Encoding으로 다시 인코딩하고,
+업로드는 같은 파일명과 크기의 더미 파일로 전송합니다. 요청 종류별 응답 지연시간
+분포(p50/p90/p95/p99)와 상태 코드, 예정 시각 대비 전송 지연을 출력합니다.
+
+사용법:
+    python scripts/replay_traffic.py data/capture.jsonl                 # 원래 속도 (1x)
+    python scripts/replay_traffic.py data/capture.jsonl --speed 10      # 10배 빠르게
+    python scripts/replay_traffic.py data/capture.jsonl --max --concurrency 64   # 최대 속도
+    python scripts/replay_traffic.py data/capture.jsonl --wait-tasks    # 업로드 채점 공개/분석 완료까지 측정
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils import wire_formats  # noqa: E402
+
+
+def load_capture(path: str, limit: int = 0) -> List[dict]:
+    """기록 파일을 읽어 시각 순으로 정렬 (깨진 줄은 건너뜀)"""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+
+def fresh_event_ids(body, run_id: str):
+    """재생할 때마다 event_id를 바꿔 중복 감지에 걸리지 않고 실제 처리 경로를 타도록 함"""
+    if isinstance(body, list):
+        return [fresh_event_ids(item, run_id) for item in body]
+    if isinstance(body, dict) and body.get("event_id"):
+        return {**body, "event_id": f"{body['event_id']}-{run_id}"}
+    return body
+
+
+def encode_webhook(record: dict, run_id: str, keep_ids: bool):
+    """기록된 Webhook을 원래 형식의 요청 본문과 헤더로 복원"""
+    headers = {}
+    if record.get("content_type"):
+        headers["Content-Type"] = record["content_type"]
+
+    if "raw_b64" in record:
+        if record.get("content_encoding"):
+            headers["Content-Encoding"] = record["content_encoding"]
+        return base64.b64decode(record["raw_b64"]), headers
+
+    body = record["body"] if keep_ids else fresh_event_ids(record["body"], run_id)
+    media_type = wire_formats.normalize_media_type(record.get("content_type"))
+    if media_type == wire_formats.NDJSON:
+        content = wire_formats.encode_ndjson(body if isinstance(body, list) else [body])
+    else:
+        content = wire_formats.encode(body, media_type)
+
+    encoding = (record.get("content_encoding") or "").strip().lower()
+    if encoding in ("gzip", "x-gzip", "br"):
+        content = wire_formats.compress(content, "br" if encoding == "br" else "gzip")
+        headers["Content-Encoding"] = encoding
+    return content, headers
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Replayer:
+    def __init__(self, args):
+        self.args = args
+        self.run_id = uuid.uuid4().hex[:8]
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.lag: List[float] = []
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(self, records: List[dict]):
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        async with httpx.AsyncClient(base_url=self.args.target, timeout=self.args.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            first_ts = records[0]["ts"]
+            jobs = []
+            for record in records:
+                due = 0.0 if self.args.max else (record["ts"] - first_ts) / self.args.speed
+                jobs.append(asyncio.ensure_future(self.send(client, record, started, due)))
+            await asyncio.gather(*jobs)
+            return time.perf_counter() - started
+
+    async def send(self, client: httpx.AsyncClient, record: dict, started: float, due: float):
+        # 예정 시각까지 대기 (원래 도착 간격 유지)
+        delay = started + due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self.semaphore:
+            self.lag.append(max(0.0, time.perf_counter() - started - due))
+            kind = record.get("kind", "unknown")
+            sent = time.perf_counter()
+            try:
+                if kind == "webhook":
+                    content, headers = encode_webhook(record, self.run_id, self.args.keep_ids)
+                    response = await client.post("/webhook/cochl", content=content, headers=headers)
+                elif kind == "upload":
+                    response = await self.upload(client, record)
+                else:
+                    return
+                self.statuses[kind][response.status_code] += 1
+            except Exception as e:
+                self.statuses[kind][type(e).__name__] += 1
+                return
+            self.latencies[kind].append(time.perf_counter() - sent)
+
+            if kind == "upload" and self.args.wait_tasks and response.status_code == 200:
+                await self.wait_task(client, response.json()["task_id"], sent)
+
+    async def upload(self, client: httpx.AsyncClient, record: dict) -> httpx.Response:
+        params = {key: record[key] for key in ("site_id", "device_id") if record.get(key)}
+        if record.get("bulk"):
+            params["bulk"] = "true"
+        files = {"file": (
+            record.get("filename") or "replay.wav",
+            b"\0" * int(record.get("size") or 0),
+            record.get("content_type") or "application/octet-stream"
+        )}
+        return await client.post("/api/v1/analyze", params=params, files=files)
+
+    async def wait_task(self, client: httpx.AsyncClient, task_id: str, sent: float):
+        """
+        분석이 끝날 때까지 조회하여 업로드 ~ 완료 시간 측정
+
+        채점 결과가 먼저 공개되면(partial) 그 시점까지를 upload_partial로 따로 기록하고,
+        completed/failed가 될 때까지 계속 조회합니다.
+        """
+        partial_seen = False
+        while True:
+            await asyncio.sleep(self.args.poll_interval)
+            try:
+                response = await client.get(f"/api/v1/analyze/{task_id}")
+                status = "not_found" if response.status_code == 404 else response.json().get("status")
+            except Exception:
+                continue
+            if status == "partial" and not partial_seen:
+                partial_seen = True
+                self.latencies["upload_partial"].append(time.perf_counter() - sent)
+                self.statuses["upload_partial"][status] += 1
+            elif status in ("completed", "failed", "not_found"):
+                if status != "not_found":
+                    self.latencies["upload_completed"].append(time.perf_counter() - sent)
+                self.statuses["upload_completed"][status] += 1
+                return
+
+    def report(self, elapsed: float, total: int):
+        print(f"\n전송 {total}건 / {elapsed:.2f}초 ({total / elapsed if elapsed else 0:.1f} req/s)")
+        lag = sorted(self.lag)
+        print(f"예정 시각 대비 전송 지연: p50={percentile(lag, 50) * 1000:.1f}ms "
+              f"p99={percentile(lag, 99) * 1000:.1f}ms max={(lag[-1] if lag else 0) * 1000:.1f}ms")
+        print(f"\n{'종류':<18}{'건수':>7}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}  상태 코드")
+        for kind in sorted(set(self.latencies) | set(self.statuses)):
+            values = sorted(self.latencies.get(kind, []))
+            row = "".join(f"{percentile(values, p) * 1000:>8.1f}ms" for p in (50, 90, 95, 99))
+            worst = (values[-1] if values else 0) * 1000
+            codes = ", ".join(f"{code}={count}" for code, count in sorted(self.statuses[kind].items(), key=str))
+            print(f"{kind:<18}{len(values):>7}{row}{worst:>8.1f}ms  {codes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기록한 트래픽을 원래 도착 간격대로 재생")
+    parser.add_argument("capture", help="CAPTURE_FILE로 기록한 JSONL 파일")
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="대상 서버 주소")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (2 = 간격을 절반으로)")
+    parser.add_argument("--max", action="store_true", help="간격 무시하고 최대 속도로 전송")
+    parser.add_argument("--concurrency", type=int, default=256, help="동시에 진행할 최대 요청 수")
+    parser.add_argument("--limit", type=int, default=0, help="앞에서부터 N건만 재생")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--keep-ids", action="store_true", help="event_id를 그대로 보냄 (중복 감지 경로 측정)")
+    parser.add_argument("--wait-tasks", action="store_true", help="업로드 분석 완료까지의 시간도 측정")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="--wait-tasks 조회 간격 (초)")
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error("--speed는 0보다 커야 합니다")
+
+    records = load_capture(args.capture, args.limit)
+    if not records:
+        print("재생할 레코드가 없습니다")
+        return
+
+    span = records[-1]["ts"] - records[0]["ts"]
+    mode = "최대 속도" if args.max else f"{args.speed:g}배속 (예상 {span / args.speed:.1f}초)"
+    print(f"{len(records)}건 재생 시작 → {args.target} / 원본 구간 {span:.1f}초 / {mode}")
+
+    replayer = Replayer(args)
+    elapsed = asyncio.run(replayer.run(records))
+    replayer.report(elapsed, len(records))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Webhook 중복 감지 상태 (NEW / IN_FLIGHT / CACHED / PROBABLE / 기록 여부)
+"""
+import asyncio
+import time
+
+from backend.utils.dedup import (
+    CACHED, IN_FLIGHT, NEW, PROBABLE, BloomFilter, IdempotencyCache, idempotency_key
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_idempotency_key_prefers_event_id():
+    assert idempotency_key({"event_id": "abc", "tag": "scream"}) == "id:abc"
+    # event_id가 없으면 키 순서와 무관한 본문 해시
+    first = idempotency_key({"tag": "scream", "confidence": 0.9})
+    second = idempotency_key({"confidence": 0.9, "tag": "scream"})
+    assert first == second
+    assert first.startswith("sha256:")
+    assert first != idempotency_key({"tag": "scream", "confidence": 0.8})
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.001)
+    keys = [f"id:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other:{i}" in bloom for i in range(1000))
+    assert false_positives < 20
+
+
+def test_new_in_flight_then_cached():
+    async def scenario():
+        cache = IdempotencyCache()
+        assert cache.lookup("k") == (NEW, None)
+
+        cache.begin("k")
+        state, future = cache.lookup("k")
+        assert state == IN_FLIGHT
+
+        cache.complete("k", 200, {"status": "ok"})
+        # 처리 중에 기다리던 재전송도 같은 결과를 받음
+        assert await future == (200, {"status": "ok"})
+        assert cache.lookup("k") == (CACHED, (200, {"status": "ok"}))
+
+        stats = cache.stats()
+        assert stats["in_flight"] == 0
+        assert stats["entries"] == 1
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    run(scenario())
+
+
+def test_server_error_is_not_cached():
+    async def scenario():
+        cache = IdempotencyCache()
+        cache.begin("k")
+        cache.complete("k", 503, {"status": "error"})
+        assert cache.lookup("k") == (NEW, None)
+
+    run(scenario())
+
+
+def test_expired_response_is_probable():
+    async def scenario():
+        cache = IdempotencyCache(ttl=0.05)
+        cache.begin("k")
+        cache.complete("k", 200, {"status": "ok"})
+        await asyncio.sleep(0.06)
+        # 응답은 만료됐지만 이전 세대 블룸 필터에 남아 있음
+        assert cache.lookup("k") == (PROBABLE, None)
+        assert cache.stats()["entries"] == 0
+        assert cache.probable_hits == 1
+
+        await asyncio.sleep(0.06)
+        # 두 세대가 모두 지나면 잊음
+        assert cache.lookup("k") == (NEW, None)
+
+    run(scenario())
+
+
+def test_lru_eviction_falls_back_to_bloom():
+    async def scenario():
+        cache = IdempotencyCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.begin(key)
+            cache.complete(key, 200, {"key": key})
+        assert cache.stats()["entries"] == 2
+        assert cache.lookup("a") == (PROBABLE, None)
+        assert cache.lookup("c") == (CACHED, (200, {"key": "c"}))
+
+    run(scenario())
+
+
+def test_recorded_survives_server_error_until_ttl():
+    async def scenario():
+        cache = IdempotencyCache(ttl=0.05)
+        cache.begin("k")
+        cache.mark_recorded("k")
+        cache.complete("k", 500, {"status": "error"})
+
+        # 5xx라 응답은 보관하지 않지만 기록한 사실은 기억함
+        assert cache.lookup("k") == (NEW, None)
+        assert cache.recorded("k") is True
+        assert cache.stats()["recorded"] == 1
+
+        time.sleep(0.06)
+        assert cache.recorded("k") is False
+        assert cache.stats()["recorded"] == 0
+
+    run(scenario())
+
+
+def test_recorded_is_bounded_by_max_entries():
+    cache = IdempotencyCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.mark_recorded(key)
+    assert cache.recorded("a") is False
+    assert cache.recorded("b") is True
+    assert cache.recorded("c") is True
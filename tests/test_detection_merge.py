@@ -0,0 +1,78 @@
+"""
+분석 구간별 탐지 병합
+"""
+from backend.services.cochl_api import DetectionResult
+from backend.services.detection_merge import merge_detections
+
+
+def _detection(tag, confidence, start, end):
+    return DetectionResult(tag, confidence, start, end)
+
+
+def test_single_or_empty_input_is_returned_as_is():
+    assert merge_detections([]) == []
+    only = _detection("scream", 0.9, 0.0, 1.0)
+    assert merge_detections([only]) == [only]
+
+
+def test_overlapping_and_adjacent_windows_are_merged():
+    detections = [
+        _detection("scream", 0.6, 2.0, 3.0),
+        _detection("scream", 0.9, 0.0, 1.0),
+        _detection("scream", 0.7, 1.5, 2.5),   # 1.0 + gap 1.0 이내
+    ]
+    merged = merge_detections(detections, gap_seconds=1.0)
+
+    assert len(merged) == 1
+    event = merged[0]
+    assert (event.start_time, event.end_time) == (0.0, 3.0)
+    assert event.window_count == 3
+    assert event.peak_confidence == 0.9
+    assert event.confidence == 0.9
+    assert event.mean_confidence == round((0.6 + 0.9 + 0.7) / 3, 4)
+
+
+def test_gap_larger_than_threshold_keeps_events_apart():
+    detections = [
+        _detection("scream", 0.9, 0.0, 1.0),
+        _detection("scream", 0.8, 2.5, 3.0),
+    ]
+    merged = merge_detections(detections, gap_seconds=1.0)
+    assert [(d.start_time, d.end_time) for d in merged] == [(0.0, 1.0), (2.5, 3.0)]
+    assert all(d.window_count == 1 for d in merged)
+
+
+def test_different_tags_are_not_merged_and_sorted_by_start():
+    detections = [
+        _detection("glass_break", 0.8, 0.5, 1.5),
+        _detection("scream", 0.9, 0.0, 1.0),
+        _detection("scream", 0.7, 1.0, 2.0),
+    ]
+    merged = merge_detections(detections)
+    assert [(d.tag, d.start_time, d.end_time) for d in merged] == [
+        ("scream", 0.0, 2.0),
+        ("glass_break", 0.5, 1.5),
+    ]
+
+
+def test_inputs_are_not_modified():
+    first = _detection("scream", 0.9, 0.0, 1.0)
+    second = _detection("scream", 0.5, 0.5, 4.0)
+    merged = merge_detections([first, second])
+
+    assert (first.end_time, first.window_count) == (1.0, 1)
+    assert (second.confidence, second.window_count) == (0.5, 1)
+    assert merged[0] is not first
+    assert merged[0].event_id == first.event_id
+
+
+def test_merged_events_can_be_merged_again():
+    # 이미 병합된 결과를 다시 합쳐도 구간 수 기준 평균이 유지됨
+    once = merge_detections([
+        _detection("scream", 0.8, 0.0, 1.0),
+        _detection("scream", 0.6, 1.0, 2.0),
+    ])[0]
+    twice = merge_detections([once, _detection("scream", 1.0, 2.0, 3.0)])[0]
+    assert twice.window_count == 3
+    assert twice.mean_confidence == round((0.8 + 0.6 + 1.0) / 3, 4)
+    assert twice.peak_confidence == 1.0
@@ -0,0 +1,43 @@
+"""
+Range 헤더 해석
+"""
+import pytest
+
+from backend.utils.file_response import RangeNotSatisfiable, parse_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=900-2000", (900, 999)),   # 끝이 파일 크기를 넘으면 잘라냄
+    ("bytes=-100", (900, 999)),       # 뒤에서부터 N바이트
+    ("bytes=-5000", (0, 999)),
+    ("bytes= 10-19", (10, 19)),
+    ("bytes=999-999", (999, 999)),
+])
+def test_single_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "items=0-10",          # 지원하지 않는 단위
+    "bytes=0-10,20-30",    # 여러 범위는 전체 응답
+    "bytes=abc-10",
+    "bytes=10-x",
+    "bytes=50-10",         # 시작 > 끝: 형식 오류로 보고 전체 응답
+])
+def test_ignored_ranges_return_none(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000),
+    ("bytes=1000-2000", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=0-", 0),
+])
+def test_unsatisfiable_ranges(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
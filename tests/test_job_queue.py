@@ -0,0 +1,165 @@
+"""
+분석 작업 대기열: 임대 만료와 재임대
+"""
+import asyncio
+
+from backend.services.job_queue import JobQueue, QUEUED, RUNNING, COMPLETED, FAILED
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _open_queue(tmp_path, **kwargs) -> JobQueue:
+    queue = JobQueue(db_path=str(tmp_path / "jobs.db"), **kwargs)
+    await queue.open()
+    return queue
+
+
+async def _enqueue(queue: JobQueue, job_id: str, priority: int = 5):
+    await queue.enqueue(job_id, f"/tmp/{job_id}.wav", f"{job_id}.wav", "audio/wav", 100, priority)
+
+
+def test_claim_order_by_priority_then_created(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path)
+        try:
+            await _enqueue(queue, "low", priority=9)
+            await _enqueue(queue, "first", priority=1)
+            await _enqueue(queue, "second", priority=1)
+
+            claimed = [(await queue.claim("w1"))["id"] for _ in range(3)]
+            assert claimed == ["first", "second", "low"]
+            assert await queue.claim("w1") is None
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path, lease_seconds=0.05, max_attempts=3)
+        try:
+            await _enqueue(queue, "job")
+            job = await queue.claim("w1")
+            assert job["status"] == RUNNING
+            assert job["lease_owner"] == "w1"
+            assert job["attempts"] == 1
+
+            # 임대 기간 안에는 다른 워커가 가져가지 못함
+            assert await queue.claim("w2") is None
+
+            await asyncio.sleep(0.1)
+            job = await queue.claim("w2")
+            assert job["id"] == "job"
+            assert job["lease_owner"] == "w2"
+            assert job["attempts"] == 2
+
+            # 임대를 잃은 워커는 연장/완료할 수 없음
+            assert await queue.heartbeat("job", "w1") is False
+            assert await queue.complete("job", "w1", {"results": []}) is False
+
+            assert await queue.heartbeat("job", "w2", {"stage": "scoring"}) is True
+            assert await queue.complete("job", "w2", {"results": [1]}) is True
+            job = await queue.get("job")
+            assert job["status"] == COMPLETED
+            assert job["result"] == {"results": [1]}
+            assert job["progress"] == {"stage": "scoring"}
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_heartbeat_keeps_lease(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path, lease_seconds=0.2)
+        try:
+            await _enqueue(queue, "job")
+            await queue.claim("w1")
+            for _ in range(3):
+                await asyncio.sleep(0.1)
+                assert await queue.heartbeat("job", "w1") is True
+                assert await queue.claim("w2") is None
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_lease_expiring_after_max_attempts_fails_job(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path, lease_seconds=0.05, max_attempts=2)
+        try:
+            await _enqueue(queue, "job")
+            assert (await queue.claim("w1"))["attempts"] == 1
+            await asyncio.sleep(0.1)
+            assert (await queue.claim("w2"))["attempts"] == 2
+            await asyncio.sleep(0.1)
+
+            assert await queue.claim("w3") is None
+            job = await queue.get("job")
+            assert job["status"] == FAILED
+            assert job["lease_owner"] is None
+            assert job["error"]
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_release_returns_job_without_using_an_attempt(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path)
+        try:
+            await _enqueue(queue, "job")
+            await queue.claim("w1")
+            await queue.release("job", "w1")
+            job = await queue.get("job")
+            assert job["status"] == QUEUED
+            assert job["attempts"] == 0
+            assert (await queue.claim("w2"))["attempts"] == 1
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_fail_requeues_until_max_attempts(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path, max_attempts=2)
+        try:
+            await _enqueue(queue, "job")
+            await queue.claim("w1")
+            assert await queue.fail("job", "w1", "timeout") == QUEUED
+            await queue.claim("w1")
+            assert await queue.fail("job", "w1", "timeout") == FAILED
+            assert await queue.claim("w1") is None
+        finally:
+            await queue.close()
+
+    run(scenario())
+
+
+def test_collect_delivers_finished_jobs_once(tmp_path):
+    async def scenario():
+        queue = await _open_queue(tmp_path)
+        seen = []
+
+        async def listener(job):
+            seen.append((job["id"], job["status"]))
+
+        queue.subscribe(listener)
+        try:
+            await _enqueue(queue, "job")
+            await queue.claim("w1")
+            await queue.complete("job", "w1", {})
+            assert await queue.collect() == 1
+            assert await queue.collect() == 0
+            assert seen == [("job", COMPLETED)]
+            assert queue.stats()["completed"] == 1
+        finally:
+            await queue.close()
+
+    run(scenario())
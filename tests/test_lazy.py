@@ -0,0 +1,90 @@
+"""
+지연 생성 서비스: 생성 중에도 이벤트 루프가 멈추지 않는지
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.utils.lazy import LazyService, resolve
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_aget_does_not_block_loop_while_warming_up():
+    built = []
+
+    def factory():
+        time.sleep(0.3)
+        built.append(threading.current_thread().name)
+        return object()
+
+    async def scenario():
+        service = LazyService("slow", factory)
+        warm_up = asyncio.ensure_future(service.warm_up())
+        await asyncio.sleep(0.01)
+
+        # 생성 중에도 루프는 다른 작업을 처리함 (Webhook 응답 등)
+        ticks = 0
+        waiting = asyncio.ensure_future(service.aget())
+        started = time.monotonic()
+        while not waiting.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        assert ticks > 5
+        assert time.monotonic() - started < 1.0
+
+        instance = await waiting
+        await warm_up
+        assert service.ready
+        assert await service.aget() is instance
+        assert await resolve(service) is instance
+
+    run(scenario())
+    # warm_up과 aget이 같은 생성 작업을 공유 (한 번만 생성)
+    assert len(built) == 1
+    assert built[0] != threading.main_thread().name
+
+
+def test_aget_retries_after_failure():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("not yet")
+        return "client"
+
+    async def scenario():
+        service = LazyService("flaky", factory)
+        await service.warm_up()  # 실패해도 예외를 밖으로 내보내지 않음
+        assert not service.ready
+        assert service.status()["error"] == "not yet"
+
+        with pytest.raises(RuntimeError):
+            service.get()
+        assert await service.aget() == "client"
+        assert service.status()["error"] is None
+
+    run(scenario())
+    assert len(attempts) == 3
+
+
+def test_cancelled_waiter_does_not_cancel_construction():
+    async def scenario():
+        service = LazyService("slow", lambda: time.sleep(0.1) or "client")
+        waiter = asyncio.ensure_future(service.aget())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        assert await service.aget() == "client"
+
+    run(scenario())
+
+
+def test_resolve_passes_plain_objects_through():
+    instance = object()
+    assert run(resolve(instance)) is instance
+    assert run(resolve(None)) is None
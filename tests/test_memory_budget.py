@@ -0,0 +1,243 @@
+"""
+메모리 예산 집계와 완료된 작업의 예산 반납 (보관 결과 제거/디스크 이동)
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from backend.routers import file_upload
+from backend.services.manager_agent import ManagerAgent
+from backend.utils.memory_budget import MemoryBudget, MemoryBudgetExceeded
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def clear_tasks():
+    file_upload.tasks.clear()
+    file_upload.finished_tasks.clear()
+    yield
+    file_upload.tasks.clear()
+    file_upload.finished_tasks.clear()
+
+
+def test_reserve_and_release_by_label():
+    budget = MemoryBudget(1000)
+    upload = budget.try_reserve(600, "upload")
+    result = budget.try_reserve(300, "result")
+    assert budget.used_bytes == 900
+    assert budget.used_by("upload") == 600
+    assert budget.used_by("result") == 300
+    assert budget.available_bytes == 100
+    assert budget.try_reserve(200, "upload") is None
+
+    upload.release()
+    upload.release()  # 두 번 반납해도 한 번만 반영
+    assert budget.used_bytes == 300
+    assert budget.used_by("upload") == 0
+    assert budget.peak_bytes == 900
+
+    result.release()
+    assert budget.used_bytes == 0
+    assert budget.stats()["used_by"] == {"upload": 0, "result": 0}
+
+
+def test_charge_can_exceed_limit_and_blocks_new_reservations():
+    budget = MemoryBudget(100)
+    charged = budget.charge(150, "result")
+    assert budget.used_bytes == 150
+    assert budget.available_bytes == 0
+    assert budget.try_reserve(1, "upload") is None
+    charged.release()
+    assert budget.try_reserve(100, "upload") is not None
+
+
+def test_reserve_larger_than_limit_is_refused():
+    async def scenario():
+        budget = MemoryBudget(100)
+        with pytest.raises(MemoryBudgetExceeded):
+            await budget.reserve(101, timeout=1, label="upload")
+        assert budget.refused == 1
+        assert budget.used_bytes == 0
+
+    run(scenario())
+
+
+def test_waiters_are_woken_in_fifo_order():
+    async def scenario():
+        budget = MemoryBudget(100)
+        held = budget.try_reserve(100, "upload")
+        order = []
+
+        async def wait(nbytes, name):
+            reservation = await budget.reserve(nbytes, timeout=1, label="upload")
+            order.append(name)
+            return reservation
+
+        big = asyncio.ensure_future(wait(80, "big"))
+        await asyncio.sleep(0)
+        small = asyncio.ensure_future(wait(10, "small"))
+        await asyncio.sleep(0)
+        # 앞의 큰 요청이 기다리는 동안 작은 요청도 끼어들지 못함
+        assert budget.try_reserve(10, "upload") is None
+        assert budget.stats()["waiting"] == 2
+
+        held.release()
+        big_reservation, small_reservation = await asyncio.gather(big, small)
+        assert order == ["big", "small"]
+        assert budget.used_bytes == 90
+        assert budget.queued == 2
+
+        big_reservation.release()
+        small_reservation.release()
+        assert budget.used_bytes == 0
+
+    run(scenario())
+
+
+def test_reserve_timeout_leaves_no_usage():
+    async def scenario():
+        budget = MemoryBudget(100)
+        held = budget.try_reserve(100, "upload")
+        with pytest.raises(MemoryBudgetExceeded) as excinfo:
+            await budget.reserve(50, timeout=0.05, label="upload")
+        assert excinfo.value.retry_after == 0.05
+        assert budget.stats()["waiting"] == 0
+
+        held.release()
+        assert budget.used_bytes == 0
+        assert budget.try_reserve(100, "upload") is not None
+
+    run(scenario())
+
+
+def _result(index: int = 0) -> dict:
+    return {
+        "tag": "scream",
+        "confidence": 0.9,
+        "start_time": float(index),
+        "end_time": index + 1.0,
+        "severity_score": 8,
+        "is_emergency": True,
+    }
+
+
+def _add_task(task_id: str, results=None):
+    file_upload.tasks[task_id] = {
+        "status": "completed",
+        "filename": f"{task_id}.wav",
+        "file_size": 100,
+        "content_type": "audio/wav",
+        "results": results if results is not None else [_result()],
+        "summary": {"total_detections": 1},
+    }
+
+
+def test_finalize_task_charges_result_and_eviction_releases_it():
+    async def scenario():
+        budget = MemoryBudget(10 * 1024 * 1024)
+        _add_task("a")
+        _add_task("b")
+        await file_upload.finalize_task("a", budget)
+        await file_upload.finalize_task("b", budget)
+        used = budget.used_by("result")
+        assert used > 0
+        assert "response_cache" in file_upload.tasks["a"]
+
+        # 다시 완료 처리해도 이전 예산을 먼저 반납하므로 이중 집계되지 않음
+        await file_upload.finalize_task("a", budget)
+        assert budget.used_by("result") == used
+
+        # 보관 개수 1개: 먼저 끝난 작업부터 제거 (다시 완료 처리한 a가 가장 최근)
+        assert await file_upload.evict_tasks(retention_seconds=3600, max_finished=1) == 1
+        assert "b" not in file_upload.tasks
+        assert list(file_upload.finished_tasks) == ["a"]
+        assert 0 < budget.used_by("result") < used
+
+        # 보관 기간 만료
+        assert await file_upload.evict_tasks(retention_seconds=0, max_finished=10) == 1
+        assert file_upload.tasks == {}
+        assert budget.used_by("result") == 0
+        assert budget.used_bytes == 0
+
+    run(scenario())
+
+
+def test_large_result_spills_to_disk(tmp_path):
+    async def scenario():
+        budget = MemoryBudget(10 * 1024 * 1024)
+        _add_task("big", [_result(i) for i in range(50)])
+        await file_upload.finalize_task("big", budget, spill_dir=str(tmp_path), spill_bytes=1024)
+        task = file_upload.tasks["big"]
+        assert task["results"] is None
+        assert "response_cache" not in task
+        assert os.path.getsize(task["spilled"]["path"]) == task["spilled"]["size"]
+        assert os.path.dirname(task["spilled"]["path"]) == file_upload.process_spill_dir(str(tmp_path))
+        assert len(task["spilled"]["offsets"]) == 50
+        assert budget.used_bytes == 0
+
+    run(scenario())
+
+
+def test_results_over_memory_fraction_spill_to_disk(tmp_path):
+    async def scenario():
+        budget = MemoryBudget(10 * 1024 * 1024)
+        spill_dir = str(tmp_path)
+        results = [_result(i) for i in range(20)]
+        _add_task("kept", results)
+        _add_task("spilled", results)
+
+        await file_upload.finalize_task("kept", budget, spill_dir=spill_dir, result_memory_fraction=1.0)
+        kept = budget.used_by("result")
+        assert kept > 0
+        # 보관 중인 결과 합계가 예산 비율을 넘으면 디스크로 내림
+        fraction = kept * 1.5 / budget.limit_bytes
+        await file_upload.finalize_task("spilled", budget, spill_dir=spill_dir, result_memory_fraction=fraction)
+        task = file_upload.tasks["spilled"]
+        assert task["results"] is None
+        assert budget.used_by("result") == kept
+        spilled_path = task["spilled"]["path"]
+        records_path = task["spilled"]["records_path"]
+        assert os.path.exists(spilled_path)
+        assert os.path.exists(records_path)
+
+        # 제거하면 디스크 파일도 삭제
+        await file_upload.evict_tasks(retention_seconds=0, max_finished=10)
+        assert not os.path.exists(spilled_path)
+        assert not os.path.exists(records_path)
+        assert budget.used_bytes == 0
+
+    run(scenario())
+
+
+def test_clean_spill_dir_keeps_recent_files_of_other_processes(tmp_path):
+    own = tmp_path / os.path.basename(file_upload.process_spill_dir(str(tmp_path)))
+    sibling = tmp_path / "pid-999999999"
+    stale = tmp_path / "pid-999999998"
+    for directory in (own, sibling, stale):
+        directory.mkdir()
+        (directory / "task.json").write_text("{}")
+        (directory / "task.ndjson").write_text("{}\n")
+    old = time.time() - 7200
+    for path in stale.iterdir():
+        os.utime(path, (old, old))
+    (tmp_path / "legacy.json").write_text("{}")
+    os.utime(tmp_path / "legacy.json", (old, old))
+
+    assert file_upload.clean_spill_dir(str(tmp_path), max_age_seconds=3600) == 5
+
+    # 이 프로세스의 이전 파일과 보관 기간이 지난 파일만 삭제
+    assert list(own.iterdir()) == []
+    assert sorted(p.name for p in sibling.iterdir()) == ["task.json", "task.ndjson"]
+    assert not stale.exists()
+    assert not (tmp_path / "legacy.json").exists()
+
+
+def test_setting_up_router_does_not_touch_spill_dir(tmp_path):
+    (tmp_path / "other.json").write_text("{}")
+    file_upload.setup_file_upload_router(None, ManagerAgent(), 7, spill_dir=str(tmp_path))
+    assert (tmp_path / "other.json").exists()
@@ -0,0 +1,31 @@
+"""
+스케줄러 예산 설정 해석
+"""
+import logging
+
+from backend.services.scheduler import DEFAULT_BUDGETS, Priority, parse_budgets
+
+
+def test_empty_spec_uses_defaults():
+    assert parse_budgets("") == DEFAULT_BUDGETS
+
+
+def test_valid_entries_override_defaults():
+    budgets = parse_budgets(" bulk=1:1, LIVE_EMERGENCY=32 ,")
+    assert budgets[Priority.BULK] == (1, 1)
+    # 연결 수를 생략하면 작업 수와 같음
+    assert budgets[Priority.LIVE_EMERGENCY] == (32, 32)
+    assert budgets[Priority.INTERACTIVE] == DEFAULT_BUDGETS[Priority.INTERACTIVE]
+
+
+def test_invalid_entries_keep_defaults_and_warn(caplog):
+    with caplog.at_level(logging.WARNING, logger="backend.services.scheduler"):
+        budgets = parse_budgets("bluk=1:1,interactive=two,bulk=3:x,live_normal=0:0")
+
+    assert budgets[Priority.INTERACTIVE] == DEFAULT_BUDGETS[Priority.INTERACTIVE]
+    assert budgets[Priority.BULK] == DEFAULT_BUDGETS[Priority.BULK]
+    # 0 이하는 1로 보정
+    assert budgets[Priority.LIVE_NORMAL] == (1, 1)
+    messages = "\n".join(record.getMessage() for record in caplog.records)
+    for item in ("bluk=1:1", "interactive=two", "bulk=3:x"):
+        assert item in messages
@@ -0,0 +1,85 @@
+"""
+Webhook 본문 크기 제한 (압축/비압축/chunked)
+"""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import webhook
+from backend.services.manager_agent import ManagerAgent
+from backend.utils import wire_formats
+
+MAX_BODY = 4096
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(webhook.setup_webhook_router(ManagerAgent(), None, 7, max_body_bytes=MAX_BODY))
+    with TestClient(app) as client:
+        yield client
+
+
+def _event(padding: int = 0) -> bytes:
+    return json.dumps({
+        "event_id": f"evt_body_{padding}",
+        "tag": "footsteps",
+        "confidence": 0.8,
+        "timestamp": "2026-01-13T10:35:00Z",
+        "metadata": {"note": "x" * padding},
+    }).encode()
+
+
+def test_small_body_is_accepted(client):
+    response = client.post("/webhook/cochl", content=_event(), headers={"Content-Type": "application/json"})
+    assert response.status_code == 200
+
+
+def test_uncompressed_body_over_limit_is_rejected(client):
+    response = client.post("/webhook/cochl", content=_event(MAX_BODY), headers={"Content-Type": "application/json"})
+    assert response.status_code == 413
+
+
+def test_chunked_body_over_limit_is_rejected(client):
+    body = _event(MAX_BODY)
+
+    def chunks():
+        for start in range(0, len(body), 512):
+            yield body[start:start + 512]
+
+    # 제너레이터 본문은 Content-Length 없이 chunked로 전송됨
+    response = client.post("/webhook/cochl", content=chunks(), headers={"Content-Type": "application/json"})
+    assert response.status_code == 413
+
+
+def test_gzip_bomb_is_rejected(client):
+    bomb = gzip.compress(_event(MAX_BODY * 100))
+    assert len(bomb) < MAX_BODY
+    response = client.post(
+        "/webhook/cochl", content=bomb,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.skipif(not wire_formats.BROTLI_BOUNDED, reason="brotli>=1.2 필요")
+def test_brotli_bomb_is_rejected(client):
+    import brotli
+
+    bomb = brotli.compress(b"\0" * (16 * 1024 * 1024))
+    with pytest.raises(wire_formats.PayloadTooLarge):
+        wire_formats.decompress(bomb, "br", MAX_BODY)
+    response = client.post(
+        "/webhook/cochl", content=bomb,
+        headers={"Content-Type": "application/json", "Content-Encoding": "br"}
+    )
+    assert response.status_code == 413
+
+
+def test_brotli_without_output_limit_is_refused(monkeypatch):
+    monkeypatch.setattr(wire_formats, "BROTLI_BOUNDED", False)
+    with pytest.raises(wire_formats.UnsupportedFormat):
+        wire_formats.decompress(b"anything", "br", MAX_BODY)